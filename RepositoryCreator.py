@@ -1,18 +1,45 @@
+from typing import Callable, Iterable
+
 from gameObjects.gameObjectRepository import GameObjectRepository
 from gameObjects.planet import Planet
 from gameObjects.traderoute import TradeRoute
 from gameObjects.campaign import Campaign
 from gameObjects.faction import Faction
 from gameObjects.aiplayer import AIPlayer
+from xmlUtil.dataoverlay import DataOverlay
 from xmlUtil.xmlreader import XMLReader
-from xmlUtil.xmlstructure import XMLStructure
+
+class RepositoryLoadCancelled(Exception):
+    '''Raised inside constructRepository when a load is cancelled'''
+    pass
 
 class RepositoryCreator:
     '''Creates a Repository of GameObjects from input XMLs'''
     def __init__(self):
         self.repository: GameObjectRepository = GameObjectRepository()
-        self.__folder: str = ""
+        self.__overlay: DataOverlay = None
         self.__xml: XMLReader = XMLReader()
+        self.__cancelled: bool = False
+
+        #called with (phase, current, total) while the repository is constructed
+        self.progressCallback: Callable[[str, int, int], None] = None
+
+    def cancel(self) -> None:
+        '''Requests cancellation of a running constructRepository call.
+        Safe to call from another thread, the load stops at the next file or phase'''
+        self.__cancelled = True
+
+    def reportProgress(self, phase: str, current: int, total: int) -> None:
+        '''Passes progress to the progress callback and stops the load if it was cancelled'''
+        if self.__cancelled:
+            raise RepositoryLoadCancelled()
+
+        if self.progressCallback is not None:
+            self.progressCallback(phase, current, total)
+
+    def __phaseProgress(self, phase: str) -> Callable[[int, int], None]:
+        '''Returns a per file progress callback for the XMLReader'''
+        return lambda current, total: self.reportProgress(phase, current, total)
 
     def getNamesRootsFromXML(self, rootsList, tag: str) -> list:
         '''Takes a list of XML roots and a tag to search for
@@ -26,34 +53,52 @@ class RepositoryCreator:
 
         return names, roots
             
-    def addPlanetsFromXML(self, planetRoots) -> None:
+    def addPlanetsFromXML(self, planetRoots, planetFiles: list = None) -> None:
         '''Takes a list of Planet GameObject XML roots and adds
-        them to the repository with x and y positions'''
-        for planetRoot in planetRoots:
-            planetNames = self.__xml.getNamesFromXML(planetRoot)
+        them to the repository with x and y positions.
+        If the file names of the roots are given, the file of each planet is recorded'''
+        if planetFiles is None:
+            planetFiles = [None] * len(planetRoots)
+
+        for planetRoot, planetFile in zip(planetRoots, planetFiles):
+            for element in planetRoot:
+                name = element.get("Name")
+                if name is None:
+                    continue
 
-            for name in planetNames:
                 newplanet = Planet(name)
-                newplanet.variantOf = self.__xml.getVariantOfValue(name, planetRoot)
-                coordinates = self.__xml.getLocation(name, planetRoot)
+                newplanet.variantOf, coordinates, positionSource = self.__xml.getPlanetProperties(element)
                 if coordinates == None:
+                    print("Planet " + name + " has no coordinates! getLocation")
                     newplanet.x, newplanet.y = None, None
                 else:
                     newplanet.x, newplanet.y = coordinates
 
                 self.repository.addPlanet(newplanet)
+                if planetFile is not None:
+                    self.repository.setPlanetFile(name, planetFile)
+                    if positionSource is not None:
+                        self.repository.setPlanetPositionSource(name, *positionSource)
         
     def addTradeRoutesFromXML(self, tradeRouteRoots) -> None:
         '''Takes a list of Trade Route GameObject XML roots and adds
         them to the repository with start and end planets'''
-        for tradeRouteRoot in tradeRouteRoots:
-            tradeRouteNames = self.__xml.getNamesFromXML(tradeRouteRoot)
+        planets = self.repository.planetNames
 
-            for name in tradeRouteNames:
+        for tradeRouteRoot in tradeRouteRoots:
+            for name, start, end in self.__xml.getTradeRouteEndpoints(tradeRouteRoot):
                 newroute = TradeRoute(name)
-                newroute.start, newroute.end = self.__xml.getStartEnd(name, self.repository.planets, tradeRouteRoot)
+                newroute.start = self.__findPlanet(start, planets)
+                newroute.end = self.__findPlanet(end, planets)
                 self.repository.addTradeRoute(newroute)
     
+    def __findPlanet(self, name: str, planets) -> Planet:
+        '''Returns the planet of a trade route point, or None if the point is missing or unknown'''
+        if name is None:
+            return None
+
+        return self.__xml.getPlanet(name, planets)
+
     def addFactionsFromXML(self, factionRoots) -> None:
         '''Takes a list of Faction GameObject XML roots and adds
         them to the repository'''
@@ -64,9 +109,10 @@ class RepositoryCreator:
                 newfaction = Faction(name)
                 self.repository.addFaction(newfaction)
 
-    def addCampaignsFromXML(self, campaignNames, campaignRoots) -> None:
+    def addCampaignsFromXML(self, campaignNames, campaignRoots, campaignFile: str = None) -> None:
         '''Takes a list of Campaign GameObject XML roots and their names, and adds
-        them to the repository, after finding their planets and trade routes'''
+        them to the repository, after finding their planets and trade routes.
+        If the file name of the roots is given, it is recorded for each campaign'''
         for (campaign, campaignRoot) in zip(campaignNames, campaignRoots):
             newCampaignPlanets = set()
             newCampaignTradeRoutes = set()
@@ -77,17 +123,23 @@ class RepositoryCreator:
             campaignTradeRouteNames = self.__xml.getListFromXMLRoot(campaignRoot, ".//Trade_Routes")
 
             for p in campaignPlanetNames:
-                newPlanet = self.__xml.getPlanet(p, self.repository.planets)
+                newPlanet = self.__xml.getPlanet(p, self.repository.planetNames)
                 newCampaignPlanets.add(newPlanet)
+                if newPlanet is None:
+                    newCampaign.unresolvedPlanets.add(p)
 
             for t in campaignTradeRouteNames:
-                newRoute = self.__xml.getPlanet(t, self.repository.tradeRoutes)
+                newRoute = self.__xml.getTradeRoute(t, self.repository.tradeRouteNames)
                 newCampaignTradeRoutes.add(newRoute)
+                if newRoute is None:
+                    newCampaign.unresolvedTradeRoutes.add(t)
 
             newCampaign.planets = newCampaignPlanets
             newCampaign.tradeRoutes = newCampaignTradeRoutes
 
             self.repository.addCampaign(newCampaign)
+            if campaignFile is not None:
+                self.repository.setCampaignFile(campaign, campaignFile)
 
     def runPlanetVariantOfCheck(self) -> None:
         for planet in self.repository.planets:
@@ -119,29 +171,44 @@ class RepositoryCreator:
 
 
 
-    def constructRepository(self, folder: str) -> GameObjectRepository:
+    def constructRepository(self, folder: str, baseFolders: Iterable[str] = ()) -> GameObjectRepository:
         '''Reads a mod Data folder and searches the XML metafiles within
-        Creates a repository with planets, trade routes and campaigns'''
-        self.__folder = folder
-
-        XMLStructure.dataFolder = self.__folder
-
-        gameObjectFile = self.__folder + "/XML/GameObjectFiles.XML"
-        campaignFile = self.__folder + "/XML/CampaignFiles.XML"
-        tradeRouteFile = self.__folder + "/XML/TradeRouteFiles.XML"
-        factionFile = self.__folder + "/XML/FactionFiles.XML"
-
-        planetRoots = self.__xml.findPlanetsFiles(gameObjectFile)
-        tradeRouteRoots = self.__xml.findMetaFileRefs(tradeRouteFile)
-        factionRoots = self.__xml.findMetaFileRefs(factionFile)
-        
-        campaignRootList = self.__xml.findMetaFileRefs(campaignFile)
-
-        campaignNames, campaignRoots = self.getNamesRootsFromXML(campaignRootList, "Campaign")
-       
-        self.addPlanetsFromXML(planetRoots)
-        self.addTradeRoutesFromXML(tradeRouteRoots)
-        self.addFactionsFromXML(factionRoots)
-        self.addCampaignsFromXML(campaignNames, campaignRoots)
+        Creates a repository with planets, trade routes and campaigns.
+        baseFolders are Data folders the mod builds on, e.g. the base game, in load order.
+        Files the mod does not provide are read from the last base folder that does.
+        Raises RepositoryLoadCancelled if cancel() is called during the load'''
+        self.__overlay = DataOverlay(list(baseFolders) + [folder])
+
+        try:
+            return self.__constructRepository()
+        finally:
+            self.__cancelled = False
+
+    def __constructRepository(self) -> GameObjectRepository:
+        '''Runs the load phases for the current folders. Files are parsed one at a time
+        and each tree of the mod is released once its objects are in the repository, so only
+        one mod file is held in memory. Planets are read first, trade routes and campaigns
+        refer to them by name'''
+        overlay = self.__overlay
+
+        for file, fileRoot in overlay.iterMetaFileRefs("GameObjectFiles.XML", self.__phaseProgress("Adding planets")):
+            if self.__xml.hasTag(fileRoot, "Planet"):
+                self.addPlanetsFromXML([fileRoot.getroot()], [file])
+
+        for _, fileRoot in overlay.iterMetaFileRefs("TradeRouteFiles.XML", self.__phaseProgress("Adding trade routes")):
+            self.addTradeRoutesFromXML([fileRoot.getroot()])
+
+        for _, fileRoot in overlay.iterMetaFileRefs("FactionFiles.XML", self.__phaseProgress("Adding factions")):
+            self.addFactionsFromXML([fileRoot.getroot()])
+
+        for file, fileRoot in overlay.iterMetaFileRefs("CampaignFiles.XML", self.__phaseProgress("Adding campaigns")):
+            campaignNames, campaignRoots = self.getNamesRootsFromXML([fileRoot.getroot()], "Campaign")
+            self.addCampaignsFromXML(campaignNames, campaignRoots, file)
+
+        for file, path in overlay.resolvedFiles.items():
+            self.repository.setDataFileSource(file, path)
+
+        self.reportProgress("Checking planet variants", 0, 1)
         self.runPlanetVariantOfCheck()
-        return self.repository
\ No newline at end of file
+        self.reportProgress("Done", 1, 1)
+        return self.repository
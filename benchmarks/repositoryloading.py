@@ -0,0 +1,194 @@
+'''Timing of RepositoryCreator.constructRepository on generated mods of increasing size.
+
+Each mod has the given number of planets in files of 500, a trade route from
+every planet to the next two in files of 1000 and campaigns of 100 planets with
+their routes.
+The time of every load phase is taken from the progress callback, the time per
+object of each phase should stay about the same as the mod grows.
+
+With --memory every mod is also loaded in a fresh interpreter to measure the
+peak memory of the load: the peak of Python allocations from tracemalloc and
+the growth of the peak resident set size, which includes the lxml trees that
+tracemalloc does not see. The resident set size needs the Unix resource module.
+
+Run from the repository root:
+    python -m benchmarks.repositoryloading [--sizes 1000 2000 4000 8000] [--memory]
+'''
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from RepositoryCreator import RepositoryCreator
+
+PLANETS_PER_FILE = 500
+ROUTES_PER_PLANET = 2
+PLANETS_PER_CAMPAIGN = 100
+
+
+def writeMetaFile(fileName: str, files: List[str]) -> None:
+    '''Writes a metafile listing files'''
+    with open(fileName, "w") as metaFile:
+        metaFile.write('<?xml version="1.0"?>\n<Meta>\n')
+        for file in files:
+            metaFile.write("\t<File>" + file + "</File>\n")
+        metaFile.write("</Meta>\n")
+
+
+def writeMod(folder: str, size: int) -> None:
+    '''Writes a Data folder with size planets, their trade routes and campaigns to folder'''
+    xmlFolder = os.path.join(folder, "XML")
+    os.makedirs(xmlFolder)
+
+    planetFiles = []
+    for first in range(0, size, PLANETS_PER_FILE):
+        file = "Planets_" + str(len(planetFiles)) + ".xml"
+        planetFiles.append(file)
+
+        with open(os.path.join(xmlFolder, file), "w") as planetFile:
+            planetFile.write('<?xml version="1.0"?>\n<Planets>\n')
+            for index in range(first, min(first + PLANETS_PER_FILE, size)):
+                planetFile.write('\t<Planet Name="Planet_{0}">\n\t\t<Galactic_Position>{1}, {2}, 0.0</Galactic_Position>\n\t</Planet>\n'.format(index, index % 100, index // 100))
+            planetFile.write("</Planets>\n")
+
+    tradeRouteFiles = []
+    for first in range(0, size, PLANETS_PER_FILE):
+        file = "TradeRoutes_" + str(len(tradeRouteFiles)) + ".xml"
+        tradeRouteFiles.append(file)
+
+        with open(os.path.join(xmlFolder, file), "w") as tradeRouteFile:
+            tradeRouteFile.write('<?xml version="1.0"?>\n<TradeRoutes>\n')
+            for index in range(first, min(first + PLANETS_PER_FILE, size)):
+                for step in range(1, ROUTES_PER_PLANET + 1):
+                    end = (index + step) % size
+                    tradeRouteFile.write('\t<TradeRoute Name="Planet_{0}_Planet_{1}">\n\t\t<Point_A>Planet_{0}</Point_A>\n\t\t<Point_B>Planet_{1}</Point_B>\n\t</TradeRoute>\n'.format(index, end))
+            tradeRouteFile.write("</TradeRoutes>\n")
+
+    with open(os.path.join(xmlFolder, "Campaigns.xml"), "w") as campaignFile:
+        campaignFile.write('<?xml version="1.0"?>\n<Campaigns>\n')
+        for first in range(0, size, PLANETS_PER_CAMPAIGN):
+            planets = range(first, min(first + PLANETS_PER_CAMPAIGN, size))
+            campaignFile.write('\t<Campaign Name="Campaign_{0}">\n\t\t<Campaign_Set>Set_{0}</Campaign_Set>\n\t\t<Locations>\n'.format(first))
+            campaignFile.write("".join("\t\t\tPlanet_{0},\n".format(index) for index in planets))
+            campaignFile.write("\t\t\t<!-- end of locations -->\n\t\t</Locations>\n\t\t<Trade_Routes>\n")
+            campaignFile.write("".join("\t\t\tPlanet_{0}_Planet_{1},\n".format(index, (index + 1) % size) for index in planets))
+            campaignFile.write("\t\t</Trade_Routes>\n\t</Campaign>\n")
+        campaignFile.write("</Campaigns>\n")
+
+    writeMetaFile(os.path.join(xmlFolder, "GameObjectFiles.XML"), planetFiles)
+    writeMetaFile(os.path.join(xmlFolder, "TradeRouteFiles.XML"), tradeRouteFiles)
+    writeMetaFile(os.path.join(xmlFolder, "CampaignFiles.XML"), ["Campaigns.xml"])
+    with open(os.path.join(xmlFolder, "Factions.xml"), "w") as factionFile:
+        factionFile.write('<?xml version="1.0"?>\n<Factions>\n\t<Faction Name="Empire"/>\n</Factions>\n')
+    writeMetaFile(os.path.join(xmlFolder, "FactionFiles.XML"), ["Factions.xml"])
+
+
+def timePhases(folder: str) -> Dict[str, float]:
+    '''Loads a Data folder and returns the seconds spent in each load phase'''
+    phases: Dict[str, float] = dict()
+    current = [None, time.perf_counter()]
+
+    def progress(phase: str, index: int, total: int) -> None:
+        now = time.perf_counter()
+        if current[0] is not None:
+            phases[current[0]] = phases.get(current[0], 0.0) + now - current[1]
+        current[0], current[1] = phase, now
+
+    creator = RepositoryCreator()
+    creator.progressCallback = progress
+
+    #the loader prints every unresolved name
+    with contextlib.redirect_stdout(io.StringIO()):
+        creator.constructRepository(folder)
+
+    return phases
+
+
+def loadQuietly(folder: str) -> None:
+    '''Loads a Data folder without printing every unresolved name'''
+    with contextlib.redirect_stdout(io.StringIO()):
+        RepositoryCreator().constructRepository(folder)
+
+
+def measureTracedPeak(folder: str) -> int:
+    '''Loads a Data folder and returns the peak of Python allocations during the load in bytes'''
+    import tracemalloc
+
+    tracemalloc.start()
+    loadQuietly(folder)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak
+
+
+def measureResidentSet(folder: str) -> int:
+    '''Loads a Data folder and returns the growth of the peak resident set size during the load in bytes'''
+    import resource
+
+    #ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    loadQuietly(folder)
+
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) * scale
+
+
+MEMORY_MEASUREMENTS = {"traced": measureTracedPeak, "rss": measureResidentSet}
+
+
+def measureInSubprocess(measurement: str, folder: str) -> int:
+    '''Runs a memory measurement in a fresh interpreter, so earlier loads and the
+    bookkeeping of tracemalloc do not raise the peak'''
+    result = subprocess.run([sys.executable, "-m", "benchmarks.repositoryloading", "--measure", measurement, folder],
+        capture_output = True, text = True, check = True)
+    return int(result.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "Times loading generated mods")
+    parser.add_argument("--sizes", type = int, nargs = "+", default = [1000, 2000, 4000, 8000])
+    parser.add_argument("--memory", action = "store_true", help = "also measure the peak memory of each load")
+    parser.add_argument("--measure", nargs = 2, metavar = ("MEASUREMENT", "FOLDER"), help = argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measurement, folder = args.measure
+        print(MEMORY_MEASUREMENTS[measurement](folder))
+        return
+
+    #measured first, child processes start with the peak resident set size of this process
+    memory: Dict[int, Tuple[int, int]] = dict()
+    if args.memory:
+        for size in args.sizes:
+            with tempfile.TemporaryDirectory() as folder:
+                writeMod(folder, size)
+                memory[size] = measureInSubprocess("traced", folder), measureInSubprocess("rss", folder)
+
+    print("{:>8} {:>28} {:>10} {:>14}".format("planets", "phase", "seconds", "us per planet"))
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as folder:
+            writeMod(folder, size)
+
+            start = time.perf_counter()
+            phases = timePhases(folder)
+            total = time.perf_counter() - start
+
+        for phase, seconds in phases.items():
+            print("{:>8} {:>28} {:>10.3f} {:>14.1f}".format(size, phase, seconds, 1e6 * seconds / size))
+        print("{:>8} {:>28} {:>10.3f} {:>14.1f}".format(size, "total", total, 1e6 * total / size))
+
+    if memory:
+        print()
+        print("{:>8} {:>18} {:>18}".format("planets", "Python peak MB", "RSS growth MB"))
+        for size, (peak, residentSet) in memory.items():
+            print("{:>8} {:>18.1f} {:>18.1f}".format(size, peak / 1e6, residentSet / 1e6))
+
+
+if __name__ == "__main__":
+    main()
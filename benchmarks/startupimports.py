@@ -0,0 +1,102 @@
+'''Import time report for editor startup.
+
+Imports the modules testy.py loads before the window is shown in a fresh
+interpreter with -X importtime and summarises the result. Modules that the
+editor only imports on first use are listed in LAZY_MODULES, the report fails
+if any of them is imported at startup.
+
+Run from the repository root:
+    python -m benchmarks.startupimports [--top N]
+'''
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+#keep in sync with the imports at the top of testy.py
+STARTUP_MODULES = [
+    "PyQt5.QtWidgets",
+    "commands.ShowTradeCreatorDialogCommand",
+    "commands.ShowCampaignPropertiesDialogCommand",
+    "commands.ShowAutoConnectionSettingsCommand",
+    "commands.ShowPlanetTransformDialogCommand",
+    "config",
+    "gameObjects.gameObjectRepository",
+    "ui.DialogFactory",
+    "ui.mainwindow_presenter",
+    "ui.planetcontextmenu",
+    "ui.qtmainwindow",
+    "ui.qtrepositoryloader",
+]
+
+#modules that must not be imported before they are needed
+LAZY_MODULES = [
+    "matplotlib",
+    "numpy",
+    "ui.qttraderoutecreator",
+    "ui.qtcampaignproperties",
+    "ui.qtautoconnectionsettings",
+    "ui.planetpositionchanger",
+    "ui.qtscenegalacticplot",
+    "ui.qtplanettransform",
+    "mapTools.planettransform",
+]
+
+
+def measureImports(modules: List[str]) -> List[Tuple[str, int, int, int]]:
+    '''Imports the modules in a new interpreter and returns
+    (module, depth, self time, cumulative time) per imported module, times in microseconds'''
+    code = "; ".join("import " + module for module in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output = True, text = True)
+
+    if result.returncode != 0:
+        raise RuntimeError("Importing startup modules failed:\n" + result.stderr)
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        selfTime, cumulativeTime, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), depth, int(selfTime), int(cumulativeTime)))
+
+    return entries
+
+
+def report(entries: List[Tuple[str, int, int, int]], top: int) -> int:
+    '''Prints the summary and returns the number of lazy modules imported at startup'''
+    total = sum(cumulative for (_, depth, _, cumulative) in entries if depth == 0)
+    print("Startup imports: {} modules in {:.1f} ms".format(len(entries), total / 1000))
+
+    print("\nSlowest by cumulative time:")
+    for name, _, _, cumulative in sorted(entries, key = lambda entry: entry[3], reverse = True)[:top]:
+        print("  {:>9.1f} ms  {}".format(cumulative / 1000, name))
+
+    print("\nSlowest by self time:")
+    for name, _, selfTime, _ in sorted(entries, key = lambda entry: entry[2], reverse = True)[:top]:
+        print("  {:>9.1f} ms  {}".format(selfTime / 1000, name))
+
+    imported: Dict[str, int] = {name: cumulative for (name, _, _, cumulative) in entries}
+    eager = [module for module in LAZY_MODULES if module in imported]
+
+    if eager:
+        print("\nLazily loaded modules imported at startup:")
+        for module in eager:
+            print("  {:>9.1f} ms  {}".format(imported[module] / 1000, module))
+    else:
+        print("\nNo lazily loaded modules imported at startup")
+
+    return len(eager)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = "Reports import time of the editor startup modules")
+    parser.add_argument("--top", type = int, default = 15, help = "number of modules to list")
+    args = parser.parse_args()
+
+    return 1 if report(measureImports(STARTUP_MODULES), args.top) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+'''Timing of TradeRouteGenerator on random galaxies of increasing size.
+
+Planets are spread uniformly with a constant density, so the number of
+candidate routes per planet stays the same and the time should grow linearly.
+
+Run from the repository root:
+    python -m benchmarks.traderoutegeneration [--sizes 1000 5000 20000]
+'''
+import argparse
+import time
+
+import numpy as np
+
+from gameObjects.gameObjectRepository import GameObjectRepository
+from gameObjects.planet import Planet
+from mapTools.traderoutegenerator import TradeRouteGenerator
+
+#mean distance between neighbouring planets is about 100
+SPACING = 100.0
+MAXIMUM_DISTANCE = 2.0 * SPACING
+
+
+def makeRepository(size: int, seed: int = 0) -> GameObjectRepository:
+    '''Returns a repository with size randomly placed planets'''
+    repository = GameObjectRepository()
+    width = SPACING * np.sqrt(size)
+
+    for index, (x, y) in enumerate(np.random.default_rng(seed).uniform(0, width, (size, 2))):
+        planet = Planet("Planet_" + str(index))
+        planet.x, planet.y = float(x), float(y)
+        repository.addPlanet(planet)
+
+    return repository
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "Times trade route generation")
+    parser.add_argument("--sizes", type = int, nargs = "+", default = [1000, 5000, 20000])
+    args = parser.parse_args()
+
+    print("{:>8} {:>10} {:>10} {:>10}".format("planets", "mode", "routes", "seconds"))
+    for size in args.sizes:
+        repository = makeRepository(size)
+        generator = TradeRouteGenerator(repository)
+
+        for mode in TradeRouteGenerator.modes:
+            start = time.perf_counter()
+            routes = generator.generate(repository.planets, MAXIMUM_DISTANCE, mode)
+            print("{:>8} {:>10} {:>10} {:>10.3f}".format(size, mode, len(routes), time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
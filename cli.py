@@ -0,0 +1,255 @@
+'''Headless command line interface for batch editing a mod Data folder.
+
+Loads the data folder once and runs the requested operations in a fixed order:
+planet moves, trade route creation, validation, the spacing check, listing,
+campaign comparison and campaign export. All files are written in a single
+transaction at the end, campaign maps are rendered after that. PyQt is not
+imported and maps are rendered offscreen, so this runs on machines without a
+display.
+
+    python cli.py <Data folder> [--base <base game Data folder>] [--move-planets planets.csv] [--create-trade-routes routes.csv]
+        [--campaign NAME] [--validate] [--check-spacing DISTANCE] [--list] [--compare NAME NAME...] [--export-campaigns FOLDER] [--export-maps FOLDER]
+
+planets.csv rows are: planet name, x, y
+routes.csv rows are: start planet, end planet[, trade route name]
+'''
+import argparse
+import csv
+import os
+import sys
+from typing import Dict, List
+
+from gameObjects.campaign import Campaign
+from gameObjects.gameObjectRepository import GameObjectRepository
+from gameObjects.traderoute import TradeRoute
+from mapTools.campaignmapexporter import CampaignMapExporter, formats
+from mapTools.campaignvalidator import CampaignValidator
+from mapTools.spacingchecker import SpacingChecker
+from RepositoryCreator import RepositoryCreator
+from xmlUtil.xmlwriter import XMLWriter
+
+
+class BatchEditor:
+    '''Runs batch operations on a repository and collects the files to write'''
+    def __init__(self, folder: str, repository: GameObjectRepository, patchPlanetFiles: bool = True):
+        self.__folder: str = folder
+        self.__repository: GameObjectRepository = repository
+        self.__patchPlanetFiles: bool = patchPlanetFiles
+        self.__xmlWriter: XMLWriter = XMLWriter()
+
+        self.__outputFiles: Dict[str, object] = dict()
+        self.__updatedPlanetCoords: Dict[str, List[float]] = dict()
+        self.__newTradeRoutes: List[TradeRoute] = list()
+
+    def listCampaigns(self) -> None:
+        '''Prints all campaigns with their set, planet and trade route counts'''
+        for campaign in sorted(self.__repository.campaigns, key = lambda entry: entry.name):
+            print("{}\t{}\t{} planets\t{} trade routes".format(campaign.name, campaign.setName, len(campaign.planets), len(campaign.tradeRoutes)))
+
+    def validateCampaigns(self) -> int:
+        '''Prints problems found in the campaigns and returns their number'''
+        issues = CampaignValidator().validateAll(self.__repository.campaigns)
+        for issue in issues:
+            print(issue)
+
+        return len(issues)
+
+    def checkSpacing(self, minimumSpacing: float) -> int:
+        '''Prints pairs of planets closer than minimumSpacing and returns their number'''
+        issues = SpacingChecker(minimumSpacing).check(self.__repository.planets)
+        for issue in issues:
+            print(issue)
+
+        return len(issues)
+
+    def compareCampaigns(self, names: List[str]) -> None:
+        '''Prints the planets and trade routes the campaigns share and the ones only each of them has'''
+        from mapTools.campaignbitsets import CampaignMembership
+
+        byName = {campaign.name: campaign for campaign in self.__repository.campaigns}
+        missing = [name for name in names if name not in byName]
+        if missing:
+            print("Error! Campaign " + ", ".join(missing) + " does not exist")
+            return
+
+        campaigns = [byName[name] for name in names]
+
+        membership = CampaignMembership(self.__repository.campaigns)
+        groups = [("Shared", membership.sharedPlanets(campaigns), membership.sharedTradeRoutes(campaigns))]
+        for campaign in campaigns:
+            others = [c for c in campaigns if c is not campaign]
+            groups.append(("Only in " + campaign.name,
+                membership.planetsOf(campaign) - membership.anyPlanets(others),
+                membership.tradeRoutesOf(campaign) - membership.anyTradeRoutes(others)))
+
+        for title, planets, tradeRoutes in groups:
+            print("{}: {} planets, {} trade routes".format(title, len(planets), len(tradeRoutes)))
+            for gameObjects in (membership.planets(planets), membership.tradeRoutes(tradeRoutes)):
+                for gameObject in sorted(gameObjects, key = lambda entry: entry.name):
+                    print("\t" + gameObject.name)
+
+    def movePlanets(self, fileName: str) -> None:
+        '''Moves planets to the coordinates given in a CSV file of name, x, y rows'''
+        with open(fileName, newline = "") as planetsFile:
+            for row in csv.reader(planetsFile):
+                if len(row) < 3 or row[0].startswith("#"):
+                    continue
+
+                name = row[0].strip()
+                try:
+                    planet = self.__repository.getPlanetByName(name)
+                    x, y = float(row[1]), float(row[2])
+                except (RuntimeError, ValueError) as error:
+                    print("Skipping " + ",".join(row) + ": " + str(error))
+                    continue
+
+                planet.x = x
+                planet.y = y
+                self.__updatedPlanetCoords[planet.name] = [x, y]
+
+        if self.__updatedPlanetCoords:
+            planetFiles, _ = self.__xmlWriter.planetCoordinatesFiles(self.__repository, self.__folder + "/XML/", self.__updatedPlanetCoords, self.__patchPlanetFiles)
+            self.__outputFiles.update(planetFiles)
+
+    def createTradeRoutes(self, fileName: str, outputName: str, campaignName: str = None) -> None:
+        '''Creates trade routes from a CSV file of start, end, name rows, skipping existing routes.
+        New routes are written to outputName and optionally added to a campaign'''
+        campaign: Campaign = None
+        if campaignName is not None:
+            campaign = next((c for c in self.__repository.campaigns if c.name == campaignName), None)
+            if campaign is None:
+                raise RuntimeError("Searching for non existing campaign " + campaignName)
+
+        with open(fileName, newline = "") as routesFile:
+            for row in csv.reader(routesFile):
+                if len(row) < 2 or row[0].startswith("#"):
+                    continue
+
+                start, end = row[0].strip(), row[1].strip()
+                if not (self.__repository.planetExists(start) and self.__repository.planetExists(end)):
+                    print("Skipping " + start + "_" + end + ": planet does not exist")
+                    continue
+
+                if self.__repository.tradeRouteExists(start, end):
+                    print("Skipping " + start + "_" + end + ": trade route already exists")
+                    continue
+
+                tradeRoute = TradeRoute(row[2].strip() if len(row) > 2 and row[2].strip() else start + "_" + end)
+                tradeRoute.start = self.__repository.getPlanetByName(start)
+                tradeRoute.end = self.__repository.getPlanetByName(end)
+
+                self.__repository.addTradeRoute(tradeRoute)
+                self.__newTradeRoutes.append(tradeRoute)
+                if campaign is not None:
+                    campaign.tradeRoutes.add(tradeRoute)
+
+        if campaign is not None:
+            self.__repository.updateCampaign(campaign)
+
+        if self.__newTradeRoutes:
+            self.__outputFiles[outputName] = self.__xmlWriter.tradeRouteTree(self.__newTradeRoutes)
+
+    def exportCampaigns(self, folder: str, campaignNames: List[str] = None) -> bool:
+        '''Writes each campaign, or only the named ones and the others sharing their files,
+        to its own file in folder together with a CampaignFiles.XML listing them.
+        Returns false without writing anything if a campaign name is not a valid file name'''
+        campaigns = sorted(self.__repository.campaigns, key = lambda entry: entry.name)
+        if campaignNames:
+            campaigns = [campaign for campaign in campaigns if campaign.name in campaignNames]
+
+        campaignMetaFile = self.__repository.getDataFileSource("CampaignFiles.XML") or self.__folder + "/XML/CampaignFiles.XML"
+        try:
+            trees = self.__xmlWriter.campaignExportTrees(self.__repository, campaigns, campaignMetaFile)
+        except ValueError as e:
+            print("Error! " + str(e))
+            return False
+
+        for file, tree in trees.items():
+            self.__outputFiles[folder + "/" + file] = tree
+
+        return True
+
+    def write(self) -> None:
+        '''Writes all collected files in one transaction'''
+        self.__xmlWriter.writeFiles(self.__outputFiles)
+        for outputName in sorted(self.__outputFiles.keys()):
+            print("Wrote " + outputName)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = "Batch edit galactic conquest campaigns without the editor window")
+    parser.add_argument("folder", help = "mod Data folder")
+    parser.add_argument("--base", metavar = "FOLDER", action = "append", default = [], help = "Data folder the mod builds on, can be repeated in load order")
+    parser.add_argument("--list", action = "store_true", help = "list all campaigns")
+    parser.add_argument("--validate", action = "store_true", help = "check campaigns for problems, exits with 1 if any are found")
+    parser.add_argument("--check-spacing", metavar = "DISTANCE", type = float, help = "report planets closer than DISTANCE to each other, exits with 1 if any are found")
+    parser.add_argument("--compare", metavar = "NAME", nargs = "+", help = "show the planets and trade routes campaigns share and the ones only one of them has")
+    parser.add_argument("--move-planets", metavar = "CSV", help = "move planets to the coordinates in a name, x, y CSV file")
+    parser.add_argument("--no-patch", action = "store_true", help = "rewrite moved planet files with lxml instead of patching coordinates")
+    parser.add_argument("--create-trade-routes", metavar = "CSV", help = "create trade routes from a start, end, name CSV file")
+    parser.add_argument("--trade-route-output", metavar = "FILE", default = "NewTradeRoutes.xml", help = "file for created trade routes")
+    parser.add_argument("--campaign", metavar = "NAME", help = "campaign to add created trade routes to")
+    parser.add_argument("--export-campaigns", metavar = "FOLDER", help = "write campaigns and a CampaignFiles.XML to FOLDER")
+    parser.add_argument("--export-only", metavar = "NAME", nargs = "+", help = "only export the named campaigns")
+    parser.add_argument("--export-maps", metavar = "FOLDER", help = "render a map of every campaign, or of the --export-only campaigns, to FOLDER")
+    parser.add_argument("--map-format", choices = formats, default = "png", help = "image format of the maps")
+    parser.add_argument("--map-workers", metavar = "N", type = int, help = "number of processes rendering maps, one per CPU by default")
+    parser.add_argument("--auto-connection-distance", metavar = "DISTANCE", type = float, default = 0, help = "draw auto connections between campaign planets closer than DISTANCE on the maps")
+    args = parser.parse_args()
+
+    for folder in [args.folder] + args.base:
+        if not os.path.isdir(folder):
+            print("Error! " + folder + " is not a folder")
+            return 2
+
+    if args.check_spacing is not None and args.check_spacing <= 0:
+        print("Error! The spacing to check must be positive")
+        return 2
+
+    repository = RepositoryCreator().constructRepository(args.folder, args.base)
+    editor = BatchEditor(args.folder, repository, not args.no_patch)
+
+    if args.move_planets:
+        editor.movePlanets(args.move_planets)
+
+    if args.create_trade_routes:
+        editor.createTradeRoutes(args.create_trade_routes, args.trade_route_output, args.campaign)
+
+    problems = 0
+    if args.validate:
+        problems = editor.validateCampaigns()
+        print(str(problems) + " problems found")
+
+    if args.check_spacing is not None:
+        closePairs = editor.checkSpacing(args.check_spacing)
+        print(str(closePairs) + " pairs of planets closer than " + str(args.check_spacing))
+        problems += closePairs
+
+    if args.list:
+        editor.listCampaigns()
+
+    if args.compare:
+        editor.compareCampaigns(args.compare)
+
+    if args.export_campaigns and not editor.exportCampaigns(args.export_campaigns, args.export_only):
+        return 1
+
+    editor.write()
+
+    if args.export_maps:
+        campaigns = [c for c in repository.campaigns if not args.export_only or c.name in args.export_only]
+        exporter = CampaignMapExporter(repository.planets, args.auto_connection_distance, args.map_format, workers = args.map_workers)
+        try:
+            outputNames = exporter.export(campaigns, args.export_maps)
+        except ValueError as e:
+            print("Error! " + str(e))
+            return 1
+
+        for outputName in outputNames:
+            print("Wrote " + outputName)
+
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+from typing import Iterable
+
+from commands.UndoableCommand import UndoableCommand
+from gameObjects.campaign import Campaign
+
+class CampaignEditCommand(UndoableCommand):
+    '''Adds and removes planets and trade routes of a campaign.
+    Stores the added and removed objects instead of copies of the campaign'''
+    def __init__(self, campaign: Campaign, addedPlanets: Iterable = (), removedPlanets: Iterable = (), addedTradeRoutes: Iterable = (), removedTradeRoutes: Iterable = ()):
+        self.campaign: Campaign = campaign
+        self.addedPlanets: frozenset = frozenset(addedPlanets)
+        self.removedPlanets: frozenset = frozenset(removedPlanets)
+        self.addedTradeRoutes: frozenset = frozenset(addedTradeRoutes)
+        self.removedTradeRoutes: frozenset = frozenset(removedTradeRoutes)
+
+    @classmethod
+    def fromStates(cls, campaign: Campaign, planetsBefore: set, tradeRoutesBefore: set):
+        '''Returns the command turning the given earlier state into the current campaign'''
+        return cls(campaign, campaign.planets - planetsBefore, planetsBefore - campaign.planets, campaign.tradeRoutes - tradeRoutesBefore, tradeRoutesBefore - campaign.tradeRoutes)
+
+    def execute(self) -> None:
+        '''Applies the changes to the campaign'''
+        self.campaign.planets.difference_update(self.removedPlanets)
+        self.campaign.planets.update(self.addedPlanets)
+        self.campaign.tradeRoutes.difference_update(self.removedTradeRoutes)
+        self.campaign.tradeRoutes.update(self.addedTradeRoutes)
+
+    def undo(self) -> None:
+        '''Reverts the changes to the campaign'''
+        self.campaign.tradeRoutes.difference_update(self.addedTradeRoutes)
+        self.campaign.tradeRoutes.update(self.removedTradeRoutes)
+        self.campaign.planets.difference_update(self.addedPlanets)
+        self.campaign.planets.update(self.removedPlanets)
+
+    def mergeWith(self, command) -> bool:
+        '''Combines two edits of the same campaign into their net change'''
+        if not isinstance(command, CampaignEditCommand) or command.campaign is not self.campaign:
+            return False
+
+        self.addedPlanets, self.removedPlanets = self.__combine(self.addedPlanets, self.removedPlanets, command.addedPlanets, command.removedPlanets)
+        self.addedTradeRoutes, self.removedTradeRoutes = self.__combine(self.addedTradeRoutes, self.removedTradeRoutes, command.addedTradeRoutes, command.removedTradeRoutes)
+        return True
+
+    def isEmpty(self) -> bool:
+        '''Returns true if the command changes nothing'''
+        return self.size() == 0
+
+    def size(self) -> int:
+        return len(self.addedPlanets) + len(self.removedPlanets) + len(self.addedTradeRoutes) + len(self.removedTradeRoutes)
+
+    def __combine(self, firstAdded: frozenset, firstRemoved: frozenset, secondAdded: frozenset, secondRemoved: frozenset) -> tuple:
+        '''Returns the added and removed objects of two consecutive changes.
+        Objects added and then removed again, or the other way round, cancel out'''
+        return (firstAdded - secondRemoved) | (secondAdded - firstRemoved), (firstRemoved - secondAdded) | (secondRemoved - firstAdded)
@@ -0,0 +1,36 @@
+from typing import Iterable, List, Tuple
+
+from commands.CampaignEditCommand import CampaignEditCommand
+from commands.UndoableCommand import UndoableCommand
+from gameObjects.campaign import Campaign
+from gameObjects.gameObjectRepository import GameObjectRepository
+from gameObjects.traderoute import TradeRoute
+
+class CreateTradeRoutesCommand(UndoableCommand):
+    '''Creates trade routes and adds them to a campaign. The routes are added to the repository
+    and to the list of new trade routes to save, and undo removes them from all three'''
+    def __init__(self, repository: GameObjectRepository, newTradeRoutes: List[TradeRoute], campaign: Campaign, tradeRoutes: Iterable[TradeRoute]):
+        self.repository: GameObjectRepository = repository
+        self.newTradeRoutes: List[TradeRoute] = newTradeRoutes
+        self.campaign: Campaign = campaign
+        self.tradeRoutes: Tuple[TradeRoute, ...] = tuple(tradeRoutes)
+        self.campaignEdit: CampaignEditCommand = CampaignEditCommand(campaign, addedTradeRoutes = self.tradeRoutes)
+
+    def execute(self) -> None:
+        '''Adds the trade routes to the repository, the new trade routes and the campaign'''
+        for tradeRoute in self.tradeRoutes:
+            self.repository.addTradeRoute(tradeRoute)
+            self.newTradeRoutes.append(tradeRoute)
+
+        self.campaignEdit.execute()
+
+    def undo(self) -> None:
+        '''Removes the trade routes from the campaign, the new trade routes and the repository'''
+        self.campaignEdit.undo()
+
+        for tradeRoute in self.tradeRoutes:
+            self.newTradeRoutes.remove(tradeRoute)
+            self.repository.removeTradeRoute(tradeRoute)
+
+    def size(self) -> int:
+        return len(self.tradeRoutes)
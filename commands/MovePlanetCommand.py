@@ -0,0 +1,30 @@
+from commands.UndoableCommand import UndoableCommand
+from gameObjects.planet import Planet
+
+class MovePlanetCommand(UndoableCommand):
+    '''Moves a planet, storing only its old and new coordinates. Moves only merge when both
+    carry the same gesture, such as the updates of one drag'''
+    def __init__(self, planet: Planet, oldPosition: tuple, newPosition: tuple, gesture: object = None):
+        self.planet: Planet = planet
+        self.oldPosition: tuple = oldPosition
+        self.newPosition: tuple = newPosition
+        self.gesture: object = gesture
+
+    def execute(self) -> None:
+        '''Moves the planet to the new position'''
+        self.planet.x, self.planet.y = self.newPosition
+
+    def undo(self) -> None:
+        '''Moves the planet back to the old position'''
+        self.planet.x, self.planet.y = self.oldPosition
+
+    def mergeWith(self, command) -> bool:
+        '''Combines consecutive moves of the same planet in one gesture into one move'''
+        if not isinstance(command, MovePlanetCommand) or command.planet is not self.planet:
+            return False
+
+        if self.gesture is None or command.gesture != self.gesture:
+            return False
+
+        self.newPosition = command.newPosition
+        return True
@@ -0,0 +1,37 @@
+from typing import Iterable, Tuple
+
+from commands.UndoableCommand import UndoableCommand
+from gameObjects.planet import Planet
+
+class MovePlanetsCommand(UndoableCommand):
+    '''Moves many planets at once, storing only their old and new coordinates. Moves only merge
+    when both carry the same gesture'''
+    def __init__(self, planets: Iterable[Planet], oldPositions: Iterable[tuple], newPositions: Iterable[tuple], gesture: object = None):
+        self.planets: Tuple[Planet, ...] = tuple(planets)
+        self.oldPositions: Tuple[tuple, ...] = tuple(oldPositions)
+        self.newPositions: Tuple[tuple, ...] = tuple(newPositions)
+        self.gesture: object = gesture
+
+    def execute(self) -> None:
+        '''Moves the planets to their new positions'''
+        for planet, position in zip(self.planets, self.newPositions):
+            planet.x, planet.y = position
+
+    def undo(self) -> None:
+        '''Moves the planets back to their old positions'''
+        for planet, position in zip(self.planets, self.oldPositions):
+            planet.x, planet.y = position
+
+    def mergeWith(self, command) -> bool:
+        '''Combines consecutive moves of the same planets in one gesture into one move'''
+        if not isinstance(command, MovePlanetsCommand) or command.planets != self.planets:
+            return False
+
+        if self.gesture is None or command.gesture != self.gesture:
+            return False
+
+        self.newPositions = command.newPositions
+        return True
+
+    def size(self) -> int:
+        return len(self.planets)
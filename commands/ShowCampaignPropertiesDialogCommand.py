@@ -1,6 +1,5 @@
 from commands.Command import Command
 from gameObjects.campaign import Campaign
-from ui.qtcampaignproperties import QtCampaignProperties
 from ui.dialogs import Dialog, DialogResult
 from ui.DialogFactory import DialogFactory
 from ui.mainwindow_presenter import MainWindowPresenter
@@ -0,0 +1,18 @@
+from commands.Command import Command
+from ui.dialogs import Dialog, DialogResult
+from ui.DialogFactory import DialogFactory
+from ui.mainwindow_presenter import MainWindowPresenter
+
+class ShowPlanetTransformDialogCommand(Command):
+    '''Class to handle displaying the planet transform dialog box'''
+    def __init__(self, mainWindowPresenter: MainWindowPresenter, dialogFactory: DialogFactory):
+        self.__dialogFactory = dialogFactory
+        self.__presenter = mainWindowPresenter
+
+    def execute(self) -> None:
+        '''Runs the dialog and applies the transform to the planets of the selected campaign'''
+        dialog = self.__dialogFactory.makePlanetTransformDialog()
+        result: DialogResult = dialog.show()
+
+        if result is DialogResult.Ok:
+            self.__presenter.onPlanetsTransformed(dialog.getTransform())
@@ -1,6 +1,5 @@
 from commands.Command import Command
 from gameObjects.traderoute import TradeRoute
-from ui.qttraderoutecreator import QtTradeRouteCreator
 from ui.dialogs import Dialog, DialogResult
 from ui.DialogFactory import DialogFactory
 from ui.mainwindow_presenter import MainWindowPresenter
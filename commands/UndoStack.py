@@ -0,0 +1,88 @@
+import time
+from collections import deque
+from typing import Callable, Deque, List
+
+from commands.UndoableCommand import UndoableCommand
+
+class UndoStack:
+    '''History of executed commands for undo and redo.
+    Commands pushed within mergeInterval seconds of the previous one are merged into it if possible.
+    The oldest commands are dropped once more than maximumCommands are stored or their
+    combined size exceeds maximumSize'''
+    def __init__(self, maximumCommands: int = 200, maximumSize: int = 100000, mergeInterval: float = 0.5, clock: Callable[[], float] = time.monotonic):
+        self.__undoCommands: Deque[UndoableCommand] = deque()
+        self.__redoCommands: List[UndoableCommand] = []
+        self.__maximumCommands: int = maximumCommands
+        self.__maximumSize: int = maximumSize
+        self.__mergeInterval: float = mergeInterval
+        self.__clock: Callable[[], float] = clock
+        self.__lastPush: float = None
+        self.__size: int = 0
+
+    def push(self, command: UndoableCommand) -> None:
+        '''Adds a command that has already been executed. Clears the redo history'''
+        now = self.__clock()
+        mergeable = self.__lastPush is not None and now - self.__lastPush <= self.__mergeInterval
+        self.__lastPush = now
+
+        self.__redoCommands.clear()
+
+        if mergeable and self.__undoCommands:
+            top = self.__undoCommands[-1]
+            oldSize = top.size()
+            if top.mergeWith(command):
+                self.__size += top.size() - oldSize
+                if top.size() == 0:
+                    #the commands cancelled each other out
+                    self.__undoCommands.pop()
+                self.__trim()
+                return
+
+        self.__undoCommands.append(command)
+        self.__size += command.size()
+        self.__trim()
+
+    def undo(self) -> UndoableCommand:
+        '''Reverts the last command and returns it, or returns None if there is nothing to undo'''
+        if not self.__undoCommands:
+            return None
+
+        command = self.__undoCommands.pop()
+        self.__size -= command.size()
+        command.undo()
+        self.__redoCommands.append(command)
+        self.__lastPush = None
+        return command
+
+    def redo(self) -> UndoableCommand:
+        '''Executes the last undone command again and returns it, or returns None if there is nothing to redo'''
+        if not self.__redoCommands:
+            return None
+
+        command = self.__redoCommands.pop()
+        command.execute()
+        self.__undoCommands.append(command)
+        self.__size += command.size()
+        self.__lastPush = None
+        self.__trim()
+        return command
+
+    def clear(self) -> None:
+        '''Forgets all commands'''
+        self.__undoCommands.clear()
+        self.__redoCommands.clear()
+        self.__lastPush = None
+        self.__size = 0
+
+    def __trim(self) -> None:
+        '''Drops the oldest commands until the history is within its bounds'''
+        while len(self.__undoCommands) > 1 and (len(self.__undoCommands) > self.__maximumCommands or self.__size > self.__maximumSize):
+            self.__size -= self.__undoCommands.popleft().size()
+
+    @property
+    def canUndo(self) -> bool:
+        return len(self.__undoCommands) > 0
+
+    @property
+    def canRedo(self) -> bool:
+        return len(self.__redoCommands) > 0
@@ -0,0 +1,19 @@
+from abc import abstractmethod
+
+from commands.Command import Command
+
+class UndoableCommand(Command):
+    '''Command that can be reverted. Commands store only what they change'''
+
+    @abstractmethod
+    def undo(self) -> None:
+        raise NotImplementedError()
+
+    def mergeWith(self, command) -> bool:
+        '''Absorbs a command executed right after this one, so both are undone in one step.
+        Returns false if the commands cannot be merged'''
+        return False
+
+    def size(self) -> int:
+        '''Number of objects referenced by the command, used to bound the undo history'''
+        return 1
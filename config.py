@@ -10,6 +10,26 @@ class Config():
         self.dataPath = self.__configRoot.find("DataPath").text
         self.autoPlanetConnectionDistance = int(self.__configRoot.find("MaximumFleetMovementDistance").text)
 
+        #patch only the changed coordinates into planet files instead of rewriting them with lxml
+        patchPlanetFiles = self.__configRoot.find("PatchPlanetFiles")
+        self.patchPlanetFiles = patchPlanetFiles is None or patchPlanetFiles.text.strip().lower() != "false"
+
+        #graph used to turn auto connections into trade routes, see TradeRouteGenerator
+        autoTradeRouteMode = self.__configRoot.find("AutoTradeRouteMode")
+        self.autoTradeRouteMode = "rng" if autoTradeRouteMode is None else autoTradeRouteMode.text.strip()
+
+        #galaxy map drawn with matplotlib, or with a QGraphicsScene for "scene"
+        galacticPlotBackend = self.__configRoot.find("GalacticPlotBackend")
+        self.galacticPlotBackend = "matplotlib" if galacticPlotBackend is None else galacticPlotBackend.text.strip().lower()
+
+        #planets closer to each other than this are reported by the planet spacing check
+        minimumPlanetSpacing = self.__configRoot.find("MinimumPlanetSpacing")
+        self.minimumPlanetSpacing = 10.0 if minimumPlanetSpacing is None else float(minimumPlanetSpacing.text)
+
+        #Data folders a mod builds on, e.g. the base game, in load order. Files the mod does not have are read from them
+        baseDataFolders = self.__configRoot.find("BaseDataFolders")
+        self.baseDataFolders = [] if baseDataFolders is None else [folder.text.strip() for folder in baseDataFolders.iter("Folder") if folder.text and folder.text.strip()]
+
         if not self.dataPath:
             self.dataPath = os.getcwd()
                 
\ No newline at end of file
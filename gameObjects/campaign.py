@@ -12,6 +12,10 @@ class Campaign:
         self.__planets: Set[Planet] = set()
         self.__tradeRoutes: Set[TradeRoute] = set()
 
+        #names in Locations and Trade_Routes that did not match an object when loaded
+        self.__unresolvedPlanets: Set[str] = set()
+        self.__unresolvedTradeRoutes: Set[str] = set()
+
     @property
     def name(self) -> str:
         return self.__name
@@ -46,4 +50,22 @@ class Campaign:
     @tradeRoutes.setter
     def tradeRoutes(self, value: Set[TradeRoute]) -> None:
         if value is not None:
-            self.__tradeRoutes = value
\ No newline at end of file
+            self.__tradeRoutes = value
+
+    @property
+    def unresolvedPlanets(self) -> Set[str]:
+        return self.__unresolvedPlanets
+
+    @unresolvedPlanets.setter
+    def unresolvedPlanets(self, value: Set[str]) -> None:
+        if value is not None:
+            self.__unresolvedPlanets = value
+
+    @property
+    def unresolvedTradeRoutes(self) -> Set[str]:
+        return self.__unresolvedTradeRoutes
+
+    @unresolvedTradeRoutes.setter
+    def unresolvedTradeRoutes(self, value: Set[str]) -> None:
+        if value is not None:
+            self.__unresolvedTradeRoutes = value
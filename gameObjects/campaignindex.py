@@ -0,0 +1,89 @@
+'''Which campaigns use a planet or trade route.
+
+Campaigns hold sets of their planets and trade routes, so finding every
+campaign that uses one object would mean looking through all campaigns. The
+index maps each planet and trade route to the campaigns containing it instead.
+It remembers the members it last saw for each campaign, so updating it after an
+edit only applies the difference to what the campaign holds now.
+'''
+
+from typing import Dict, Generic, Iterable, Set, TypeVar
+
+from gameObjects.campaign import Campaign
+from gameObjects.planet import Planet
+from gameObjects.traderoute import TradeRoute
+
+T = TypeVar("T")
+
+
+class MembershipIndex(Generic[T]):
+    '''Maps objects to the campaigns containing them'''
+    def __init__(self):
+        self.__campaigns: Dict[T, Set[Campaign]] = dict()
+        self.__members: Dict[Campaign, Set[T]] = dict()
+
+    def update(self, campaign: Campaign, members: Iterable[T]) -> None:
+        '''Records the current members of a campaign, unresolved members are left out'''
+        members = {member for member in members if member is not None}
+        previous = self.__members.get(campaign, set())
+
+        for member in previous - members:
+            self.__discard(member, campaign)
+        for member in members - previous:
+            self.__campaigns.setdefault(member, set()).add(campaign)
+
+        self.__members[campaign] = members
+
+    def remove(self, campaign: Campaign) -> None:
+        '''Forgets a campaign'''
+        for member in self.__members.pop(campaign, set()):
+            self.__discard(member, campaign)
+
+    def campaigns(self, member: T) -> Set[Campaign]:
+        '''Returns the campaigns containing an object'''
+        return set(self.__campaigns.get(member, ()))
+
+    def clear(self) -> None:
+        self.__campaigns.clear()
+        self.__members.clear()
+
+    def __discard(self, member: T, campaign: Campaign) -> None:
+        campaigns = self.__campaigns.get(member)
+        if campaigns is not None:
+            campaigns.discard(campaign)
+            if not campaigns:
+                del self.__campaigns[member]
+
+
+class CampaignIndex:
+    '''Planets and trade routes to the campaigns using them.
+    Call update with a campaign after changing its planets or trade routes'''
+    def __init__(self, campaigns: Iterable[Campaign] = ()):
+        self.__planets: MembershipIndex[Planet] = MembershipIndex()
+        self.__tradeRoutes: MembershipIndex[TradeRoute] = MembershipIndex()
+
+        for campaign in campaigns:
+            self.update(campaign)
+
+    def update(self, campaign: Campaign) -> None:
+        '''Brings the entries of a campaign up to date with its planets and trade routes'''
+        self.__planets.update(campaign, campaign.planets)
+        self.__tradeRoutes.update(campaign, campaign.tradeRoutes)
+
+    def remove(self, campaign: Campaign) -> None:
+        '''Forgets a campaign'''
+        self.__planets.remove(campaign)
+        self.__tradeRoutes.remove(campaign)
+
+    def campaignsWithPlanet(self, planet: Planet) -> Set[Campaign]:
+        '''Returns the campaigns that have a planet'''
+        return self.__planets.campaigns(planet)
+
+    def campaignsWithTradeRoute(self, tradeRoute: TradeRoute) -> Set[Campaign]:
+        '''Returns the campaigns that have a trade route, the ones that break if it is deleted'''
+        return self.__tradeRoutes.campaigns(tradeRoute)
+
+    def clear(self) -> None:
+        '''Forgets all campaigns'''
+        self.__planets.clear()
+        self.__tradeRoutes.clear()
@@ -1,11 +1,13 @@
-from typing import List, Set
+from typing import Dict, Iterable, List, Set, Tuple
 
 from gameObjects.planet import Planet
 from gameObjects.traderoute import TradeRoute
 from gameObjects.campaign import Campaign
+from gameObjects.campaignindex import CampaignIndex
 from gameObjects.faction import Faction
 from gameObjects.aiplayer import AIPlayer
 from gameObjects.unit import Unit
+from gameObjects.nametable import NameTable, nameKey
 
 class GameObjectRepository:
     '''Repository of GameObjects. Has campaigns, planets and traderoutes'''
@@ -16,22 +18,75 @@ class GameObjectRepository:
         self.__factions: Set[Faction] = set()
         self.__aiplayers: Set[AIPlayer] = set()
         self.__units: Set[Unit] = set()
+        self.__planetFiles: Dict[str, str] = dict()
+        self.__planetPositionSources: Dict[str, Tuple[int, str]] = dict()
+        self.__campaignFiles: Dict[str, str] = dict()
+        self.__dataFileSources: Dict[str, str] = dict()
+        self.__planetNames: NameTable[Planet] = NameTable()
+        self.__tradeRouteNames: NameTable[TradeRoute] = NameTable()
+        self.__campaignIndex: CampaignIndex = CampaignIndex()
 
     def addCampaign(self, campaign: Campaign) -> None:
         '''Add a Campaign to the repository'''
         self.__campaigns.add(campaign)
+        self.__campaignIndex.update(campaign)
 
     def removeCampaign(self, campaign: Campaign) -> None:
         '''Remove a Campaign from the repository'''
         self.__campaigns.remove(campaign)
+        self.__campaignIndex.remove(campaign)
+
+    def updateCampaign(self, campaign: Campaign) -> None:
+        '''Updates the campaign index after the planets or trade routes of a campaign changed'''
+        if campaign in self.__campaigns:
+            self.__campaignIndex.update(campaign)
 
     def addPlanet(self, planet: Planet) -> None:
         '''Add a Planet to the repository'''
         self.__planets.add(planet)
+        self.__planetNames.add(planet)
 
     def removePlanet(self, planet: Planet) -> None:
         '''Remove a Planet from the repository'''
         self.__planets.remove(planet)
+        self.__planetNames.remove(planet)
+
+    def setPlanetFile(self, name: str, file: str) -> None:
+        '''Record the XML file, relative to the XML folder, a planet is defined in'''
+        self.__planetFiles[nameKey(name)] = file
+
+    def getPlanetFile(self, name: str) -> str:
+        '''Returns the XML file a planet is defined in, ignoring case, or None if it is unknown'''
+        return self.__planetFiles.get(nameKey(name))
+
+    def getPlanetFiles(self, names: Iterable[str]) -> Set[str]:
+        '''Returns the XML files defining the named planets, ignoring case. Raises a KeyError if one of them is unknown'''
+        return {self.__planetFiles[nameKey(name)] for name in names}
+
+    def setPlanetPositionSource(self, name: str, line: int, text: str) -> None:
+        '''Record the source line and text of the Galactic_Position tag of a planet in its XML file'''
+        self.__planetPositionSources[nameKey(name)] = (line, text)
+
+    def getPlanetPositionSource(self, name: str) -> Tuple[int, str]:
+        '''Returns the source line and text of the Galactic_Position tag of a planet, ignoring case, or None if it is unknown'''
+        return self.__planetPositionSources.get(nameKey(name))
+
+    def setCampaignFile(self, name: str, file: str) -> None:
+        '''Record the XML file, relative to the XML folder, a campaign is defined in'''
+        self.__campaignFiles[nameKey(name)] = file
+
+    def getCampaignFile(self, name: str) -> str:
+        '''Returns the XML file a campaign is defined in, ignoring case, or None if it is unknown'''
+        return self.__campaignFiles.get(nameKey(name))
+
+    def setDataFileSource(self, file: str, path: str) -> None:
+        '''Record the path a file, relative to the XML folder, was read from.
+        With base Data folders this can be a file outside of the mod'''
+        self.__dataFileSources[file] = path
+
+    def getDataFileSource(self, file: str) -> str:
+        '''Returns the path a file relative to the XML folder was read from, or None if it is unknown'''
+        return self.__dataFileSources.get(file)
 
     def planetExists(self, name: str) -> None:
         '''Returns true if a planet exists by name, false otherwise'''
@@ -50,12 +105,20 @@ class GameObjectRepository:
             return False
 
     def getPlanetByName(self, name: str) -> None:
-        '''Returns a planet object given its name'''
-        for planet in self.planets:
-            if planet.name == name:
-                return planet
+        '''Returns a planet object given its name, ignoring case'''
+        planet = self.__planetNames.get(name)
+        if planet is None:
+            raise RuntimeError("Searching for non existing planet " + name)
+
+        return planet
+
+    def getTradeRouteByName(self, name: str) -> TradeRoute:
+        '''Returns a traderoute object given its name, ignoring case'''
+        tradeRoute = self.__tradeRouteNames.get(name)
+        if tradeRoute is None:
+            raise RuntimeError("Searching for non existing Trade Route " + name)
 
-        raise RuntimeError("Searching for non existing planet " + name)
+        return tradeRoute
 
     def getTradeRouteByPlanets(self, start: Planet, end: Planet) -> None:
         '''Returns a traderoute object given its start and end planets'''
@@ -72,10 +135,12 @@ class GameObjectRepository:
     def addTradeRoute(self, tradeRoute: TradeRoute) -> None:
         '''Add a TradeRoute to the repository'''
         self.__tradeRoutes.add(tradeRoute)
+        self.__tradeRouteNames.add(tradeRoute)
 
     def removeTradeRoute(self, tradeRoute: TradeRoute) -> None:
         '''Remove a TradeRoute from the repository'''
         self.__tradeRoutes.remove(tradeRoute)
+        self.__tradeRouteNames.remove(tradeRoute)
 
     def addFaction(self, faction: Faction) -> None:
         '''Add a Faction to the repository'''
@@ -109,6 +174,30 @@ class GameObjectRepository:
         self.__factions.clear()
         self.__aiplayers.clear()
         self.__units.clear()
+        self.__planetFiles.clear()
+        self.__planetPositionSources.clear()
+        self.__campaignFiles.clear()
+        self.__dataFileSources.clear()
+        self.__planetNames.clear()
+        self.__tradeRouteNames.clear()
+        self.__campaignIndex.clear()
+
+    def replaceContents(self, repository) -> None:
+        '''Replace all GameObjects with those of another repository in a single step,
+        so that everything holding a reference to this repository sees the new data'''
+        self.__campaigns = repository.__campaigns
+        self.__planets = repository.__planets
+        self.__tradeRoutes = repository.__tradeRoutes
+        self.__factions = repository.__factions
+        self.__aiplayers = repository.__aiplayers
+        self.__units = repository.__units
+        self.__planetFiles = repository.__planetFiles
+        self.__planetPositionSources = repository.__planetPositionSources
+        self.__campaignFiles = repository.__campaignFiles
+        self.__dataFileSources = repository.__dataFileSources
+        self.__planetNames = repository.__planetNames
+        self.__tradeRouteNames = repository.__tradeRouteNames
+        self.__campaignIndex = repository.__campaignIndex
 
     @property
     def campaigns(self) -> Set[Campaign]:
@@ -118,6 +207,21 @@ class GameObjectRepository:
     def planets(self) -> Set[Planet]:
         return set(self.__planets)
 
+    @property
+    def planetNames(self) -> NameTable[Planet]:
+        '''Planets by name. Not a copy, use the add and remove methods to change it'''
+        return self.__planetNames
+
+    @property
+    def tradeRouteNames(self) -> NameTable[TradeRoute]:
+        '''Trade routes by name. Not a copy, use the add and remove methods to change it'''
+        return self.__tradeRouteNames
+
+    @property
+    def campaignIndex(self) -> CampaignIndex:
+        '''Campaigns using each planet and trade route. Not a copy, use updateCampaign to change it'''
+        return self.__campaignIndex
+
     @property
     def tradeRoutes(self) -> Set[TradeRoute]:
         return set(self.__tradeRoutes)
@@ -0,0 +1,61 @@
+'''Case-insensitive name matching for GameObjects.
+
+Game XML refers to objects by name without regard to case, e.g. a Point_A of
+PLANET_0 refers to the planet named Planet_0. Names are normalized to keys and
+the keys are interned, so the same name read from many files shares one string.
+Recently used names are kept with their keys in a bounded cache, so looking up a
+known name again does not normalize it again, and names no longer in use drop out.
+'''
+
+import sys
+from functools import lru_cache
+from typing import Dict, Generic, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+#enough for the planets, trade routes and campaigns of large mods
+NAME_CACHE_SIZE = 1 << 16
+
+@lru_cache(maxsize = NAME_CACHE_SIZE)
+def nameKey(name: str) -> str:
+    '''Returns the canonical key of a name, or None for a missing name'''
+    if name is None:
+        return None
+
+    return sys.intern(name.strip().lower())
+
+
+class NameTable(Generic[T]):
+    '''Maps the canonical keys of GameObject names to the objects'''
+    def __init__(self, objects: Iterable[T] = ()):
+        self.__objects: Dict[str, T] = dict()
+
+        for gameObject in objects:
+            self.add(gameObject)
+
+    def add(self, gameObject: T) -> None:
+        '''Adds an object under its name, replacing an object of the same name'''
+        self.__objects[nameKey(gameObject.name)] = gameObject
+
+    def remove(self, gameObject: T) -> None:
+        '''Removes an object if it is the one stored under its name'''
+        key = nameKey(gameObject.name)
+        if self.__objects.get(key) is gameObject:
+            del self.__objects[key]
+
+    def get(self, name: str, default: T = None) -> T:
+        '''Returns the object of a name, ignoring case, or default if there is none'''
+        return self.__objects.get(nameKey(name), default)
+
+    def clear(self) -> None:
+        '''Removes all objects'''
+        self.__objects.clear()
+
+    def __contains__(self, name: str) -> bool:
+        return nameKey(name) in self.__objects
+
+    def __len__(self) -> int:
+        return len(self.__objects)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.__objects.values())
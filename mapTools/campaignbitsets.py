@@ -0,0 +1,184 @@
+'''Campaign membership as bitsets.
+
+Campaigns keep their planets and trade routes in sets of objects. For work over
+many campaigns at once, planets and trade routes can instead be given dense
+integer ids, and the members of a campaign stored as a bitset with one bit per
+id in an array of 64 bit words. Union, intersection and difference are then
+bitwise operations over a few words, and a campaign costs one bit per planet.
+Bitsets are turned back into sets of objects only where results leave this
+module.
+'''
+
+from typing import Dict, Generic, Iterable, List, Set, TypeVar
+
+import numpy as np
+
+from gameObjects.campaign import Campaign
+from gameObjects.planet import Planet
+from gameObjects.traderoute import TradeRoute
+
+T = TypeVar("T")
+
+#little endian words, so the bytes of a word hold its bits in ascending order
+WORD = np.dtype("<u8")
+
+
+class DenseIds(Generic[T]):
+    '''Numbers objects from 0 in the order they are first seen'''
+    def __init__(self, objects: Iterable[T] = ()):
+        self.__ids: Dict[T, int] = dict()
+        self.__objects: List[T] = list()
+
+        for gameObject in objects:
+            self.add(gameObject)
+
+    def add(self, gameObject: T) -> int:
+        '''Returns the id of an object, giving it the next id if it has none'''
+        objectId = self.__ids.get(gameObject)
+        if objectId is None:
+            objectId = len(self.__objects)
+            self.__ids[gameObject] = objectId
+            self.__objects.append(gameObject)
+
+        return objectId
+
+    def get(self, gameObject: T) -> int:
+        '''Returns the id of an object or None'''
+        return self.__ids.get(gameObject)
+
+    def objectAt(self, objectId: int) -> T:
+        return self.__objects[objectId]
+
+    def __len__(self) -> int:
+        return len(self.__objects)
+
+
+class Bitset:
+    '''Set of dense ids stored as bits of 64 bit words. Bitsets of different
+    lengths can be combined, missing words count as empty'''
+    def __init__(self, words: np.ndarray = None):
+        self.__words: np.ndarray = np.zeros(0, dtype = WORD) if words is None else np.asarray(words, dtype = WORD)
+
+    @classmethod
+    def fromIds(cls, ids: Iterable[int], size: int = 0):
+        '''Returns the bitset of ids, with room for at least size ids'''
+        ids = np.fromiter(ids, dtype = np.int64)
+        length = max(size, int(ids.max()) + 1 if len(ids) else 0)
+        words = np.zeros((length + 63) // 64, dtype = WORD)
+        np.bitwise_or.at(words, ids >> 6, np.left_shift(np.uint64(1), (ids & 63).astype(np.uint64)))
+        return cls(words)
+
+    @property
+    def words(self) -> np.ndarray:
+        return self.__words
+
+    def ids(self) -> np.ndarray:
+        '''Returns the ids in the set in ascending order'''
+        return np.nonzero(np.unpackbits(self.__words.view(np.uint8), bitorder = "little"))[0]
+
+    def __or__(self, other: "Bitset") -> "Bitset":
+        first, second = self.__padded(other)
+        return Bitset(first | second)
+
+    def __and__(self, other: "Bitset") -> "Bitset":
+        length = min(len(self.__words), len(other.words))
+        return Bitset(self.__words[:length] & other.words[:length])
+
+    def __sub__(self, other: "Bitset") -> "Bitset":
+        first, second = self.__padded(other)
+        return Bitset((first & ~second)[:len(self.__words)])
+
+    def __contains__(self, objectId: int) -> bool:
+        word = objectId >> 6
+        return word < len(self.__words) and bool((int(self.__words[word]) >> (objectId & 63)) & 1)
+
+    def __len__(self) -> int:
+        return int(np.unpackbits(self.__words.view(np.uint8)).sum())
+
+    def __bool__(self) -> bool:
+        return bool(self.__words.any())
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Bitset):
+            return NotImplemented
+        first, second = self.__padded(other)
+        return bool(np.array_equal(first, second))
+
+    def __padded(self, other: "Bitset"):
+        '''Returns the words of both bitsets padded with empty words to the same length'''
+        length = max(len(self.__words), len(other.words))
+        return (np.pad(self.__words, (0, length - len(self.__words))), np.pad(other.words, (0, length - len(other.words))))
+
+
+class CampaignMembership:
+    '''Planets and trade routes of many campaigns as bitsets over shared dense ids.
+    The bitsets are a snapshot, refresh a campaign after changing its sets'''
+    def __init__(self, campaigns: Iterable[Campaign] = ()):
+        self.__planetIds: DenseIds[Planet] = DenseIds()
+        self.__tradeRouteIds: DenseIds[TradeRoute] = DenseIds()
+        self.__planets: Dict[Campaign, Bitset] = dict()
+        self.__tradeRoutes: Dict[Campaign, Bitset] = dict()
+
+        for campaign in campaigns:
+            self.refresh(campaign)
+
+    def refresh(self, campaign: Campaign) -> None:
+        '''Stores the current planets and trade routes of a campaign'''
+        self.__planets[campaign] = self.planetBitset(campaign.planets)
+        self.__tradeRoutes[campaign] = self.tradeRouteBitset(campaign.tradeRoutes)
+
+    def remove(self, campaign: Campaign) -> None:
+        '''Forgets a campaign'''
+        self.__planets.pop(campaign, None)
+        self.__tradeRoutes.pop(campaign, None)
+
+    def planetBitset(self, planets: Iterable[Planet]) -> Bitset:
+        '''Returns the bitset of planets, unresolved planets are left out'''
+        return Bitset.fromIds(self.__planetIds.add(p) for p in planets if p is not None)
+
+    def tradeRouteBitset(self, tradeRoutes: Iterable[TradeRoute]) -> Bitset:
+        '''Returns the bitset of trade routes, unresolved trade routes are left out'''
+        return Bitset.fromIds(self.__tradeRouteIds.add(t) for t in tradeRoutes if t is not None)
+
+    def planetsOf(self, campaign: Campaign) -> Bitset:
+        return self.__planets[campaign]
+
+    def tradeRoutesOf(self, campaign: Campaign) -> Bitset:
+        return self.__tradeRoutes[campaign]
+
+    def planets(self, bitset: Bitset) -> Set[Planet]:
+        '''Returns the planets of a bitset'''
+        return {self.__planetIds.objectAt(planetId) for planetId in bitset.ids().tolist()}
+
+    def tradeRoutes(self, bitset: Bitset) -> Set[TradeRoute]:
+        '''Returns the trade routes of a bitset'''
+        return {self.__tradeRouteIds.objectAt(tradeRouteId) for tradeRouteId in bitset.ids().tolist()}
+
+    def sharedPlanets(self, campaigns: Iterable[Campaign]) -> Bitset:
+        '''Returns the planets all of the campaigns have'''
+        return self.__reduce(self.__planets, campaigns, np.bitwise_and)
+
+    def anyPlanets(self, campaigns: Iterable[Campaign]) -> Bitset:
+        '''Returns the planets any of the campaigns has'''
+        return self.__reduce(self.__planets, campaigns, np.bitwise_or)
+
+    def sharedTradeRoutes(self, campaigns: Iterable[Campaign]) -> Bitset:
+        '''Returns the trade routes all of the campaigns have'''
+        return self.__reduce(self.__tradeRoutes, campaigns, np.bitwise_and)
+
+    def anyTradeRoutes(self, campaigns: Iterable[Campaign]) -> Bitset:
+        '''Returns the trade routes any of the campaigns has'''
+        return self.__reduce(self.__tradeRoutes, campaigns, np.bitwise_or)
+
+    def __reduce(self, bitsets: Dict[Campaign, Bitset], campaigns: Iterable[Campaign], operation) -> Bitset:
+        '''Combines the bitsets of campaigns in one operation over a matrix of their words'''
+        rows = [bitsets[campaign].words for campaign in campaigns]
+        if not rows:
+            return Bitset()
+
+        length = max(len(row) for row in rows)
+        matrix = np.zeros((len(rows), length), dtype = WORD)
+        for index, row in enumerate(rows):
+            matrix[index, :len(row)] = row
+
+        return Bitset(operation.reduce(matrix, axis = 0))
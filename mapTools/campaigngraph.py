@@ -0,0 +1,240 @@
+import heapq
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+from gameObjects.planet import Planet
+from gameObjects.traderoute import TradeRoute
+
+
+class CampaignGraph:
+    '''Graph of campaign planets connected by trade routes.
+    Routes only count as edges while both of their planets are part of the graph.
+    Adding planets and routes updates the connected components in place, removing them
+    marks the components for a rebuild on the next query'''
+    def __init__(self, planets: Iterable[Planet] = (), tradeRoutes: Iterable[TradeRoute] = ()):
+        self.__planets: Set[Planet] = set()
+        self.__tradeRoutes: Set[TradeRoute] = set()
+        self.__routesByPlanet: Dict[Planet, Set[TradeRoute]] = dict()
+
+        #number of active routes between two planets, by planet
+        self.__adjacency: Dict[Planet, Dict[Planet, int]] = dict()
+
+        self.__parent: Dict[Planet, Planet] = dict()
+        self.__size: Dict[Planet, int] = dict()
+        self.__componentsValid: bool = True
+
+        self.update(planets, tradeRoutes)
+
+    def update(self, planets: Iterable[Planet], tradeRoutes: Iterable[TradeRoute]) -> None:
+        '''Brings the graph in line with a campaign's planets and trade routes,
+        only applying the differences'''
+        planets = set(p for p in planets if p is not None)
+        tradeRoutes = set(t for t in tradeRoutes if t is not None)
+
+        for tradeRoute in self.__tradeRoutes - tradeRoutes:
+            self.removeTradeRoute(tradeRoute)
+        for planet in self.__planets - planets:
+            self.removePlanet(planet)
+        for planet in planets - self.__planets:
+            self.addPlanet(planet)
+        for tradeRoute in tradeRoutes - self.__tradeRoutes:
+            self.addTradeRoute(tradeRoute)
+
+    def addPlanet(self, planet: Planet) -> None:
+        '''Adds a planet and activates the routes connecting it to planets in the graph'''
+        if planet in self.__planets:
+            return
+
+        self.__planets.add(planet)
+        self.__adjacency[planet] = dict()
+        self.__parent[planet] = planet
+        self.__size[planet] = 1
+
+        for tradeRoute in self.__routesByPlanet.get(planet, ()):
+            self.__activate(tradeRoute)
+
+    def removePlanet(self, planet: Planet) -> None:
+        '''Removes a planet. Its routes stay known and become active again if it is added back'''
+        if planet not in self.__planets:
+            return
+
+        for tradeRoute in self.__routesByPlanet.get(planet, ()):
+            self.__deactivate(tradeRoute)
+
+        self.__planets.remove(planet)
+        del self.__adjacency[planet]
+        self.__componentsValid = False
+
+    def addTradeRoute(self, tradeRoute: TradeRoute) -> None:
+        '''Adds a trade route'''
+        if tradeRoute in self.__tradeRoutes:
+            return
+
+        self.__tradeRoutes.add(tradeRoute)
+        self.__routesByPlanet.setdefault(tradeRoute.start, set()).add(tradeRoute)
+        self.__routesByPlanet.setdefault(tradeRoute.end, set()).add(tradeRoute)
+        self.__activate(tradeRoute)
+
+    def removeTradeRoute(self, tradeRoute: TradeRoute) -> None:
+        '''Removes a trade route'''
+        if tradeRoute not in self.__tradeRoutes:
+            return
+
+        self.__deactivate(tradeRoute)
+        self.__tradeRoutes.remove(tradeRoute)
+        self.__routesByPlanet[tradeRoute.start].discard(tradeRoute)
+        self.__routesByPlanet[tradeRoute.end].discard(tradeRoute)
+
+    def neighbours(self, planet: Planet) -> List[Planet]:
+        '''Returns the planets connected to a planet by a trade route'''
+        return list(self.__adjacency.get(planet, ()))
+
+    def isConnected(self) -> bool:
+        '''Returns true if every planet can be reached from every other planet'''
+        return len(self.components()) <= 1
+
+    def components(self) -> List[Set[Planet]]:
+        '''Returns the connected groups of planets, largest first'''
+        groups: Dict[Planet, Set[Planet]] = dict()
+        for planet in self.__planets:
+            groups.setdefault(self.__find(planet), set()).add(planet)
+
+        return sorted(groups.values(), key = len, reverse = True)
+
+    def sameComponent(self, first: Planet, second: Planet) -> bool:
+        '''Returns true if a planet can be reached from another'''
+        if first not in self.__planets or second not in self.__planets:
+            return False
+
+        return self.__find(first) is self.__find(second)
+
+    def isolatedPlanets(self) -> List[Planet]:
+        '''Returns the planets without any trade route'''
+        return [planet for planet, neighbours in self.__adjacency.items() if not neighbours]
+
+    def shortestPath(self, start: Planet, end: Planet) -> Tuple[float, List[Planet]]:
+        '''Returns the length and planets of the shortest path along trade routes,
+        measured with Planet.distanceTo, or None if there is no path'''
+        if not self.sameComponent(start, end):
+            return None
+
+        distances: Dict[Planet, float] = {start: 0.0}
+        previous: Dict[Planet, Planet] = dict()
+        queue = [(0.0, 0, start)]
+        counter = 1
+
+        while queue:
+            distance, _, planet = heapq.heappop(queue)
+            if planet is end:
+                break
+            if distance > distances[planet]:
+                continue
+
+            for neighbour in self.__adjacency[planet]:
+                newDistance = distance + planet.distanceTo(neighbour)
+                if newDistance < distances.get(neighbour, float("inf")):
+                    distances[neighbour] = newDistance
+                    previous[neighbour] = planet
+                    heapq.heappush(queue, (newDistance, counter, neighbour))
+                    counter += 1
+
+        return distances[end], self.__path(previous, start, end)
+
+    def fewestJumps(self, start: Planet, end: Planet) -> List[Planet]:
+        '''Returns the path along trade routes with the fewest jumps, or None if there is no path'''
+        if not self.sameComponent(start, end):
+            return None
+
+        previous: Dict[Planet, Planet] = {start: None}
+        queue = deque([start])
+
+        while queue:
+            planet = queue.popleft()
+            if planet is end:
+                break
+
+            for neighbour in self.__adjacency[planet]:
+                if neighbour not in previous:
+                    previous[neighbour] = planet
+                    queue.append(neighbour)
+
+        return self.__path(previous, start, end)
+
+    @property
+    def planets(self) -> Set[Planet]:
+        return set(self.__planets)
+
+    @property
+    def tradeRoutes(self) -> Set[TradeRoute]:
+        return set(self.__tradeRoutes)
+
+    def __path(self, previous: Dict[Planet, Planet], start: Planet, end: Planet) -> List[Planet]:
+        '''Follows the previous planets back from end to start'''
+        path = [end]
+        while path[-1] is not start:
+            path.append(previous[path[-1]])
+
+        return list(reversed(path))
+
+    def __activate(self, tradeRoute: TradeRoute) -> None:
+        '''Adds the edge of a route whose planets are both in the graph'''
+        start, end = tradeRoute.start, tradeRoute.end
+        if start not in self.__planets or end not in self.__planets or start is end:
+            return
+
+        self.__adjacency[start][end] = self.__adjacency[start].get(end, 0) + 1
+        self.__adjacency[end][start] = self.__adjacency[end].get(start, 0) + 1
+
+        if self.__componentsValid:
+            self.__union(start, end)
+
+    def __deactivate(self, tradeRoute: TradeRoute) -> None:
+        '''Removes the edge of a route if it is active'''
+        start, end = tradeRoute.start, tradeRoute.end
+        if start not in self.__planets or end not in self.__planets or start is end:
+            return
+
+        for first, second in ((start, end), (end, start)):
+            count = self.__adjacency[first][second] - 1
+            if count:
+                self.__adjacency[first][second] = count
+            else:
+                del self.__adjacency[first][second]
+
+        self.__componentsValid = False
+
+    def __find(self, planet: Planet) -> Planet:
+        '''Returns the representative planet of the component of a planet'''
+        if not self.__componentsValid:
+            self.__rebuildComponents()
+
+        root = planet
+        while self.__parent[root] is not root:
+            root = self.__parent[root]
+
+        while self.__parent[planet] is not root:
+            self.__parent[planet], planet = root, self.__parent[planet]
+
+        return root
+
+    def __union(self, first: Planet, second: Planet) -> None:
+        '''Merges the components of two planets'''
+        first, second = self.__find(first), self.__find(second)
+        if first is second:
+            return
+
+        if self.__size[first] < self.__size[second]:
+            first, second = second, first
+
+        self.__parent[second] = first
+        self.__size[first] += self.__size[second]
+
+    def __rebuildComponents(self) -> None:
+        '''Recomputes all components after planets or routes were removed'''
+        self.__parent = {planet: planet for planet in self.__planets}
+        self.__size = {planet: 1 for planet in self.__planets}
+        self.__componentsValid = True
+
+        for planet, neighbours in self.__adjacency.items():
+            for neighbour in neighbours:
+                self.__union(planet, neighbour)
@@ -0,0 +1,145 @@
+'''Batch export of campaign maps to PNG or SVG files.
+
+Each campaign is drawn like the galactic plot of the editor: every planet faded
+in the background, the campaign planets, their trade routes and optionally the
+auto connections between them. matplotlib renders offscreen through Figure
+without pyplot, so neither Qt nor a display is needed.
+
+Campaigns are rendered in parallel on a process pool, one task per campaign.
+The coordinates of all planets are copied once into a shared memory block that
+the workers map read-only. A task only carries the indexes of its campaign's
+planets and trade routes into that block.
+'''
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from gameObjects.campaign import Campaign
+from gameObjects.planet import Planet
+from mapTools.spatialgrid import SpatialGrid
+
+formats = ("png", "svg")
+
+
+def isFileName(name: str) -> bool:
+    '''Returns true if a name can be used as a file name without leaving its folder'''
+    return bool(name) and name not in (".", "..") and "/" not in name and "\\" not in name and "\0" not in name
+
+
+class CampaignMap:
+    '''A campaign to draw: its planets as rows of the shared coordinates and
+    its trade routes as pairs of rows'''
+    def __init__(self, name: str, planetIndexes: np.ndarray, tradeRouteIndexes: np.ndarray, outputName: str):
+        self.name: str = name
+        self.planetIndexes: np.ndarray = planetIndexes
+        self.tradeRouteIndexes: np.ndarray = tradeRouteIndexes
+        self.outputName: str = outputName
+
+
+def renderCampaignMap(coordinates: np.ndarray, campaignMap: CampaignMap, autoConnectionDistance: float = 0, dpi: int = 100) -> str:
+    '''Draws a campaign over all planets and saves it, the format follows the file extension.
+    Returns the output name'''
+    from matplotlib.collections import LineCollection
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize = (8, 8))
+    axes = figure.add_subplot(111, aspect = "equal")
+    axes.set_title(campaignMap.name)
+
+    axes.scatter(coordinates[:, 0], coordinates[:, 1], c = "b", alpha = 0.1)
+
+    planets = coordinates[campaignMap.planetIndexes]
+    if autoConnectionDistance > 0 and len(planets) > 1:
+        first, second, _ = SpatialGrid(planets, autoConnectionDistance).pairsWithin(autoConnectionDistance)
+        axes.add_collection(LineCollection(np.stack((planets[first], planets[second]), axis = 1), colors = "k", alpha = 0.1))
+
+    if len(campaignMap.tradeRouteIndexes):
+        axes.add_collection(LineCollection(coordinates[campaignMap.tradeRouteIndexes], colors = "k", alpha = 0.4))
+
+    axes.scatter(planets[:, 0], planets[:, 1], c = "b")
+
+    figure.savefig(campaignMap.outputName, dpi = dpi)
+    return campaignMap.outputName
+
+
+#coordinates of the worker processes, mapped from the shared memory of the exporter
+_sharedMemory: shared_memory.SharedMemory = None
+_coordinates: np.ndarray = None
+
+def _attachCoordinates(name: str, shape: Tuple[int, int]) -> None:
+    '''Worker initializer mapping the shared coordinates'''
+    global _sharedMemory, _coordinates
+    _sharedMemory = shared_memory.SharedMemory(name = name)
+    _coordinates = np.ndarray(shape, dtype = float, buffer = _sharedMemory.buf)
+    _coordinates.flags.writeable = False
+
+def _renderShared(campaignMap: CampaignMap, autoConnectionDistance: float, dpi: int) -> str:
+    return renderCampaignMap(_coordinates, campaignMap, autoConnectionDistance, dpi)
+
+
+class CampaignMapExporter:
+    '''Renders maps of many campaigns in parallel'''
+    def __init__(self, planets: Iterable[Planet], autoConnectionDistance: float = 0, fileFormat: str = "png", dpi: int = 100, workers: int = None):
+        if fileFormat not in formats:
+            raise ValueError("Unknown map format " + fileFormat + ", expected one of " + ", ".join(formats))
+
+        planets = [p for p in planets if p is not None and p.x is not None and p.y is not None]
+        self.__rows: Dict[Planet, int] = {planet: row for row, planet in enumerate(planets)}
+        self.__coordinates: np.ndarray = np.array([(p.x, p.y) for p in planets], dtype = float).reshape(-1, 2)
+
+        self.__autoConnectionDistance: float = autoConnectionDistance
+        self.__fileFormat: str = fileFormat
+        self.__dpi: int = dpi
+        self.__workers: int = workers or os.cpu_count() or 1
+
+    def campaignMap(self, campaign: Campaign, folder: str) -> CampaignMap:
+        '''Returns the rows of a campaign's planets and trade routes and its output file in folder.
+        Planets without coordinates and routes to them are left out. Raises ValueError if the
+        campaign name is not a plain file name, so no map is written outside of folder'''
+        if not isFileName(campaign.name):
+            raise ValueError("Campaign name " + repr(campaign.name) + " is not a valid file name")
+
+        rows = self.__rows
+        planetIndexes = np.array(sorted(rows[p] for p in campaign.planets if p in rows), dtype = np.int64)
+        tradeRouteIndexes = np.array([(rows[t.start], rows[t.end]) for t in campaign.tradeRoutes
+            if t is not None and t.start in rows and t.end in rows], dtype = np.int64).reshape(-1, 2)
+
+        return CampaignMap(campaign.name, planetIndexes, tradeRouteIndexes, os.path.join(folder, campaign.name + "." + self.__fileFormat))
+
+    def export(self, campaigns: Iterable[Campaign], folder: str) -> List[str]:
+        '''Writes a map of every campaign to folder and returns the written files.
+        Campaign names are checked before anything is written. All campaigns are rendered
+        even if some of them fail, the first error is raised at the end'''
+        campaignMaps = [self.campaignMap(campaign, folder) for campaign in sorted(campaigns, key = lambda entry: entry.name)]
+        os.makedirs(folder, exist_ok = True)
+        workers = min(self.__workers, len(campaignMaps))
+
+        if workers <= 1:
+            return [renderCampaignMap(self.__coordinates, campaignMap, self.__autoConnectionDistance, self.__dpi) for campaignMap in campaignMaps]
+
+        memory = shared_memory.SharedMemory(create = True, size = max(self.__coordinates.nbytes, 1))
+        try:
+            np.ndarray(self.__coordinates.shape, dtype = float, buffer = memory.buf)[:] = self.__coordinates
+
+            with ProcessPoolExecutor(workers, initializer = _attachCoordinates, initargs = (memory.name, self.__coordinates.shape)) as executor:
+                futures = [executor.submit(_renderShared, campaignMap, self.__autoConnectionDistance, self.__dpi) for campaignMap in campaignMaps]
+
+            written = []
+            error = None
+            for future in futures:
+                try:
+                    written.append(future.result())
+                except Exception as e:
+                    error = error or e
+
+            if error is not None:
+                raise error
+
+            return written
+        finally:
+            memory.close()
+            memory.unlink()
@@ -0,0 +1,82 @@
+from typing import Dict, Iterable, List
+
+from gameObjects.campaign import Campaign
+from gameObjects.planet import Planet
+from gameObjects.traderoute import TradeRoute
+
+
+class ValidationIssue:
+    '''A problem found in a campaign. kind is one of the CampaignValidator issue kinds,
+    objects are the names of the planets and trade routes involved'''
+    def __init__(self, kind: str, campaign: str, message: str, objects: List[str] = None):
+        self.kind: str = kind
+        self.campaign: str = campaign
+        self.message: str = message
+        self.objects: List[str] = objects or []
+
+    def __str__(self) -> str:
+        return self.campaign + ": " + self.message
+
+    def __repr__(self) -> str:
+        return "ValidationIssue(" + repr(self.kind) + ", " + repr(self.campaign) + ", " + repr(self.message) + ")"
+
+
+class CampaignValidator:
+    '''Checks campaigns for problems that break them in game or on save.
+    Each campaign is checked in one pass over its planets and one over its trade routes,
+    using the campaign planet set and an index of connected planet pairs for lookups'''
+    unresolvedPlanet = "unresolved planet"
+    unresolvedTradeRoute = "unresolved trade route"
+    missingCoordinates = "missing coordinates"
+    missingEndpoint = "missing endpoint"
+    routeOutsideCampaign = "route outside campaign"
+    duplicateRoute = "duplicate route"
+
+    def validate(self, campaign: Campaign) -> List[ValidationIssue]:
+        '''Returns the problems found in a campaign'''
+        issues: List[ValidationIssue] = []
+        name = campaign.name
+
+        for planetName in sorted(campaign.unresolvedPlanets):
+            issues.append(ValidationIssue(self.unresolvedPlanet, name, "planet " + planetName + " in Locations does not exist", [planetName]))
+        for tradeRouteName in sorted(campaign.unresolvedTradeRoutes):
+            issues.append(ValidationIssue(self.unresolvedTradeRoute, name, "trade route " + tradeRouteName + " in Trade_Routes does not exist", [tradeRouteName]))
+
+        planets = campaign.planets
+        for planet in planets:
+            if planet is None:
+                if not campaign.unresolvedPlanets:
+                    issues.append(ValidationIssue(self.unresolvedPlanet, name, "references a planet that does not exist"))
+            elif planet.x is None or planet.y is None:
+                issues.append(ValidationIssue(self.missingCoordinates, name, "planet " + planet.name + " has no coordinates", [planet.name]))
+
+        connectedPairs: Dict[frozenset, TradeRoute] = dict()
+        for tradeRoute in campaign.tradeRoutes:
+            if tradeRoute is None:
+                if not campaign.unresolvedTradeRoutes:
+                    issues.append(ValidationIssue(self.unresolvedTradeRoute, name, "references a trade route that does not exist"))
+                continue
+
+            if tradeRoute.start is None or tradeRoute.end is None:
+                issues.append(ValidationIssue(self.missingEndpoint, name, "trade route " + tradeRoute.name + " has a planet that does not exist", [tradeRoute.name]))
+                continue
+
+            outside = [planet.name for planet in (tradeRoute.start, tradeRoute.end) if planet not in planets]
+            if outside:
+                issues.append(ValidationIssue(self.routeOutsideCampaign, name, "trade route " + tradeRoute.name + " connects " + " and ".join(outside) + " outside the campaign", [tradeRoute.name] + outside))
+
+            pair = frozenset((tradeRoute.start, tradeRoute.end))
+            other = connectedPairs.setdefault(pair, tradeRoute)
+            if other is not tradeRoute:
+                first, second = sorted((other.name, tradeRoute.name))
+                issues.append(ValidationIssue(self.duplicateRoute, name, "trade routes " + first + " and " + second + " connect the same planets", [first, second]))
+
+        return sorted(issues, key = lambda issue: (issue.kind, issue.message))
+
+    def validateAll(self, campaigns: Iterable[Campaign]) -> List[ValidationIssue]:
+        '''Returns the problems found in several campaigns, ordered by campaign'''
+        issues: List[ValidationIssue] = []
+        for campaign in sorted(campaigns, key = lambda entry: entry.name):
+            issues.extend(self.validate(campaign))
+
+        return issues
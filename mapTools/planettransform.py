@@ -0,0 +1,73 @@
+'''Bulk transforms of planet coordinates.
+
+A transform scales planets about a pivot, rotates them about the same pivot
+and then translates them. These steps are combined into one 3x3 affine matrix that is
+applied to the whole coordinate array at once. Snapping to a grid is applied
+last, as it is not affine.
+'''
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+
+def translation(dx: float, dy: float) -> np.ndarray:
+    '''Returns the affine matrix moving points by (dx, dy)'''
+    return np.array([[1, 0, dx], [0, 1, dy], [0, 0, 1]], dtype = float)
+
+
+def scaling(sx: float, sy: float, pivot: Tuple[float, float] = (0, 0)) -> np.ndarray:
+    '''Returns the affine matrix scaling points about a pivot'''
+    px, py = pivot
+    return np.array([[sx, 0, px - sx * px], [0, sy, py - sy * py], [0, 0, 1]], dtype = float)
+
+
+def rotation(degrees: float, pivot: Tuple[float, float] = (0, 0)) -> np.ndarray:
+    '''Returns the affine matrix rotating points counterclockwise about a pivot'''
+    angle = math.radians(degrees)
+    cos, sin = math.cos(angle), math.sin(angle)
+    px, py = pivot
+    return np.array([[cos, -sin, px - cos * px + sin * py], [sin, cos, py - sin * px - cos * py], [0, 0, 1]], dtype = float)
+
+
+def applyAffine(matrix: np.ndarray, coordinates: np.ndarray) -> np.ndarray:
+    '''Returns the points transformed by an affine matrix'''
+    coordinates = np.asarray(coordinates, dtype = float).reshape(-1, 2)
+    return coordinates @ matrix[:2, :2].T + matrix[:2, 2]
+
+
+def snapToGrid(coordinates: np.ndarray, spacing: float, origin: Tuple[float, float] = (0, 0)) -> np.ndarray:
+    '''Returns the points moved to the closest corner of a grid'''
+    coordinates = np.asarray(coordinates, dtype = float).reshape(-1, 2)
+    return np.round((coordinates - origin) / spacing) * spacing + origin
+
+
+class PlanetTransform:
+    '''Translation, scale, rotation and grid snapping applied to a set of planets.
+    Without a pivot planets are scaled and rotated about their centroid'''
+    def __init__(self, dx: float = 0, dy: float = 0, scale: float = 1, degrees: float = 0, pivot: Tuple[float, float] = None, gridSpacing: float = 0):
+        self.dx: float = dx
+        self.dy: float = dy
+        self.scale: float = scale
+        self.degrees: float = degrees
+        self.pivot: Tuple[float, float] = pivot
+        self.gridSpacing: float = gridSpacing
+
+    def matrix(self, pivot: Tuple[float, float]) -> np.ndarray:
+        '''Returns the affine part of the transform as one matrix'''
+        return translation(self.dx, self.dy) @ rotation(self.degrees, pivot) @ scaling(self.scale, self.scale, pivot)
+
+    def apply(self, coordinates: np.ndarray) -> np.ndarray:
+        '''Returns the transformed coordinates, an array of (x, y) rows'''
+        coordinates = np.asarray(coordinates, dtype = float).reshape(-1, 2)
+        if len(coordinates) == 0:
+            return coordinates
+
+        pivot = self.pivot if self.pivot is not None else tuple(coordinates.mean(axis = 0))
+        transformed = applyAffine(self.matrix(pivot), coordinates)
+
+        if self.gridSpacing > 0:
+            transformed = snapToGrid(transformed, self.gridSpacing)
+
+        return transformed
@@ -0,0 +1,47 @@
+'''Hit testing of planets against regions drawn on the galaxy map.
+
+Both tests run over the whole coordinate array at once. The polygon test is
+the even-odd ray casting rule, evaluated one edge at a time for all points
+inside the bounding box of the polygon.
+'''
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+def pointsInRectangle(coordinates: np.ndarray, corner: Tuple[float, float], oppositeCorner: Tuple[float, float]) -> np.ndarray:
+    '''Returns a boolean mask of the points inside the rectangle spanned by two corners, edges included'''
+    coordinates = np.asarray(coordinates, dtype = float).reshape(-1, 2)
+    low = np.minimum(corner, oppositeCorner)
+    high = np.maximum(corner, oppositeCorner)
+
+    return np.all((coordinates >= low) & (coordinates <= high), axis = 1)
+
+
+def pointsInPolygon(coordinates: np.ndarray, vertices: Sequence[Tuple[float, float]]) -> np.ndarray:
+    '''Returns a boolean mask of the points inside a polygon. The polygon is closed
+    from the last vertex back to the first and may intersect itself'''
+    coordinates = np.asarray(coordinates, dtype = float).reshape(-1, 2)
+    vertices = np.asarray(vertices, dtype = float).reshape(-1, 2)
+    inside = np.zeros(len(coordinates), dtype = bool)
+
+    if len(vertices) < 3:
+        return inside
+
+    candidates = np.nonzero(pointsInRectangle(coordinates, vertices.min(axis = 0), vertices.max(axis = 0)))[0]
+    x = coordinates[candidates, 0]
+    y = coordinates[candidates, 1]
+    crossings = np.zeros(len(candidates), dtype = bool)
+
+    for (x1, y1), (x2, y2) in zip(vertices, np.roll(vertices, -1, axis = 0)):
+        if y1 == y2:
+            continue
+
+        #edges count for points whose horizontal ray to the right crosses them
+        spans = (y1 > y) != (y2 > y)
+        crossingX = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+        crossings ^= spans & (x < crossingX)
+
+    inside[candidates] = crossings
+    return inside
@@ -0,0 +1,89 @@
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from gameObjects.planet import Planet
+from mapTools.spatialgrid import SpatialGrid
+
+
+class SpacingIssue:
+    '''Two planets closer to each other than the minimum spacing'''
+    def __init__(self, first: Planet, second: Planet, distance: float):
+        self.first: Planet = first
+        self.second: Planet = second
+        self.distance: float = distance
+
+    def __str__(self) -> str:
+        if self.distance == 0:
+            return self.first.name + " and " + self.second.name + " overlap"
+
+        return "{} and {} are {:.1f} apart".format(self.first.name, self.second.name, self.distance)
+
+    def __repr__(self) -> str:
+        return "SpacingIssue(" + repr(self.first.name) + ", " + repr(self.second.name) + ", " + repr(self.distance) + ")"
+
+
+class SpacingChecker:
+    '''Finds planets closer to each other than a minimum spacing with a spatial grid
+    of that spacing, so only planets in neighbouring cells are compared.
+    Variants share the position of the planet they are a variant of and are never in a
+    campaign together with it, so pairs within one variant family are skipped unless
+    includeVariantFamilies is set. Variants are still checked against all other planets'''
+    def __init__(self, minimumSpacing: float, includeVariantFamilies: bool = False):
+        if minimumSpacing <= 0:
+            raise ValueError("Minimum spacing must be positive")
+
+        self.__minimumSpacing: float = minimumSpacing
+        self.__includeVariantFamilies: bool = includeVariantFamilies
+
+    def check(self, planets: Iterable[Planet]) -> List[SpacingIssue]:
+        '''Returns the pairs of planets closer than the minimum spacing, closest first.
+        Planets without coordinates are left out'''
+        allPlanets = [p for p in planets if p is not None]
+        planets = sorted((p for p in allPlanets if p.x is not None and p.y is not None), key = lambda entry: entry.name)
+        if len(planets) < 2:
+            return []
+
+        coordinates = np.array([(p.x, p.y) for p in planets], dtype = float)
+        first, second, distances = SpatialGrid(coordinates, self.__minimumSpacing).pairsWithin(self.__minimumSpacing)
+
+        families = None if self.__includeVariantFamilies else self.__variantFamilies(allPlanets)
+        issues = []
+
+        for a, b, distance in zip(first.tolist(), second.tolist(), distances.tolist()):
+            if families is not None and families[planets[a]] == families[planets[b]]:
+                continue
+
+            issues.append(SpacingIssue(planets[a], planets[b], distance))
+
+        return sorted(issues, key = lambda issue: (issue.distance, issue.first.name, issue.second.name))
+
+    def __variantFamilies(self, planets: List[Planet]) -> Dict[Planet, str]:
+        '''Returns the name of the planet at the root of the variant chain of every planet'''
+        byName: Dict[str, Planet] = {p.name: p for p in planets}
+        families: Dict[Planet, str] = dict()
+
+        for planet in planets:
+            family = planet.name
+            name = planet.variantOf
+            visited = {planet.name}
+
+            #a parent missing from the planets still names the family
+            while name and name not in visited:
+                visited.add(name)
+                family = name
+                parent = byName.get(name)
+                name = parent.variantOf if parent is not None else ""
+
+            families[planet] = family
+
+        return families
+
+
+def spacingOffenders(issues: Iterable[SpacingIssue]) -> List[Planet]:
+    '''Returns the planets involved in any of the issues, sorted by name'''
+    offenders = set()
+    for issue in issues:
+        offenders.update((issue.first, issue.second))
+
+    return sorted(offenders, key = lambda entry: entry.name)
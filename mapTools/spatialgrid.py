@@ -0,0 +1,70 @@
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+class SpatialGrid:
+    '''Uniform grid over 2D points for finding all pairs of points closer than the cell size.
+    Only neighbouring cells are compared, so the cost grows with the number of close pairs
+    rather than with the square of the number of points'''
+    def __init__(self, coordinates: np.ndarray, cellSize: float):
+        if cellSize <= 0:
+            raise ValueError("Cell size must be positive")
+
+        self.__coordinates: np.ndarray = np.asarray(coordinates, dtype = float).reshape(-1, 2)
+        self.__cellSize: float = float(cellSize)
+        self.__cells: Dict[Tuple[int, int], np.ndarray] = self.__buildCells()
+
+    def pairsWithin(self, distance: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        '''Returns index arrays first, second with first < second and the distances
+        of all point pairs closer than distance. distance may not exceed the cell size'''
+        if distance > self.__cellSize:
+            raise ValueError("Distance is larger than the grid cell size")
+
+        firstIndices = []
+        secondIndices = []
+
+        for (cellX, cellY), indices in self.__cells.items():
+            points = self.__coordinates[indices]
+
+            #each pair of neighbouring cells is visited once
+            for offsetX, offsetY in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+                others = self.__cells.get((cellX + offsetX, cellY + offsetY))
+                if others is None:
+                    continue
+
+                differences = points[:, np.newaxis, :] - self.__coordinates[others][np.newaxis, :, :]
+                close = np.einsum("ijk,ijk->ij", differences, differences) < distance * distance
+
+                if offsetX == 0 and offsetY == 0:
+                    close = np.triu(close, 1)
+
+                first, second = np.nonzero(close)
+                firstIndices.append(indices[first])
+                secondIndices.append(others[second])
+
+        if not firstIndices:
+            empty = np.zeros(0, dtype = np.int64)
+            return empty, empty, np.zeros(0)
+
+        first = np.concatenate(firstIndices)
+        second = np.concatenate(secondIndices)
+        first, second = np.minimum(first, second), np.maximum(first, second)
+        distances = np.linalg.norm(self.__coordinates[first] - self.__coordinates[second], axis = 1)
+
+        return first, second, distances
+
+    def __buildCells(self) -> Dict[Tuple[int, int], np.ndarray]:
+        '''Groups point indices by grid cell'''
+        if len(self.__coordinates) == 0:
+            return dict()
+
+        cells = np.floor(self.__coordinates / self.__cellSize).astype(np.int64)
+        order = np.lexsort((cells[:, 1], cells[:, 0]))
+        sortedCells = cells[order]
+
+        boundaries = np.nonzero(np.any(sortedCells[1:] != sortedCells[:-1], axis = 1))[0] + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(order)]))
+
+        return {(int(sortedCells[start, 0]), int(sortedCells[start, 1])): order[start:end] for start, end in zip(starts, ends)}
@@ -0,0 +1,101 @@
+from typing import Dict, Iterable, List, Set
+
+import numpy as np
+
+from gameObjects.gameObjectRepository import GameObjectRepository
+from gameObjects.planet import Planet
+from gameObjects.traderoute import TradeRoute
+from mapTools.spatialgrid import SpatialGrid
+
+
+class TradeRouteGenerator:
+    '''Generates trade routes between planets closer than a maximum distance.
+    Modes:
+        distance: every pair of planets within the distance
+        knn: pairs where one planet is among the k nearest neighbours of the other
+        gabriel: pairs with no other planet inside the circle through both planets
+        rng: pairs with no other planet closer to both of them than they are to each other
+    gabriel and rng are subgraphs of the Delaunay triangulation without crossing routes'''
+    modes = ["distance", "knn", "gabriel", "rng"]
+
+    def __init__(self, repository: GameObjectRepository):
+        self.__repository: GameObjectRepository = repository
+
+    def generate(self, planets: Iterable[Planet], maximumDistance: float, mode: str = "rng", neighbours: int = 3) -> List[TradeRoute]:
+        '''Returns new trade routes named start_end between the given planets,
+        skipping planet pairs already connected by a trade route in either direction'''
+        if mode not in self.modes:
+            raise ValueError("Unknown trade route generation mode " + mode)
+
+        planets = sorted((p for p in planets if p is not None and p.x is not None and p.y is not None), key = lambda entry: entry.name)
+        if len(planets) < 2 or maximumDistance <= 0:
+            return []
+
+        coordinates = np.array([(p.x, p.y) for p in planets], dtype = float)
+        first, second, distances = SpatialGrid(coordinates, maximumDistance).pairsWithin(maximumDistance)
+
+        if mode == "knn":
+            keep = self.__nearestNeighbours(first, second, distances, len(planets), neighbours)
+        elif mode == "gabriel":
+            keep = self.__emptyRegion(first, second, distances, lambda ab, ar, br: ar * ar + br * br < ab * ab)
+        elif mode == "rng":
+            keep = self.__emptyRegion(first, second, distances, lambda ab, ar, br: max(ar, br) < ab)
+        else:
+            keep = np.ones(len(first), dtype = bool)
+
+        existing = self.__connectedPairs()
+        tradeRoutes = []
+
+        for a, b in zip(first[keep], second[keep]):
+            start, end = planets[a], planets[b]
+            if frozenset((start, end)) in existing:
+                continue
+
+            tradeRoute = TradeRoute(start.name + "_" + end.name)
+            tradeRoute.start = start
+            tradeRoute.end = end
+            tradeRoutes.append(tradeRoute)
+
+        return sorted(tradeRoutes, key = lambda entry: entry.name)
+
+    def __connectedPairs(self) -> Set[frozenset]:
+        '''Returns the planet pairs connected by existing trade routes'''
+        return {frozenset((t.start, t.end)) for t in self.__repository.tradeRoutes}
+
+    def __nearestNeighbours(self, first: np.ndarray, second: np.ndarray, distances: np.ndarray, count: int, neighbours: int) -> np.ndarray:
+        '''Keeps pairs in which either planet is one of the k nearest neighbours of the other'''
+        nodes = np.concatenate((first, second))
+        edgeDistances = np.concatenate((distances, distances))
+        edges = np.concatenate((np.arange(len(first)), np.arange(len(first))))
+
+        order = np.lexsort((edgeDistances, nodes))
+        sortedNodes = nodes[order]
+        groupStarts = np.searchsorted(sortedNodes, np.arange(count))
+        ranks = np.arange(len(order)) - groupStarts[sortedNodes]
+
+        keep = np.zeros(len(first), dtype = bool)
+        keep[edges[order][ranks < neighbours]] = True
+        return keep
+
+    def __emptyRegion(self, first: np.ndarray, second: np.ndarray, distances: np.ndarray, blocks) -> np.ndarray:
+        '''Keeps pairs for which no third planet r satisfies blocks(d(a, b), d(a, r), d(b, r)).
+        Any blocking planet is closer to both planets than the maximum distance,
+        so only candidate pairs need to be searched'''
+        adjacency: Dict[int, Dict[int, float]] = dict()
+        for a, b, distance in zip(first.tolist(), second.tolist(), distances.tolist()):
+            adjacency.setdefault(a, dict())[b] = distance
+            adjacency.setdefault(b, dict())[a] = distance
+
+        keep = np.ones(len(first), dtype = bool)
+        for index, (a, b, distance) in enumerate(zip(first.tolist(), second.tolist(), distances.tolist())):
+            aNeighbours, bNeighbours = adjacency[a], adjacency[b]
+            if len(aNeighbours) > len(bNeighbours):
+                aNeighbours, bNeighbours = bNeighbours, aNeighbours
+
+            for r, ar in aNeighbours.items():
+                br = bNeighbours.get(r)
+                if br is not None and blocks(distance, ar, br):
+                    keep[index] = False
+                    break
+
+        return keep
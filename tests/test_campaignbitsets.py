@@ -0,0 +1,58 @@
+from gameObjects.campaign import Campaign
+from gameObjects.planet import Planet
+from mapTools.campaignbitsets import Bitset, CampaignMembership, DenseIds
+
+
+def test_wordBoundaries():
+    ids = [0, 63, 64, 127, 128]
+    bitset = Bitset.fromIds(ids)
+
+    assert len(bitset.words) == 3
+    assert bitset.ids().tolist() == ids
+    assert [objectId in bitset for objectId in (0, 1, 63, 64, 65, 128, 129, 1000)] == [True, False, True, True, False, True, False, False]
+    assert Bitset.fromIds([], 65).words.tolist() == [0, 0]
+
+
+def test_operationsOnDifferentLengths():
+    first = Bitset.fromIds([0, 63, 64, 130])
+    second = Bitset.fromIds([1, 64, 200])
+
+    assert (first | second).ids().tolist() == [0, 1, 63, 64, 130, 200]
+    assert (first & second).ids().tolist() == [64]
+    assert (first - second).ids().tolist() == [0, 63, 130]
+    assert (second - first).ids().tolist() == [1, 200]
+    assert len(first) == 4
+
+
+def test_emptyAndEquality():
+    assert not Bitset()
+    assert Bitset() == Bitset.fromIds([], 128)
+    assert Bitset.fromIds([3], 500) == Bitset.fromIds([3])
+    assert Bitset.fromIds([3]) != Bitset.fromIds([4])
+
+
+def test_denseIds():
+    ids = DenseIds(["a", "b", "a"])
+    assert len(ids) == 2
+    assert ids.get("b") == 1 and ids.get("c") is None
+    assert ids.add("c") == 2
+    assert ids.objectAt(2) == "c"
+
+
+def test_membership():
+    a, b, c, d = (Planet(name) for name in "ABCD")
+    first, second, third = Campaign("First"), Campaign("Second"), Campaign("Third")
+    first.planets = {a, b, None}
+    second.planets = {b, c}
+    third.planets = {b, c, d}
+    membership = CampaignMembership([first, second, third])
+
+    assert membership.planets(membership.planetsOf(first)) == {a, b}
+    assert membership.planets(membership.sharedPlanets([first, second, third])) == {b}
+    assert membership.planets(membership.anyPlanets([first, second])) == {a, b, c}
+    assert membership.planets(membership.planetsOf(third) - membership.planetsOf(second)) == {d}
+    assert not membership.anyPlanets([])
+
+    first.planets = {d}
+    membership.refresh(first)
+    assert membership.planets(membership.sharedPlanets([first, third])) == {d}
@@ -0,0 +1,100 @@
+import math
+
+import pytest
+
+from gameObjects.planet import Planet
+from gameObjects.traderoute import TradeRoute
+from mapTools.campaigngraph import CampaignGraph
+
+
+def makePlanets(**positions) -> dict:
+    planets = dict()
+    for name, (x, y) in positions.items():
+        planet = Planet(name)
+        planet.x, planet.y = x, y
+        planets[name] = planet
+
+    return planets
+
+
+def makeRoutes(planets: dict, *pairs) -> list:
+    tradeRoutes = []
+    for start, end in pairs:
+        tradeRoute = TradeRoute(start + "_" + end)
+        tradeRoute.start, tradeRoute.end = planets[start], planets[end]
+        tradeRoutes.append(tradeRoute)
+
+    return tradeRoutes
+
+
+@pytest.fixture
+def galaxy():
+    '''A to D along three short jumps or two long ones, F and G on their own and H isolated'''
+    planets = makePlanets(A = (0, 0), B = (1, 1), C = (2, 1), D = (3, 0), E = (1.5, 10), F = (50, 50), G = (51, 50), H = (60, 60))
+    tradeRoutes = makeRoutes(planets, ("A", "B"), ("B", "C"), ("C", "D"), ("A", "E"), ("E", "D"), ("F", "G"))
+    return planets, tradeRoutes
+
+
+def names(planets) -> list:
+    return [p.name for p in planets]
+
+
+def test_paths(galaxy):
+    planets, tradeRoutes = galaxy
+    graph = CampaignGraph(planets.values(), tradeRoutes)
+
+    length, path = graph.shortestPath(planets["A"], planets["D"])
+    assert names(path) == ["A", "B", "C", "D"]
+    assert length == pytest.approx(1 + 2 * math.sqrt(2))
+    assert names(graph.fewestJumps(planets["A"], planets["D"])) == ["A", "E", "D"]
+
+
+def test_disconnectedCampaign(galaxy):
+    planets, tradeRoutes = galaxy
+    graph = CampaignGraph(planets.values(), tradeRoutes)
+
+    assert not graph.isConnected()
+    assert [sorted(names(c)) for c in graph.components()] == [["A", "B", "C", "D", "E"], ["F", "G"], ["H"]]
+    assert names(graph.isolatedPlanets()) == ["H"]
+    assert graph.shortestPath(planets["A"], planets["F"]) is None
+    assert graph.fewestJumps(planets["A"], planets["H"]) is None
+
+
+def test_removedPlanetKeepsRoutes(galaxy):
+    planets, tradeRoutes = galaxy
+    graph = CampaignGraph(planets.values(), tradeRoutes)
+
+    graph.removePlanet(planets["B"])
+    assert names(graph.shortestPath(planets["A"], planets["D"])[1]) == ["A", "E", "D"]
+
+    graph.removePlanet(planets["E"])
+    assert not graph.sameComponent(planets["A"], planets["D"])
+
+    graph.addPlanet(planets["B"])
+    assert names(graph.fewestJumps(planets["A"], planets["D"])) == ["A", "B", "C", "D"]
+
+
+def test_routesOutsideGraph(galaxy):
+    planets, tradeRoutes = galaxy
+    graph = CampaignGraph([planets["A"], planets["B"], planets["F"]], tradeRoutes + makeRoutes(planets, ("A", "F")))
+
+    #B to C and the others have planets outside the graph and do not count
+    assert sorted(names(graph.neighbours(planets["A"]))) == ["B", "F"]
+    assert names(graph.neighbours(planets["B"])) == ["A"]
+    assert graph.isConnected()
+
+    graph.update([planets["A"], planets["B"], planets["F"]], tradeRoutes)
+    assert names(graph.neighbours(planets["A"])) == ["B"]
+    assert names(graph.isolatedPlanets()) == ["F"]
+
+
+def test_parallelRoutes(galaxy):
+    planets, _ = galaxy
+    first, second = makeRoutes(planets, ("A", "B"), ("B", "A"))
+    graph = CampaignGraph([planets["A"], planets["B"]], [first, second])
+
+    graph.removeTradeRoute(first)
+    assert graph.sameComponent(planets["A"], planets["B"])
+
+    graph.removeTradeRoute(second)
+    assert not graph.sameComponent(planets["A"], planets["B"])
@@ -0,0 +1,70 @@
+from gameObjects.campaign import Campaign
+from gameObjects.campaignindex import CampaignIndex
+from gameObjects.gameObjectRepository import GameObjectRepository
+from gameObjects.planet import Planet
+from gameObjects.traderoute import TradeRoute
+
+
+def makeCampaign(name: str, planets = (), tradeRoutes = ()) -> Campaign:
+    campaign = Campaign(name)
+    campaign.planets = set(planets)
+    campaign.tradeRoutes = set(tradeRoutes)
+    return campaign
+
+
+def test_sharedPlanet():
+    a, b = Planet("A"), Planet("B")
+    route = TradeRoute("A_B")
+    first = makeCampaign("First", [a, b, None], [route])
+    second = makeCampaign("Second", [a])
+    index = CampaignIndex([first, second])
+
+    assert index.campaignsWithPlanet(a) == {first, second}
+    assert index.campaignsWithPlanet(b) == {first}
+    assert index.campaignsWithTradeRoute(route) == {first}
+    assert index.campaignsWithPlanet(None) == set()
+
+
+def test_updateAndRemove():
+    a, b = Planet("A"), Planet("B")
+    first = makeCampaign("First", [a])
+    second = makeCampaign("Second", [a])
+    index = CampaignIndex([first, second])
+
+    first.planets = {b}
+    index.update(first)
+    assert index.campaignsWithPlanet(a) == {second}
+    assert index.campaignsWithPlanet(b) == {first}
+
+    index.remove(second)
+    assert index.campaignsWithPlanet(a) == set()
+
+    #results are copies
+    index.campaignsWithPlanet(b).clear()
+    assert index.campaignsWithPlanet(b) == {first}
+
+    index.clear()
+    assert index.campaignsWithPlanet(b) == set()
+
+
+def test_repositoryKeepsIndexUpToDate():
+    a, b = Planet("A"), Planet("B")
+    first = makeCampaign("First", [a])
+    second = makeCampaign("Second", [a, b])
+    repository = GameObjectRepository()
+    repository.addCampaign(first)
+    repository.addCampaign(second)
+    assert repository.campaignIndex.campaignsWithPlanet(a) == {first, second}
+
+    first.planets.add(b)
+    repository.updateCampaign(first)
+    repository.removeCampaign(second)
+    assert repository.campaignIndex.campaignsWithPlanet(b) == {first}
+
+    other = GameObjectRepository()
+    other.addCampaign(second)
+    repository.replaceContents(other)
+    assert repository.campaignIndex.campaignsWithPlanet(b) == {second}
+
+    repository.emptyRepository()
+    assert repository.campaignIndex.campaignsWithPlanet(b) == set()
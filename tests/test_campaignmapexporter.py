@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+from gameObjects.campaign import Campaign
+from gameObjects.planet import Planet
+from mapTools.campaignmapexporter import CampaignMapExporter
+
+
+@pytest.mark.parametrize("name", ["../Outside", "Sub/Campaign", "Sub\\Campaign", "..", "."])
+def test_rejectsPathNames(tmp_path, name):
+    exporter = CampaignMapExporter([Planet("A")])
+    with pytest.raises(ValueError):
+        exporter.campaignMap(Campaign(name), str(tmp_path))
+
+    folder = tmp_path / "maps"
+    with pytest.raises(ValueError):
+        exporter.export([Campaign("Fine"), Campaign(name)], str(folder))
+    assert not folder.exists()
+
+
+def test_campaignMap(tmp_path):
+    planets = [Planet("A"), Planet("B")]
+    planets[1].x = None
+    campaign = Campaign("Campaign..Name")
+    campaign.planets = set(planets)
+
+    campaignMap = CampaignMapExporter(planets, fileFormat = "svg").campaignMap(campaign, str(tmp_path))
+    assert campaignMap.outputName == os.path.join(str(tmp_path), "Campaign..Name.svg")
+    assert campaignMap.planetIndexes.tolist() == [0]
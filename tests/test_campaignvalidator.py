@@ -0,0 +1,78 @@
+from collections import Counter
+
+from gameObjects.campaign import Campaign
+from gameObjects.planet import Planet
+from gameObjects.traderoute import TradeRoute
+from mapTools.campaignvalidator import CampaignValidator
+
+
+def makeRoute(name: str, start: Planet, end: Planet) -> TradeRoute:
+    tradeRoute = TradeRoute(name)
+    tradeRoute.start, tradeRoute.end = start, end
+    return tradeRoute
+
+
+def kinds(issues) -> Counter:
+    return Counter(issue.kind for issue in issues)
+
+
+def test_validCampaign():
+    first, second = Planet("A"), Planet("B")
+    campaign = Campaign("Valid")
+    campaign.planets = {first, second}
+    campaign.tradeRoutes = {makeRoute("A_B", first, second)}
+
+    assert CampaignValidator().validate(campaign) == []
+
+
+def test_issueKinds():
+    first, second, third, outside = Planet("A"), Planet("B"), Planet("C"), Planet("Outside")
+    third.x = None
+
+    campaign = Campaign("Broken")
+    campaign.planets = {first, second, third, None}
+    campaign.tradeRoutes = {makeRoute("A_B", first, second), makeRoute("B_A", second, first),
+        makeRoute("A_Outside", first, outside), TradeRoute("Dangling"), None}
+    campaign.unresolvedPlanets = {"Missing"}
+    campaign.unresolvedTradeRoutes = {"MissingRoute"}
+
+    issues = CampaignValidator().validate(campaign)
+    assert kinds(issues) == {CampaignValidator.unresolvedPlanet: 1, CampaignValidator.unresolvedTradeRoute: 1,
+        CampaignValidator.missingCoordinates: 1, CampaignValidator.missingEndpoint: 1,
+        CampaignValidator.routeOutsideCampaign: 1, CampaignValidator.duplicateRoute: 1}
+
+    byKind = {issue.kind: issue for issue in issues}
+    assert byKind[CampaignValidator.unresolvedPlanet].objects == ["Missing"]
+    assert byKind[CampaignValidator.missingCoordinates].objects == ["C"]
+    assert byKind[CampaignValidator.routeOutsideCampaign].objects == ["A_Outside", "Outside"]
+    assert byKind[CampaignValidator.duplicateRoute].objects == ["A_B", "B_A"]
+    assert all(issue.campaign == "Broken" for issue in issues)
+    assert issues == sorted(issues, key = lambda issue: (issue.kind, issue.message))
+
+
+def test_threeRoutesBetweenTwoPlanets():
+    first, second = Planet("A"), Planet("B")
+    campaign = Campaign("Triple")
+    campaign.planets = {first, second}
+    campaign.tradeRoutes = {makeRoute(name, first, second) for name in ("R1", "R2", "R3")}
+
+    issues = CampaignValidator().validate(campaign)
+    assert kinds(issues) == {CampaignValidator.duplicateRoute: 2}
+
+
+def test_unresolvedWithoutNames():
+    campaign = Campaign("Unnamed")
+    campaign.planets = {None}
+    campaign.tradeRoutes = {None}
+
+    assert kinds(CampaignValidator().validate(campaign)) == {CampaignValidator.unresolvedPlanet: 1, CampaignValidator.unresolvedTradeRoute: 1}
+
+
+def test_validateAllOrdersByCampaign():
+    campaigns = []
+    for name in ("B", "A"):
+        campaign = Campaign(name)
+        campaign.unresolvedPlanets = {"Missing"}
+        campaigns.append(campaign)
+
+    assert [issue.campaign for issue in CampaignValidator().validateAll(campaigns)] == ["A", "B"]
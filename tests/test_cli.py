@@ -0,0 +1,101 @@
+import pytest
+
+from cli import BatchEditor, main
+from RepositoryCreator import RepositoryCreator
+
+FILES = {
+    "GameObjectFiles.XML": "<Meta><File>Planets.xml</File></Meta>",
+    "Planets.xml": """<?xml version="1.0"?>
+<Planets>
+\t<Planet Name="Coruscant">
+\t\t<Galactic_Position>1.0, 2.0, 0.0</Galactic_Position>
+\t</Planet>
+\t<Planet Name="Kuat">
+\t\t<Galactic_Position>5.0, 6.0, 0.0</Galactic_Position>
+\t</Planet>
+</Planets>
+""",
+    "TradeRouteFiles.XML": "<Meta><File>TradeRoutes.xml</File></Meta>",
+    "TradeRoutes.xml": "<TradeRoutes><TradeRoute Name=\"Coruscant_Kuat\"><Point_A>Coruscant</Point_A><Point_B>Kuat</Point_B></TradeRoute></TradeRoutes>",
+    "FactionFiles.XML": "<Meta><File>Factions.xml</File></Meta>",
+    "Factions.xml": "<Factions><Faction Name=\"Empire\"/></Factions>",
+    "CampaignFiles.XML": "<Meta><File>Campaigns.xml</File></Meta>",
+    "Campaigns.xml": "<Campaigns><Campaign Name=\"Core\"><Campaign_Set>Core</Campaign_Set><Locations>Coruscant, Kuat</Locations><Trade_Routes>Coruscant_Kuat</Trade_Routes></Campaign>"
+        "<Campaign Name=\"Rim\"><Campaign_Set>Rim</Campaign_Set><Locations>Kuat</Locations><Trade_Routes></Trade_Routes></Campaign></Campaigns>",
+}
+
+
+@pytest.fixture
+def dataFolder(tmp_path):
+    '''A mod Data folder with two planets and two campaigns in one file'''
+    xmlFolder = tmp_path / "Data" / "XML"
+    xmlFolder.mkdir(parents = True)
+    for file, content in FILES.items():
+        (xmlFolder / file).write_text(content)
+
+    return tmp_path / "Data"
+
+
+def load(folder, patch: bool = True) -> BatchEditor:
+    return BatchEditor(str(folder), RepositoryCreator().constructRepository(str(folder)), patch)
+
+
+@pytest.mark.parametrize("patch", [True, False])
+def test_movePlanetsIgnoresCase(dataFolder, tmp_path, patch):
+    csvFile = tmp_path / "moves.csv"
+    csvFile.write_text("coruscant, 10.5, 20.5\n")
+
+    editor = load(dataFolder, patch)
+    editor.movePlanets(str(csvFile))
+    editor.write()
+
+    planets = (dataFolder / "XML" / "Planets.xml").read_text()
+    assert "10.5, 20.5, 0.0" in planets
+    assert "5.0, 6.0, 0.0" in planets
+
+    planet = RepositoryCreator().constructRepository(str(dataFolder)).getPlanetByName("Coruscant")
+    assert (planet.x, planet.y) == (10.5, 20.5)
+
+
+def test_exportReplacesSourceFile(dataFolder):
+    xmlFolder = dataFolder / "XML"
+    (xmlFolder / "Campaigns.xml").write_text(FILES["Campaigns.xml"].replace("<Locations>Kuat<", "<Locations>Kuat, Ilum<"))
+
+    editor = load(dataFolder)
+    assert editor.exportCampaigns(str(xmlFolder), ["Core"])
+    editor.write()
+
+    #the campaign sharing the replaced file is exported with it, so each is defined once
+    metaFile = (xmlFolder / "CampaignFiles.XML").read_text()
+    assert "Campaigns.xml" not in metaFile
+    assert "Core.xml" in metaFile and "Rim.xml" in metaFile
+
+    repository = RepositoryCreator().constructRepository(str(dataFolder))
+    assert sorted(campaign.name for campaign in repository.campaigns) == ["Core", "Rim"]
+    assert repository.getCampaignFile("core") == "Core.xml"
+    #entries without a planet are kept
+    rim = next(campaign for campaign in repository.campaigns if campaign.name == "Rim")
+    assert rim.unresolvedPlanets == {"Ilum"}
+
+
+def test_exportRejectsInvalidNames(dataFolder, tmp_path):
+    campaigns = FILES["Campaigns.xml"].replace("\"Rim\"", "\"../Rim\"")
+    (dataFolder / "XML" / "Campaigns.xml").write_text(campaigns)
+    outputFolder = tmp_path / "Export"
+    outputFolder.mkdir()
+
+    editor = load(dataFolder)
+    assert not editor.exportCampaigns(str(outputFolder), ["Core"])
+    editor.write()
+
+    assert list(outputFolder.iterdir()) == []
+    assert not (tmp_path / "Rim.xml").exists()
+
+
+@pytest.mark.parametrize("spacing, exitCode", [("10", 1), ("1", 0), ("0", 2), ("-1", 2)])
+def test_checkSpacing(dataFolder, monkeypatch, capsys, spacing, exitCode):
+    monkeypatch.setattr("sys.argv", ["cli.py", str(dataFolder), "--check-spacing=" + spacing])
+
+    assert main() == exitCode
+    if exitCode == 2:
+        assert capsys.readouterr().out.startswith("Error! ")
@@ -0,0 +1,20 @@
+from xmlUtil.dataoverlay import ParsedFileCache
+
+
+def test_fileCacheKeepsRecentlyUsed(tmp_path):
+    paths = []
+    for name in ("A", "B", "C"):
+        path = tmp_path / (name + ".xml")
+        path.write_text("<" + name + "/>")
+        paths.append(str(path))
+
+    cache = ParsedFileCache(maximumFiles = 2)
+    first = cache.parse(paths[0])
+    second = cache.parse(paths[1])
+    assert cache.parse(paths[0]) is first
+
+    #B is the least recently used file and is dropped for C
+    cache.parse(paths[2])
+    assert len(cache) == 2
+    assert cache.parse(paths[0]) is first
+    assert cache.parse(paths[1]) is not second
@@ -0,0 +1,76 @@
+import struct
+
+import pytest
+
+from xmlUtil.megarchive import MegArchive, MegFormatError, archivePath, parseDataFile, readDataFile
+
+FILES = [("DATA/XML/PLANETS.XML", b"<Planets><Planet Name=\"A\"/></Planets>"), ("Data\\XML\\Empty.xml", b"<Empty/>")]
+
+
+def buildArchive(version: int, files = FILES) -> bytes:
+    '''Returns a MEG archive of the given format holding files, a list of (name, contents)'''
+    nameTable = b"".join(struct.pack("<H", len(name)) + name.encode("ascii") for name, _ in files)
+    headerSize = {1: 8, 2: 20, 3: 24}[version]
+    dataStart = headerSize + len(nameTable) + 20 * len(files)
+
+    records = b""
+    start = dataStart
+    for index, (_, contents) in enumerate(files):
+        if version == 3:
+            records += struct.pack("<HIIIIH", 0, 0, index, len(contents), start, index)
+        else:
+            records += struct.pack("<IIIII", 0, index, len(contents), start, index)
+        start += len(contents)
+
+    if version == 1:
+        header = struct.pack("<II", len(files), len(files))
+    elif version == 2:
+        header = struct.pack("<IIIII", 0xFFFFFFFF, 0x3F7D70A4, dataStart, len(files), len(files))
+    else:
+        header = struct.pack("<IIIIII", 0xFFFFFFFF, 0x3F7D70A4, dataStart, len(files), len(files), len(nameTable))
+
+    return header + nameTable + records + b"".join(contents for _, contents in files)
+
+
+@pytest.mark.parametrize("version", [1, 2, 3])
+def test_roundTrip(tmp_path, version):
+    path = tmp_path / "Config.meg"
+    path.write_bytes(buildArchive(version))
+
+    with MegArchive(str(path)) as archive:
+        assert sorted(archive.names) == sorted(name.replace("\\", "/") for name, _ in FILES)
+        for name, contents in FILES:
+            assert name in archive
+            assert bytes(archive.read(name)) == contents
+
+        assert archive.find("data/xml/planets.xml") == "DATA/XML/PLANETS.XML"
+        assert archive.parse("Data/XML/Planets.xml").getroot()[0].get("Name") == "A"
+
+
+@pytest.mark.parametrize("version", [1, 2, 3])
+def test_dataFilePaths(tmp_path, version):
+    path = tmp_path / "Config{}.meg".format(version)
+    path.write_bytes(buildArchive(version))
+
+    filePath = archivePath(str(path), "Data/XML/Empty.xml")
+    assert readDataFile(filePath) == b"<Empty/>"
+    assert parseDataFile(filePath).getroot().tag == "Empty"
+
+
+def test_encryptedArchiveIsRejected(tmp_path):
+    path = tmp_path / "Encrypted.meg"
+    path.write_bytes(struct.pack("<IIIIII", 0x8FFFFFFF, 0x3F7D70A4, 24, 0, 0, 0))
+
+    with pytest.raises(MegFormatError):
+        MegArchive(str(path))
+
+
+def test_recordOutsideArchiveIsRejected(tmp_path):
+    data = bytearray(buildArchive(1))
+    #size of the first record
+    struct.pack_into("<I", data, 8 + sum(2 + len(name) for name, _ in FILES) + 8, 1 << 20)
+    path = tmp_path / "Broken.meg"
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(MegFormatError):
+        MegArchive(str(path))
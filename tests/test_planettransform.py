@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from commands.MovePlanetsCommand import MovePlanetsCommand
+from gameObjects.planet import Planet
+from mapTools.planettransform import PlanetTransform, applyAffine, rotation, scaling, snapToGrid, translation
+
+
+def test_scaleAboutCentroid():
+    assert PlanetTransform(dx = 1, scale = 2).apply([(0, 0), (2, 0)]).tolist() == [[0.0, 0.0], [4.0, 0.0]]
+
+
+def test_rotateAboutPivot():
+    assert PlanetTransform(degrees = 90, pivot = (1, 1)).apply([(2, 1)]) == pytest.approx(np.array([[1.0, 2.0]]))
+
+
+def test_order():
+    #scaled to (2, 0), rotated to (0, 2), then moved to (1, 2)
+    transformed = PlanetTransform(dx = 1, scale = 2, degrees = 90, pivot = (0, 0)).apply([(1, 0)])
+    assert transformed == pytest.approx(np.array([[1.0, 2.0]]))
+
+
+def test_gridSnapping():
+    transformed = PlanetTransform(dx = 1, gridSpacing = 2).apply([(0.4, 1.6), (-2.6, 3.1)])
+
+    assert transformed.tolist() == [[2.0, 2.0], [-2.0, 4.0]]
+    assert snapToGrid(np.array([(1.2, 1.2)]), 1, origin = (0.5, 0.5)).tolist() == [[1.5, 1.5]]
+
+
+def test_noPlanets():
+    assert PlanetTransform(dx = 3).apply(np.zeros((0, 2))).shape == (0, 2)
+
+
+def test_matrices():
+    points = np.array([(1, 1), (2, 1)], dtype = float)
+
+    assert applyAffine(translation(1, 2), points).tolist() == [[2.0, 3.0], [3.0, 3.0]]
+    assert applyAffine(scaling(2, 3, (1, 1)), points).tolist() == [[1.0, 1.0], [3.0, 1.0]]
+    assert applyAffine(rotation(180, (1, 1)), points) == pytest.approx(np.array([[1.0, 1.0], [0.0, 1.0]]))
+
+
+def test_movePlanetsCommand():
+    planets = [Planet(name) for name in ("A", "B")]
+    oldPositions = [(0.0, 0.0), (1.0, 1.0)]
+    newPositions = [(4.0, 0.0), (5.0, 1.0)]
+
+    command = MovePlanetsCommand(planets, oldPositions, newPositions)
+    assert command.size() == 2
+
+    command.execute()
+    assert [(p.x, p.y) for p in planets] == newPositions
+    command.undo()
+    assert [(p.x, p.y) for p in planets] == oldPositions
+
+
+def test_movePlanetsCommandMergesOneGesture():
+    planets = [Planet(name) for name in ("A", "B")]
+    first = MovePlanetsCommand(planets, [(0, 0), (1, 1)], [(1, 0), (2, 1)], gesture = 1)
+
+    assert not first.mergeWith(MovePlanetsCommand(planets, [(1, 0), (2, 1)], [(2, 0), (3, 1)]))
+    assert not first.mergeWith(MovePlanetsCommand(planets, [(1, 0), (2, 1)], [(2, 0), (3, 1)], gesture = 2))
+    assert first.mergeWith(MovePlanetsCommand(planets, [(1, 0), (2, 1)], [(2, 0), (3, 1)], gesture = 1))
+    assert first.newPositions == ((2, 0), (3, 1))
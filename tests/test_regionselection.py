@@ -0,0 +1,42 @@
+import numpy as np
+
+from mapTools.regionselection import pointsInPolygon, pointsInRectangle
+
+SQUARE = [(0, 0), (4, 0), (4, 4), (0, 4)]
+#U shape open at the top between x 1 and 3
+NOTCHED = [(0, 0), (4, 0), (4, 4), (3, 4), (3, 1), (1, 1), (1, 4), (0, 4)]
+BOW_TIE = [(-3, -3), (3, 3), (3, -3), (-3, 3)]
+#pentagram drawn in one stroke, its centre is outside under the even-odd rule
+PENTAGRAM = [(0, 4), (2.35, -3.24), (-3.8, 1.24), (3.8, 1.24), (-2.35, -3.24)]
+
+
+def inside(vertices, *points) -> list:
+    return pointsInPolygon(np.array(points, dtype = float), vertices).tolist()
+
+
+def test_square():
+    assert inside(SQUARE, (2, 2), (5, 2), (-1, -1), (3.9, 0.1)) == [True, False, False, True]
+
+
+def test_concavePolygon():
+    assert inside(NOTCHED, (0.5, 3), (2, 0.5), (2, 3), (3.5, 3)) == [True, True, False, True]
+
+
+def test_selfIntersectingPolygons():
+    assert inside(BOW_TIE, (2, 0), (-2, 0), (0, 2), (0, -2)) == [True, True, False, False]
+    assert inside(PENTAGRAM, (0, 0), (0, 3), (5, 5)) == [False, True, False]
+
+
+def test_degeneratePolygons():
+    points = ((0.5, 0.5), (1.0, 1.0))
+    assert inside([], *points) == [False, False]
+    assert inside([(0, 0), (1, 1)], *points) == [False, False]
+    assert pointsInPolygon(np.zeros((0, 2)), SQUARE).shape == (0,)
+
+
+def test_rectangle():
+    coordinates = np.array([(1, -2), (3, 2), (2, 0), (0.9, 0), (2, 2.1)], dtype = float)
+
+    #corners in either order give the same rectangle, edges included
+    for corner, opposite in (((1, -2), (3, 2)), ((3, 2), (1, -2)), ((1, 2), (3, -2))):
+        assert pointsInRectangle(coordinates, corner, opposite).tolist() == [True, True, True, False, False]
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from gameObjects.gameObjectRepository import GameObjectRepository
+from gameObjects.planet import Planet
+from gameObjects.traderoute import TradeRoute
+from mapTools.spatialgrid import SpatialGrid
+from mapTools.traderoutegenerator import TradeRouteGenerator
+
+
+def makePlanets(**positions) -> list:
+    planets = []
+    for name, (x, y) in positions.items():
+        planet = Planet(name)
+        planet.x, planet.y = x, y
+        planets.append(planet)
+
+    return planets
+
+
+def test_pairsWithin():
+    #3 and 5 lie in other cells than 0, 1 and 2 is exactly 1.0 apart and not closer
+    coordinates = np.array([(0, 0), (0.5, 0), (1.5, 0), (0, 0.99), (3, 3), (-0.1, 0)])
+    first, second, distances = SpatialGrid(coordinates, 1.0).pairsWithin(1.0)
+
+    found = dict(zip(zip(first.tolist(), second.tolist()), distances.tolist()))
+    assert found.keys() == {(0, 1), (0, 3), (0, 5), (1, 5), (3, 5)}
+    assert found[(0, 1)] == pytest.approx(0.5)
+    assert found[(3, 5)] == pytest.approx(np.hypot(0.1, 0.99))
+
+
+def test_pairsWithinDuplicatePoints():
+    coordinates = np.array([(0.0, 0.0), (0.0, 0.0), (0.0, 0.0), (3.0, 3.0)])
+    first, second, distances = SpatialGrid(coordinates, 1.0).pairsWithin(1.0)
+
+    assert sorted(zip(first.tolist(), second.tolist())) == [(0, 1), (0, 2), (1, 2)]
+    assert np.all(distances == 0)
+
+
+def test_invalidSizes():
+    with pytest.raises(ValueError):
+        SpatialGrid(np.zeros((1, 2)), 0)
+
+    with pytest.raises(ValueError):
+        SpatialGrid(np.zeros((1, 2)), 1.0).pairsWithin(2.0)
+
+
+#A and B are 2 apart, C is closer to both of them than they are to each other
+#but outside the circle through A and B
+@pytest.mark.parametrize("mode, expected", [
+    ("distance", ["A_B", "A_C", "B_C"]),
+    ("gabriel", ["A_B", "A_C", "B_C"]),
+    ("rng", ["A_C", "B_C"]),
+    ("knn", ["A_C", "B_C"]),
+])
+def test_modes(mode, expected):
+    planets = makePlanets(A = (0, 0), B = (2, 0), C = (0.9, 1.5), Far = (10, 10))
+    tradeRoutes = TradeRouteGenerator(GameObjectRepository()).generate(planets, 3, mode, 1)
+
+    assert [t.name for t in tradeRoutes] == expected
+    assert all(t.name == t.start.name + "_" + t.end.name for t in tradeRoutes)
+
+
+def test_generateSkipsConnectedPlanets():
+    planets = makePlanets(A = (0, 0), B = (1, 0), C = (5, 0))
+    repository = GameObjectRepository()
+    existing = TradeRoute("existing")
+    existing.start, existing.end = planets[1], planets[0]
+    repository.addTradeRoute(existing)
+
+    assert TradeRouteGenerator(repository).generate(planets, 2.0, "distance") == []
+
+
+def test_generateUnknownMode():
+    with pytest.raises(ValueError):
+        TradeRouteGenerator(GameObjectRepository()).generate([], 1.0, "delaunay")
@@ -0,0 +1,190 @@
+from commands.CampaignEditCommand import CampaignEditCommand
+from commands.CreateTradeRoutesCommand import CreateTradeRoutesCommand
+from commands.MovePlanetCommand import MovePlanetCommand
+from commands.UndoStack import UndoStack
+from gameObjects.campaign import Campaign
+from gameObjects.gameObjectRepository import GameObjectRepository
+from gameObjects.planet import Planet
+from gameObjects.traderoute import TradeRoute
+
+
+class FakeClock:
+    '''Clock advanced by hand'''
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def addPlanet(stack: UndoStack, campaign: Campaign, planet: Planet) -> None:
+    campaign.planets.add(planet)
+    stack.push(CampaignEditCommand(campaign, addedPlanets = [planet]))
+
+
+def test_undoAcrossMergeWindow():
+    campaign = Campaign("Campaign")
+    first, second, third = Planet("A"), Planet("B"), Planet("C")
+    clock = FakeClock()
+    stack = UndoStack(mergeInterval = 0.5, clock = clock)
+
+    addPlanet(stack, campaign, first)
+    clock.now = 0.3
+    addPlanet(stack, campaign, second)
+    clock.now = 2.0
+    addPlanet(stack, campaign, third)
+
+    stack.undo()
+    assert campaign.planets == {first, second}
+    #the first two edits were merged into one step
+    stack.undo()
+    assert campaign.planets == set()
+    assert not stack.canUndo
+
+    stack.redo()
+    assert campaign.planets == {first, second}
+    stack.redo()
+    assert campaign.planets == {first, second, third}
+    assert not stack.canRedo
+
+
+def test_noMergeAfterUndo():
+    campaign = Campaign("Campaign")
+    first, second = Planet("A"), Planet("B")
+    stack = UndoStack(clock = FakeClock())
+
+    addPlanet(stack, campaign, first)
+    stack.undo()
+    addPlanet(stack, campaign, second)
+    assert not stack.canRedo
+
+    stack.undo()
+    assert campaign.planets == set()
+    assert not stack.canUndo
+
+
+def test_cancellingEditsAreDropped():
+    campaign = Campaign("Campaign")
+    planet = Planet("A")
+    stack = UndoStack(clock = FakeClock())
+
+    addPlanet(stack, campaign, planet)
+    campaign.planets.remove(planet)
+    stack.push(CampaignEditCommand(campaign, removedPlanets = [planet]))
+
+    assert not stack.canUndo
+
+
+def test_mergedEditIsNetChange():
+    campaign = Campaign("Campaign")
+    first, second = Planet("A"), Planet("B")
+    campaign.planets.add(first)
+
+    command = CampaignEditCommand(campaign, addedPlanets = [second], removedPlanets = [first])
+    assert command.mergeWith(CampaignEditCommand(campaign, addedPlanets = [first]))
+    assert command.addedPlanets == {second}
+    assert command.removedPlanets == set()
+    assert not command.mergeWith(CampaignEditCommand(Campaign("Other"), addedPlanets = [first]))
+
+
+def test_undoTradeRouteCreation():
+    repository = GameObjectRepository()
+    campaign = Campaign("Campaign")
+    tradeRoute = TradeRoute("A_B")
+    newTradeRoutes = []
+    stack = UndoStack(clock = FakeClock())
+
+    command = CreateTradeRoutesCommand(repository, newTradeRoutes, campaign, [tradeRoute])
+    command.execute()
+    stack.push(command)
+    assert tradeRoute in campaign.tradeRoutes
+    assert repository.getTradeRouteByName("A_B") is tradeRoute
+
+    #undone routes are no longer saved or offered for the campaign
+    stack.undo()
+    assert campaign.tradeRoutes == set()
+    assert newTradeRoutes == []
+    assert tradeRoute not in repository.tradeRoutes
+
+    stack.redo()
+    assert campaign.tradeRoutes == {tradeRoute}
+    assert newTradeRoutes == [tradeRoute]
+    assert repository.getTradeRouteByName("A_B") is tradeRoute
+
+
+def test_movesOfOneGestureMerge():
+    planet = Planet("A")
+    clock = FakeClock()
+    stack = UndoStack(mergeInterval = 0.5, clock = clock)
+
+    for step in range(1, 4):
+        clock.now += 0.2
+        stack.push(MovePlanetCommand(planet, (step - 1, 0), (step, 0), gesture = 1))
+        planet.x = step
+
+    stack.undo()
+    assert planet.x == 0
+    assert not stack.canUndo
+
+
+def test_separateMovesStaySeparate():
+    planet = Planet("A")
+    clock = FakeClock()
+    stack = UndoStack(mergeInterval = 0.5, clock = clock)
+
+    stack.push(MovePlanetCommand(planet, (0, 0), (1, 0)))
+    clock.now = 0.2
+    stack.push(MovePlanetCommand(planet, (1, 0), (2, 0)))
+    clock.now = 0.4
+    stack.push(MovePlanetCommand(planet, (2, 0), (3, 0), gesture = 1))
+    clock.now = 0.6
+    stack.push(MovePlanetCommand(planet, (3, 0), (4, 0), gesture = 2))
+    planet.x = 4
+
+    undone = []
+    while stack.canUndo:
+        undone.append(stack.undo().oldPosition)
+
+    assert undone == [(3, 0), (2, 0), (1, 0), (0, 0)]
+
+
+def test_trimByCount():
+    planets = [Planet(name) for name in "ABCDE"]
+    clock = FakeClock()
+    stack = UndoStack(maximumCommands = 3, clock = clock)
+
+    for planet in planets:
+        clock.now += 1
+        stack.push(MovePlanetCommand(planet, (0, 0), (1, 1)))
+
+    undone = []
+    while stack.canUndo:
+        undone.append(stack.undo().planet.name)
+
+    assert undone == ["E", "D", "C"]
+
+
+def test_trimBySizeKeepsNewest():
+    campaign = Campaign("Campaign")
+    clock = FakeClock()
+    stack = UndoStack(maximumSize = 10, clock = clock)
+
+    for size in (4, 4, 4, 20):
+        clock.now += 1
+        added = [Planet("P{}_{}".format(size, index)) for index in range(size)]
+        campaign.planets.update(added)
+        stack.push(CampaignEditCommand(campaign, addedPlanets = added))
+
+    #the newest command is kept even though it is larger than the limit on its own
+    assert len(stack.undo().addedPlanets) == 20
+    assert not stack.canUndo
+
+
+def test_clear():
+    stack = UndoStack(clock = FakeClock())
+    stack.push(MovePlanetCommand(Planet("A"), (0, 0), (1, 1)))
+    stack.undo()
+    stack.clear()
+
+    assert not stack.canUndo and not stack.canRedo
+    assert stack.undo() is None and stack.redo() is None
@@ -0,0 +1,25 @@
+import lxml.etree as et
+
+from gameObjects.nametable import nameKey
+from xmlUtil.xmlreader import XMLReader
+
+
+def test_nameKey():
+    assert nameKey(" Planet_0 ") == nameKey("PLANET_0") == "planet_0"
+    assert nameKey("PLANET_0") is nameKey("planet_0")
+    assert nameKey(None) is None
+
+
+def test_findNamedElement():
+    first = et.fromstring("<Planets><Planet Name=\"Kuat\"><Galactic_Position>1, 2, 0</Galactic_Position></Planet>"
+        "<!-- comment --><Planet Name=\"KUAT\"/><Planet Name=\"Coruscant\"/></Planets>")
+    second = et.fromstring("<Planets><Planet Name=\"Kuat\"/></Planets>")
+    reader = XMLReader()
+
+    #the first of several elements with the same name is found
+    assert reader.findNamedElement("kuat", first) is first[0]
+    assert reader.findNamedElement("coruscant", first) is first[3]
+    assert reader.findNamedElement("Alderaan", first) is None
+
+    assert reader.findNamedElement("Kuat", second) is second[0]
+    assert reader.getLocation("KUAT", first) == (1.0, 2.0)
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+import xmlUtil.xmlwriter
+from gameObjects.gameObjectRepository import GameObjectRepository
+from xmlUtil.xmlwriter import XMLWriter
+
+
+def openFiles() -> int:
+    return len(os.listdir("/proc/self/fd"))
+
+
+def test_writeFiles(tmp_path):
+    existing = tmp_path / "Existing.xml"
+    existing.write_bytes(b"old")
+    new = tmp_path / "Sub" / "New.xml"
+
+    XMLWriter().writeFiles({str(existing): b"<Existing/>", str(new): b"<New/>"})
+
+    assert existing.read_bytes() == b"<Existing/>"
+    assert new.read_bytes() == b"<New/>"
+    assert sorted(os.listdir(tmp_path)) == ["Existing.xml", "Sub"]
+
+
+def test_targetsStayInPlace(tmp_path, monkeypatch):
+    '''Every existing target is in place whenever a file is moved, and all are restored if a move fails'''
+    files = [tmp_path / name for name in ("A.xml", "B.xml", "C.xml")]
+    for file in files:
+        file.write_bytes(b"old " + file.name.encode())
+
+    replace = os.replace
+    def failingReplace(source, destination):
+        assert all(file.exists() for file in files)
+        if destination == str(files[2]):
+            raise OSError("disk full")
+        replace(source, destination)
+
+    monkeypatch.setattr(xmlUtil.xmlwriter.os, "replace", failingReplace)
+    with pytest.raises(OSError):
+        XMLWriter().writeFiles({str(file): b"new" for file in files})
+
+    assert [file.read_bytes() for file in files] == [b"old A.xml", b"old B.xml", b"old C.xml"]
+    assert sorted(os.listdir(tmp_path)) == ["A.xml", "B.xml", "C.xml"]
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason = "needs /proc to count open files")
+def test_failedTemporaryIsClosed(tmp_path, monkeypatch):
+    def failingChmod(path, mode):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(xmlUtil.xmlwriter.os, "chmod", failingChmod)
+    before = openFiles()
+    with pytest.raises(PermissionError):
+        XMLWriter().writeFiles({str(tmp_path / "A.xml"): b"new"})
+
+    assert openFiles() == before
+    assert os.listdir(tmp_path) == []
+
+
+def test_unknownPlanetFilesComeFromBaseFolder(tmp_path):
+    '''Without recorded planet files the metafile and the planet files are read from where they were loaded'''
+    baseFolder = tmp_path / "Base" / "XML"
+    baseFolder.mkdir(parents = True)
+    (baseFolder / "GameObjectFiles.XML").write_text("<Meta><File>Planets.xml</File></Meta>")
+    (baseFolder / "Planets.xml").write_text("<Planets><Planet Name=\"Kuat\"><Galactic_Position>1.0, 2.0, 0.0</Galactic_Position></Planet></Planets>")
+    modFolder = tmp_path / "Mod" / "XML"
+    modFolder.mkdir(parents = True)
+
+    repository = GameObjectRepository()
+    for file in ("GameObjectFiles.XML", "Planets.xml"):
+        repository.setDataFileSource(file, str(baseFolder / file))
+
+    outputFiles, _ = XMLWriter().planetCoordinatesFiles(repository, str(modFolder) + "/", {"kuat": [3.0, 4.0]})
+
+    assert list(outputFiles.keys()) == [str(modFolder / "Planets.xml")]
+    assert outputFiles[str(modFolder / "Planets.xml")].find(".//Galactic_Position").text.startswith("3.0, 4.0, ")
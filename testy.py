@@ -5,12 +5,14 @@ from PyQt5.QtWidgets import QApplication
 from commands.ShowTradeCreatorDialogCommand import ShowTradeRouteCreatorDialogCommand
 from commands.ShowCampaignPropertiesDialogCommand import ShowCampaignCreatorDialogCommand
 from commands.ShowAutoConnectionSettingsCommand import AutoConnectionSettingsCommand
+from commands.ShowPlanetTransformDialogCommand import ShowPlanetTransformDialogCommand
 from config import Config
+from gameObjects.gameObjectRepository import GameObjectRepository
 from ui.DialogFactory import DialogFactory
 from ui.mainwindow_presenter import MainWindow, MainWindowPresenter
 from ui.planetcontextmenu import PlanetContextMenu
 from ui.qtmainwindow import QtMainWindow
-from RepositoryCreator import RepositoryCreator
+from ui.qtrepositoryloader import QtRepositoryLoader
 
 config: Config = Config()
 
@@ -23,19 +25,22 @@ else:
 
 app = QApplication([])
 
-repositoryCreator: RepositoryCreator = RepositoryCreator()
-repository = repositoryCreator.constructRepository(path)
+repository: GameObjectRepository = GameObjectRepository()
 
 dialogFactory = DialogFactory(repository)
 
 qtMainWindow: QtMainWindow = QtMainWindow()
-presenter: MainWindowPresenter = MainWindowPresenter(qtMainWindow, repository, config)
+presenter: MainWindowPresenter = MainWindowPresenter(qtMainWindow, repository, config, QtRepositoryLoader())
 presenter.newTradeRouteCommand = ShowTradeRouteCreatorDialogCommand(presenter, dialogFactory)
 presenter.campaignPropertiesCommand = ShowCampaignCreatorDialogCommand(presenter, dialogFactory)
 presenter.planetContextMenu = PlanetContextMenu(presenter)
 presenter.autoConnectionSettingsCommand = AutoConnectionSettingsCommand(presenter, dialogFactory)
+presenter.planetTransformCommand = ShowPlanetTransformDialogCommand(presenter, dialogFactory)
 
 qtMainWindow.setMainWindowPresenter(presenter)
 qtMainWindow.getWindow().show()
 
+#the repository is loaded in the background and swapped in when it is complete
+presenter.onDataFolderChanged(path)
+
 app.exec_()
@@ -1,18 +1,31 @@
+from typing import TYPE_CHECKING
+
 from gameObjects.gameObjectRepository import GameObjectRepository
-from ui.qttraderoutecreator import QtTradeRouteCreator
-from ui.qtcampaignproperties import QtCampaignProperties
-from ui.qtautoconnectionsettings import QtAutoConnectionSettings
+
+#dialog modules are imported when a dialog is first made, not at startup
+if TYPE_CHECKING:
+    from ui.qttraderoutecreator import QtTradeRouteCreator
+    from ui.qtcampaignproperties import QtCampaignProperties
+    from ui.qtautoconnectionsettings import QtAutoConnectionSettings
+    from ui.qtplanettransform import QtPlanetTransform
 
 class DialogFactory:
     '''Produces dialog boxes'''
     def __init__(self, repository: GameObjectRepository):
         self.__repository: GameObjectRepository = repository
 
-    def makeTradeRouteCreationDialog(self) -> QtTradeRouteCreator:
+    def makeTradeRouteCreationDialog(self) -> "QtTradeRouteCreator":
+        from ui.qttraderoutecreator import QtTradeRouteCreator
         return QtTradeRouteCreator(self.__repository)
 
-    def makeCampaignPropertiesDialog(self) -> QtCampaignProperties:
+    def makeCampaignPropertiesDialog(self) -> "QtCampaignProperties":
+        from ui.qtcampaignproperties import QtCampaignProperties
         return QtCampaignProperties(self.__repository)
 
-    def makeAutoConnectionSettingsDialog(self) -> QtAutoConnectionSettings:
-        return QtAutoConnectionSettings(self.__repository)
\ No newline at end of file
+    def makeAutoConnectionSettingsDialog(self) -> "QtAutoConnectionSettings":
+        from ui.qtautoconnectionsettings import QtAutoConnectionSettings
+        return QtAutoConnectionSettings(self.__repository)
+
+    def makePlanetTransformDialog(self) -> "QtPlanetTransform":
+        from ui.qtplanettransform import QtPlanetTransform
+        return QtPlanetTransform(self.__repository)
\ No newline at end of file
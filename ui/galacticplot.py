@@ -2,15 +2,20 @@ from abc import ABC, abstractmethod
 from typing import List
 
 from gameObjects.planet import Planet
-from gameObjects.traderoute import TradeRoute
 
 
 class GalacticPlot(ABC):
+    '''Map of the galaxy. Implementations are QtGalacticPlot with matplotlib and QtSceneGalacticPlot
+    with a QGraphicsScene. They also provide planetSelectedSignal(indexes) with the indexes
+    of planets clicked on the map in the allPlanets list of the last plotGalaxy call, and
+    regionSelectedSignal(indexes, deselect) with all planets inside a rectangle or lasso
+    and planetMovedSignal(index, x, y) when a planet is dropped after dragging it with the move tool'''
 
     @abstractmethod
-    def plotPlanets(self, planets: List[Planet]) -> None:
+    def plotGalaxy(self, planets, tradeRoutes, allPlanets, autoPlanetConnectionDistance: int = 0) -> None:
         raise NotImplementedError()
 
     @abstractmethod
-    def plotTradeRoutes(self, tradeRoutes: List[TradeRoute]) -> None:
+    def highlightPlanets(self, planets: List[Planet]) -> None:
+        '''Marks planets, e.g. ones found by a check, from the next plotGalaxy call on'''
         raise NotImplementedError()
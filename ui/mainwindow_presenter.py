@@ -1,16 +1,21 @@
 from abc import ABC, abstractmethod
 from typing import List, Set, Dict
 
-import numpy as np
-from numpy import ndarray as NumPyArray
-
+from commands.CampaignEditCommand import CampaignEditCommand
+from commands.CreateTradeRoutesCommand import CreateTradeRoutesCommand
+from commands.MovePlanetCommand import MovePlanetCommand
+from commands.MovePlanetsCommand import MovePlanetsCommand
+from commands.UndoStack import UndoStack
 from config import Config
 from gameObjects.gameObjectRepository import GameObjectRepository
 from gameObjects.planet import Planet
 from gameObjects.traderoute import TradeRoute
 from gameObjects.faction import Faction
 from gameObjects.campaign import Campaign
+from mapTools.campaigngraph import CampaignGraph
+from mapTools.campaignvalidator import CampaignValidator, ValidationIssue
 from ui.galacticplot import GalacticPlot
+from ui.repositoryloader import RepositoryLoader
 from RepositoryCreator import RepositoryCreator
 from xmlUtil.xmlwriter import XMLWriter
 from xmlUtil.xmlreader import XMLReader
@@ -39,7 +44,7 @@ class MainWindow(ABC):
         raise NotImplementedError()
 
     @abstractmethod
-    def makeGalacticPlot(self) -> GalacticPlot:
+    def makeGalacticPlot(self, backend: str) -> GalacticPlot:
         raise NotImplementedError()
 
     @abstractmethod
@@ -74,20 +79,51 @@ class MainWindow(ABC):
     def clearTradeRoutes(self) -> None:
         raise NotImplementedError()
 
+    @abstractmethod
+    def showLoadingProgress(self, phase: str, current: int, total: int) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def hideLoadingProgress(self) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def showReport(self, title: str, text: str) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def showValidationIssues(self, issues: List[str]) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def updateUndoActions(self, canUndo: bool, canRedo: bool) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def showCampaignUsage(self, name: str, campaigns: List[str]) -> None:
+        raise NotImplementedError()
+
 
 class MainWindowPresenter:
     """Window display class"""
 
     def __init__(
-        self, mainWindow: MainWindow, repository: GameObjectRepository, config: Config
+        self,
+        mainWindow: MainWindow,
+        repository: GameObjectRepository,
+        config: Config,
+        repositoryLoader: RepositoryLoader = None,
     ):
         self.__mainWindow: MainWindow = mainWindow
-        self.__plot: GalacticPlot = self.__mainWindow.makeGalacticPlot()
+        self.__plot: GalacticPlot = self.__mainWindow.makeGalacticPlot(
+            config.galacticPlotBackend
+        )
 
         self.__xmlWriter: XMLWriter = XMLWriter()
 
         self.__repository = repository
-        self.__repositoryCreator = RepositoryCreator()
+        self.__repositoryLoader = repositoryLoader
+        self.__loadingFolder: str = ""
 
         self.__config = config
 
@@ -97,31 +133,88 @@ class MainWindowPresenter:
         self.__availableTradeRoutes: List[TradeRoute] = list()
         self.__newTradeRoutes: List[TradeRoute] = list()
         self.__updatedPlanetCoords: Dict[str, List[float]] = dict()
+        self.__modifiedCampaigns: Set[Campaign] = set()
 
         self.__selectedCampaignIndex: int = 0
 
         self.__checkedPlanets: Set[Planet] = set()
         self.__checkedTradeRoutes: Set[TradeRoute] = set()
+        self.__campaignGraph: CampaignGraph = CampaignGraph()
+        self.__validator: CampaignValidator = CampaignValidator()
+        self.__validationIssues: List[ValidationIssue] = list()
+        self.__undoStack: UndoStack = UndoStack()
 
         self.__showAutoConnections = True
 
         self.__plot.planetSelectedSignal.connect(self.planetSelectedOnPlot)
+        self.__plot.regionSelectedSignal.connect(self.planetsSelectedInRegion)
+        self.__plot.planetMovedSignal.connect(self.planetMovedOnPlot)
+
+        if self.__repositoryLoader is not None:
+            self.__repositoryLoader.progressSignal.connect(self.onRepositoryLoadProgress)
+            self.__repositoryLoader.loadedSignal.connect(self.onRepositoryLoaded)
+            self.__repositoryLoader.cancelledSignal.connect(self.onRepositoryLoadCancelled)
+            self.__repositoryLoader.failedSignal.connect(self.onRepositoryLoadFailed)
 
         self.__updateWidgets()
 
         self.newTradeRouteCommand = None
         self.campaignPropertiesCommand = None
+        self.planetTransformCommand = None
 
     def onDataFolderChanged(self, folder: str) -> None:
-        """Updates the repository and refreshes the main window when a new data folder is selected"""
-        self.__repository.emptyRepository()
-        self.__repository = self.__repositoryCreator.constructRepository(folder)
-        XMLStructure.dataFolder = folder
+        """Loads a new data folder. With a repository loader the window stays usable
+        during the load and the new repository is swapped in once it is complete"""
+        self.__loadingFolder = folder
+
+        if self.__repositoryLoader is None:
+            self.onRepositoryLoaded(
+                RepositoryCreator().constructRepository(folder, self.__config.baseDataFolders)
+            )
+            return
+
+        self.__mainWindow.showLoadingProgress("Loading " + folder, 0, 0)
+        self.__repositoryLoader.load(folder, self.__config.baseDataFolders)
 
+    def onRepositoryLoadProgress(self, phase: str, current: int, total: int) -> None:
+        """Shows the progress of a running repository load"""
+        self.__mainWindow.showLoadingProgress(phase, current, total)
+
+    def onRepositoryLoaded(self, repository: GameObjectRepository) -> None:
+        """Swaps in a completely loaded repository and refreshes the main window"""
+        self.__repository.replaceContents(repository)
+        XMLStructure.dataFolder = self.__loadingFolder
+
+        self.__selectedCampaignIndex = 0
+        self.__newTradeRoutes.clear()
+        self.__updatedPlanetCoords.clear()
+        self.__modifiedCampaigns.clear()
+        self.__undoStack.clear()
+        self.__updateUndoActions()
+        self.__plot.highlightPlanets([])
+
+        self.__mainWindow.hideLoadingProgress()
         self.__updateWidgets()
 
+    def cancelRepositoryLoad(self) -> None:
+        """Cancels a running repository load, keeping the current repository"""
+        if self.__repositoryLoader is not None:
+            self.__repositoryLoader.cancel()
+
+    def onRepositoryLoadCancelled(self) -> None:
+        """Handles a cancelled repository load"""
+        print("Loading " + self.__loadingFolder + " cancelled")
+        self.__mainWindow.hideLoadingProgress()
+
+    def onRepositoryLoadFailed(self, message: str) -> None:
+        """Handles a failed repository load"""
+        print("Error! Could not load " + self.__loadingFolder + ": " + message)
+        self.__mainWindow.hideLoadingProgress()
+
     def onPlanetChecked(self, index: int, checked: bool) -> None:
         """If a planet is checked by the user, add it to the selected campaign and refresh the galaxy plot"""
+        state = self.__campaignState()
+
         if checked:
             if self.__planets[index] not in self.__checkedPlanets:
                 self.__checkedPlanets.add(self.__planets[index])
@@ -137,29 +230,75 @@ class MainWindowPresenter:
                 )
                 self.__updateAvailableTradeRoutes(self.__checkedPlanets)
 
+        self.__markSelectedCampaignModified()
+        self.__recordCampaignEdit(state)
         self.__mainWindow.updatePlanetComboBox(self.__getNames(self.__checkedPlanets))
         self.__updateGalacticPlot()
+        self.__showPlanetUsage(self.__planets[index])
 
     def planetSelectedOnPlot(self, indexes: list) -> None:
         """If a planet is checked by the user, add it to the selected campaign and refresh the galaxy plot"""
+        state = self.__campaignState()
+
         for index in indexes:
             if self.__planets[index] not in self.__checkedPlanets:
                 self.__checkedPlanets.add(self.__planets[index])
                 self.campaigns[self.__selectedCampaignIndex].planets.add(
                     self.__planets[index]
                 )
-                self.__updateAvailableTradeRoutes(self.__checkedPlanets)
             elif self.__planets[index] in self.__checkedPlanets:
                 self.__checkedPlanets.remove(self.__planets[index])
                 self.campaigns[self.__selectedCampaignIndex].planets.remove(
                     self.__planets[index]
                 )
-                self.__updateAvailableTradeRoutes(self.__checkedPlanets)
 
-        selectedPlanets = []
+        self.__updateAvailableTradeRoutes(self.__checkedPlanets)
+        self.__markSelectedCampaignModified()
+        self.__recordCampaignEdit(state)
+        self.__onPlanetsSelectedOnPlot()
 
-        for p in self.__checkedPlanets:
-            selectedPlanets.append(self.__getNames(self.__planets).index(p.name))
+        if indexes:
+            self.__showPlanetUsage(self.__planets[indexes[-1]])
+
+    def planetsSelectedInRegion(self, indexes: list, deselect: bool = False) -> None:
+        """Adds all planets inside a rectangle or lasso drawn on the map to the selected campaign,
+        or removes them with deselect, as one edit with a single refresh of the window"""
+        if not self.campaigns:
+            return
+
+        state = self.__campaignState()
+        planets = {self.__planets[index] for index in indexes}
+        campaign = self.campaigns[self.__selectedCampaignIndex]
+
+        if deselect:
+            self.__checkedPlanets.difference_update(planets)
+            campaign.planets.difference_update(planets)
+        else:
+            self.__checkedPlanets.update(planets)
+            campaign.planets.update(planets)
+
+        if campaign.planets == state[1]:
+            return
+
+        self.__updateAvailableTradeRoutes(self.__checkedPlanets)
+        self.__markSelectedCampaignModified()
+        self.__recordCampaignEdit(state)
+        self.__onPlanetsSelectedOnPlot()
+
+    def planetMovedOnPlot(self, index: int, x: float, y: float) -> None:
+        """Moves a planet dragged on the map to where it was dropped, as a single position change"""
+        planet = self.__planets[index]
+        x, y = round(x, 2), round(y, 2)
+
+        if (planet.x, planet.y) == (x, y):
+            return
+
+        self.onPlanetPositionChanged(planet.name, x, y)
+
+    def __onPlanetsSelectedOnPlot(self) -> None:
+        """Shows planets checked on the map in the planet table, the planet combobox and the map"""
+        planetIndexes = {planet: index for index, planet in enumerate(self.__planets)}
+        selectedPlanets = [planetIndexes[p] for p in self.__checkedPlanets if p in planetIndexes]
 
         self.__mainWindow.updatePlanetSelection(selectedPlanets)
         self.__mainWindow.updatePlanetComboBox(self.__getNames(self.__checkedPlanets))
@@ -167,6 +306,8 @@ class MainWindowPresenter:
 
     def onTradeRouteChecked(self, index: int, checked: bool) -> None:
         """If a trade route is checked by the user, add it to the selected campaign and refresh the galaxy plot"""
+        state = self.__campaignState()
+
         if checked:
             if self.__availableTradeRoutes[index] not in self.__checkedTradeRoutes:
                 self.__checkedTradeRoutes.add(self.__availableTradeRoutes[index])
@@ -180,7 +321,10 @@ class MainWindowPresenter:
                     self.__availableTradeRoutes[index]
                 )
 
+        self.__markSelectedCampaignModified()
+        self.__recordCampaignEdit(state)
         self.__updateGalacticPlot()
+        self.__showTradeRouteUsage(self.__availableTradeRoutes[index])
 
     def onCampaignSelected(self, index: int) -> None:
         """If a campaign is selected by the user, clear then refresh the galaxy plot"""
@@ -200,6 +344,7 @@ class MainWindowPresenter:
     def onNewCampaign(self, campaign: Campaign) -> None:
         """If a new campaign is created, add the campaign to the repository, and clear then refresh the galaxy plot"""
         self.__repository.addCampaign(campaign)
+        self.__modifiedCampaigns.add(campaign)
 
         self.__updateWidgets()
 
@@ -209,16 +354,36 @@ class MainWindowPresenter:
 
     def onNewTradeRoute(self, tradeRoute: TradeRoute):
         """Handles new trade routes"""
-        self.__repository.addTradeRoute(tradeRoute)
-        self.__newTradeRoutes.append(tradeRoute)
-
         if (
             tradeRoute.start in self.__checkedPlanets
             or tradeRoute.end in self.__checkedPlanets
         ):
             self.__checkedTradeRoutes.add(tradeRoute)
 
-        self.campaigns[self.__selectedCampaignIndex].tradeRoutes.add(tradeRoute)
+        self.__createTradeRoutes([tradeRoute])
+        self.__updateWidgets()
+
+    def onGenerateTradeRoutes(self) -> None:
+        """Turns the auto connections between the selected planets into trade routes,
+        skipping connected planets, and adds them to the selected campaign in one batch"""
+        if not self.campaigns:
+            return
+
+        distance = self.config.autoPlanetConnectionDistance
+        if distance <= 0:
+            print("Error! Set an auto connection distance to generate trade routes!")
+            return
+
+        from mapTools.traderoutegenerator import TradeRouteGenerator
+
+        tradeRoutes = TradeRouteGenerator(self.__repository).generate(
+            self.__checkedPlanets, distance, self.config.autoTradeRouteMode
+        )
+
+        self.__checkedTradeRoutes.update(tradeRoutes)
+        self.__createTradeRoutes(tradeRoutes)
+
+        print(str(len(tradeRoutes)) + " trade routes generated")
         self.__updateWidgets()
 
     def onAutoConnectionSettingChanged(
@@ -231,28 +396,61 @@ class MainWindowPresenter:
     def onPlanetPositionChanged(self, name, new_x, new_y) -> None:
         """Updates position of a planet in the repository"""
         planet = self.__repository.getPlanetByName(name)
-        planet.x = new_x
-        planet.y = new_y
-        self.__updatedPlanetCoords[name] = [new_x, new_y]
+        command = MovePlanetCommand(planet, (planet.x, planet.y), (new_x, new_y))
+        command.execute()
+        self.__undoStack.push(command)
+        self.__updateUndoActions()
+
+        self.__updatedPlanetCoords[planet.name] = [new_x, new_y]
+        self.__planetsMoved()
+
+    def __planetsMoved(self) -> None:
+        """Redraws the map after planets moved. Spacing highlights are cleared, they no longer
+        match the positions"""
+        self.__plot.highlightPlanets([])
         self.__updateGalacticPlot()
 
+    def onPlanetsTransformed(self, transform) -> None:
+        """Applies a PlanetTransform to the planets of the selected campaign as one batch,
+        recorded as a single position change of all of them"""
+        planets = [p for p in self.__checkedPlanets if p is not None and p.x is not None and p.y is not None]
+        if not planets:
+            return
+
+        import numpy as np
+
+        oldPositions = [(p.x, p.y) for p in planets]
+        newPositions = [tuple(position) for position in np.round(transform.apply(oldPositions), 2).tolist()]
+
+        command = MovePlanetsCommand(planets, oldPositions, newPositions)
+        command.execute()
+        self.__undoStack.push(command)
+        self.__updateUndoActions()
+
+        self.__updatedPlanetCoords.update({p.name: list(position) for p, position in zip(planets, newPositions)})
+        self.__planetsMoved()
+
     def allPlanetsChecked(self, checked: bool) -> None:
         """Select all planets handler: plots all planets"""
+        state = self.__campaignState()
+
         if checked:
             self.__checkedPlanets.update(self.__planets)
-            self.campaigns[self.__selectedCampaignIndex].planets.update(
-                self.__availableTradeRoutes
-            )
+            self.campaigns[self.__selectedCampaignIndex].planets.update(self.__planets)
         else:
             self.__checkedPlanets.clear()
             self.campaigns[self.__selectedCampaignIndex].planets.clear()
 
+        self.__markSelectedCampaignModified()
         self.__mainWindow.updatePlanetComboBox(self.__getNames(self.__checkedPlanets))
         self.__updateAvailableTradeRoutes(self.__checkedPlanets)
+        self.__recordCampaignEdit(state)
         self.__updateGalacticPlot()
 
     def allTradeRoutesChecked(self, checked: bool) -> None:
         """Select all trade routes handler: plots all trade routes"""
+        state = self.__campaignState()
+
         if checked:
             self.__checkedTradeRoutes.update(self.__availableTradeRoutes)
             self.campaigns[self.__selectedCampaignIndex].tradeRoutes.update(
@@ -262,25 +460,159 @@ class MainWindowPresenter:
             self.__checkedTradeRoutes.clear()
             self.campaigns[self.__selectedCampaignIndex].tradeRoutes.clear()
 
+        self.__markSelectedCampaignModified()
+        self.__recordCampaignEdit(state)
         self.__updateGalacticPlot()
 
+    def undo(self) -> None:
+        """Reverts the last edit"""
+        self.__onHistoryChanged(self.__undoStack.undo())
+
+    def redo(self) -> None:
+        """Repeats the last reverted edit"""
+        self.__onHistoryChanged(self.__undoStack.redo())
+
     def saveFile(self, fileName: str) -> None:
         """Saves XML files"""
+        if not self.campaigns:
+            print("Error! No campaign to save!")
+            return
+
         campaign = self.campaigns[self.__selectedCampaignIndex]
-        self.__xmlWriter.campaignWriter(campaign, fileName)
+        for issue in self.__validator.validate(campaign):
+            print("Warning! " + str(issue))
+
+        outputTrees = {fileName: self.__xmlWriter.campaignTree(campaign)}
 
         if len(self.__newTradeRoutes) > 0:
-            self.__xmlWriter.tradeRouteWriter(self.__newTradeRoutes)
+            outputTrees["NewTradeRoutes.xml"] = self.__xmlWriter.tradeRouteTree(
+                self.__newTradeRoutes
+            )
 
+        xmlFolder = XMLStructure.dataFolder + "/XML/"
+        planetFiles = dict()
+        patchedPositionSources = dict()
         if len(self.__updatedPlanetCoords) > 0:
-            xmlReader = XMLReader()
-            gameObjectFile = XMLStructure.dataFolder + "/XML/GameObjectFiles.XML"
-            planetRoots = xmlReader.findPlanetFilesAndRoots(gameObjectFile)
-            self.__xmlWriter.planetCoordinatesWriter(
-                XMLStructure.dataFolder + "/XML/",
-                planetRoots,
+            planetFiles, patchedPositionSources = self.__xmlWriter.planetCoordinatesFiles(
+                self.__repository,
+                xmlFolder,
                 self.__updatedPlanetCoords,
+                self.config.patchPlanetFiles,
             )
+            outputTrees.update(planetFiles)
+
+        # all files are written or, if one of them fails, none are
+        self.__xmlWriter.writeFiles(outputTrees)
+        self.__updatedPlanetCoords.clear()
+        self.__modifiedCampaigns.discard(campaign)
+
+        for name, (line, text) in patchedPositionSources.items():
+            self.__repository.setPlanetPositionSource(name, line, text)
+
+        # planet files inherited from a base data folder now have a copy in the mod
+        for outputName in planetFiles:
+            if outputName.startswith(xmlFolder):
+                self.__repository.setDataFileSource(outputName[len(xmlFolder):], outputName)
+
+    def exportCampaigns(self, folder: str) -> None:
+        """Writes every modified campaign to its own file in folder, together with a
+        CampaignFiles.XML listing them, in a single transaction. Unmodified campaigns are skipped,
+        unless they share the file a modified campaign was read from"""
+        campaigns = sorted(self.__modifiedCampaigns, key=lambda entry: entry.name)
+
+        if not campaigns:
+            print("No modified campaigns to export")
+            return
+
+        campaignMetaFile = self.__repository.getDataFileSource("CampaignFiles.XML")
+        if campaignMetaFile is None:
+            campaignMetaFile = XMLStructure.dataFolder + "/XML/CampaignFiles.XML"
+
+        try:
+            trees = self.__xmlWriter.campaignExportTrees(self.__repository, campaigns, campaignMetaFile)
+        except ValueError as error:
+            print("Error! " + str(error))
+            return
+
+        # campaigns are serialized in parallel, all files are written or none are
+        self.__xmlWriter.writeFiles({folder + "/" + file: tree for file, tree in trees.items()})
+        self.__modifiedCampaigns.difference_update(campaigns)
+
+    def connectivityReport(self) -> str:
+        """Returns a description of the connectivity of the selected campaign"""
+        components = self.__campaignGraph.components()
+        isolatedPlanets = sorted(self.__getNames(self.__campaignGraph.isolatedPlanets()))
+
+        if not components:
+            return "The campaign has no planets"
+
+        if len(components) == 1:
+            report = "All " + str(len(components[0])) + " planets are connected"
+        else:
+            report = "The planets form " + str(len(components)) + " unconnected groups of " + ", ".join(str(len(c)) for c in components) + " planets"
+
+        if isolatedPlanets:
+            report += "\n\nPlanets without trade routes:\n" + "\n".join(isolatedPlanets)
+
+        return report
+
+    def shortestPathReport(self, startName: str, endName: str) -> str:
+        """Returns a description of the shortest path along trade routes between two planets of the selected campaign"""
+        start = self.__repository.getPlanetByName(startName)
+        end = self.__repository.getPlanetByName(endName)
+
+        shortestPath = self.__campaignGraph.shortestPath(start, end)
+        if shortestPath is None:
+            return "There is no path from " + startName + " to " + endName
+
+        distance, path = shortestPath
+        return "{} jumps, distance {:.1f}:\n{}".format(len(path) - 1, distance, " - ".join(self.__getNames(path)))
+
+    def onShowConnectivity(self) -> None:
+        """Shows the connectivity of the selected campaign"""
+        self.__mainWindow.showReport("Campaign connectivity", self.connectivityReport())
+
+    def spacingReport(self, minimumSpacing: float) -> str:
+        """Checks all planets for neighbours closer than minimumSpacing, marks them on the map
+        and returns a description of the close pairs"""
+        from mapTools.spacingchecker import SpacingChecker, spacingOffenders
+
+        issues = SpacingChecker(minimumSpacing).check(self.__planets)
+        self.__plot.highlightPlanets(spacingOffenders(issues))
+        self.__updateGalacticPlot()
+
+        if not issues:
+            return "No planets are closer than {:g}".format(minimumSpacing)
+
+        lines = ["{} pairs of planets are closer than {:g}:".format(len(issues), minimumSpacing)]
+        lines.extend(str(issue) for issue in issues)
+        return "\n".join(lines)
+
+    def onCheckPlanetSpacing(self, minimumSpacing: float) -> None:
+        """Shows planets closer to each other than minimumSpacing"""
+        self.__mainWindow.showReport("Planet spacing", self.spacingReport(minimumSpacing))
+
+    def onShowShortestPath(self, startName: str, endName: str) -> None:
+        """Shows the shortest path between two planets of the selected campaign"""
+        self.__mainWindow.showReport("Shortest path", self.shortestPathReport(startName, endName))
+
+    def campaignsUsingPlanet(self, name: str) -> List[str]:
+        """Returns the names of the campaigns that have a planet"""
+        planet = self.__repository.getPlanetByName(name)
+        return sorted(self.__getNames(self.__repository.campaignIndex.campaignsWithPlanet(planet)))
+
+    def campaignsUsingTradeRoute(self, name: str) -> List[str]:
+        """Returns the names of the campaigns that have a trade route, the ones that break if it is deleted"""
+        tradeRoute = self.__repository.getTradeRouteByName(name)
+        return sorted(self.__getNames(self.__repository.campaignIndex.campaignsWithTradeRoute(tradeRoute)))
+
+    def selectCampaignByName(self, name: str) -> None:
+        """Selects a campaign, e.g. one listed as using a planet"""
+        for index, campaign in enumerate(self.campaigns):
+            if campaign.name == name:
+                self.__mainWindow.updateCampaignComboBoxSelection(index)
+                self.onCampaignSelected(index)
+                return
 
     def getNameOfPlanetAt(self, ind: int) -> str:
         return self.__planets[ind].name
@@ -292,6 +624,84 @@ class MainWindowPresenter:
         """Returns the name attribute from a list of GameObjects"""
         return [x.name for x in inputList]
 
+    def __campaignState(self) -> tuple:
+        """Returns the selected campaign with copies of its planets and trade routes,
+        used to record the changes of an edit"""
+        if not self.campaigns:
+            return None
+
+        campaign = self.campaigns[self.__selectedCampaignIndex]
+        return campaign, set(campaign.planets), set(campaign.tradeRoutes)
+
+    def __showPlanetUsage(self, planet: Planet) -> None:
+        """Lists the campaigns that have a planet"""
+        self.__mainWindow.showCampaignUsage(planet.name, self.campaignsUsingPlanet(planet.name))
+
+    def __showTradeRouteUsage(self, tradeRoute: TradeRoute) -> None:
+        """Lists the campaigns that have a trade route"""
+        self.__mainWindow.showCampaignUsage(tradeRoute.name, self.campaignsUsingTradeRoute(tradeRoute.name))
+
+    def __createTradeRoutes(self, tradeRoutes: List[TradeRoute]) -> None:
+        """Adds new trade routes to the repository and the selected campaign as one undoable edit"""
+        if not tradeRoutes:
+            return
+
+        campaign = self.campaigns[self.__selectedCampaignIndex]
+        command = CreateTradeRoutesCommand(self.__repository, self.__newTradeRoutes, campaign, tradeRoutes)
+        command.execute()
+        self.__undoStack.push(command)
+
+        self.__repository.updateCampaign(campaign)
+        self.__markSelectedCampaignModified()
+        self.__updateUndoActions()
+
+    def __recordCampaignEdit(self, state: tuple) -> None:
+        """Adds the changes made to a campaign since state was taken to the undo history
+        and to the campaign index"""
+        if state is None:
+            return
+
+        self.__repository.updateCampaign(state[0])
+
+        command = CampaignEditCommand.fromStates(*state)
+        if not command.isEmpty():
+            self.__undoStack.push(command)
+        self.__updateUndoActions()
+
+    def __onHistoryChanged(self, command) -> None:
+        """Refreshes the window after a command was undone or redone"""
+        if command is None:
+            return
+
+        if isinstance(command, MovePlanetCommand):
+            planet = command.planet
+            self.__updatedPlanetCoords[planet.name] = [planet.x, planet.y]
+            self.__plot.highlightPlanets([])
+        elif isinstance(command, MovePlanetsCommand):
+            self.__updatedPlanetCoords.update({p.name: [p.x, p.y] for p in command.planets})
+            self.__plot.highlightPlanets([])
+        elif command.campaign in self.campaigns:
+            self.__repository.updateCampaign(command.campaign)
+            self.__modifiedCampaigns.add(command.campaign)
+            self.__selectedCampaignIndex = self.campaigns.index(command.campaign)
+            if isinstance(command, CreateTradeRoutesCommand):
+                # the trade route lists follow the routes of the repository
+                self.__updateWidgets()
+            else:
+                self.__mainWindow.updateCampaignComboBoxSelection(self.__selectedCampaignIndex)
+                self.onCampaignSelected(self.__selectedCampaignIndex)
+
+        self.__updateUndoActions()
+        self.__updateGalacticPlot()
+
+    def __updateUndoActions(self) -> None:
+        """Enables undo and redo depending on the history"""
+        self.__mainWindow.updateUndoActions(self.__undoStack.canUndo, self.__undoStack.canRedo)
+
+    def __markSelectedCampaignModified(self) -> None:
+        """Remembers that the selected campaign has unsaved changes"""
+        self.__modifiedCampaigns.add(self.campaigns[self.__selectedCampaignIndex])
+
     def __updateWidgets(self) -> None:
         """Update the main window widgets"""
         self.campaigns: List[Campaign] = sorted(
@@ -307,6 +717,16 @@ class MainWindowPresenter:
             self.__repository.factions, key=lambda entry: entry.name
         )
 
+        if not self.campaigns:
+            # nothing to select until a data folder with campaigns is loaded
+            self.__checkedPlanets.clear()
+            self.__checkedTradeRoutes.clear()
+            self.__availableTradeRoutes = list()
+            self.__mainWindow.emptyWidgets()
+            self.__mainWindow.addPlanets(self.__getNames(self.__planets))
+            self.__updateGalacticPlot()
+            return
+
         self.__updateAvailableTradeRoutes(
             self.campaigns[self.__selectedCampaignIndex].planets
         )
@@ -330,7 +750,10 @@ class MainWindowPresenter:
         """Update the selected trade routes for the currently selected campaign"""
         selectedPlanets = []
 
-        self.__checkedPlanets.update(self.campaigns[index].planets)
+        # unresolved Locations are reported by the validator, not selected
+        self.__checkedPlanets.update(
+            p for p in self.campaigns[index].planets if p is not None
+        )
 
         for p in self.__checkedPlanets:
             selectedPlanets.append(self.__planets.index(p))
@@ -363,10 +786,18 @@ class MainWindowPresenter:
             # Ensure any new routes are appended to the available list for immediate use
             privateAvailableTradeRoutes.update(self.__newTradeRoutes)
 
-        self.campaigns[self.__selectedCampaignIndex].tradeRoutes = self.campaigns[
+        campaignTradeRoutes = self.campaigns[
             self.__selectedCampaignIndex
         ].tradeRoutes.intersection(privateAvailableTradeRoutes)
 
+        if len(campaignTradeRoutes) != len(
+            self.campaigns[self.__selectedCampaignIndex].tradeRoutes
+        ):
+            self.__markSelectedCampaignModified()
+
+        self.campaigns[self.__selectedCampaignIndex].tradeRoutes = campaignTradeRoutes
+        self.__repository.updateCampaign(self.campaigns[self.__selectedCampaignIndex])
+
         self.__availableTradeRoutes = sorted(
             privateAvailableTradeRoutes, key=lambda entry: entry.name
         )
@@ -375,7 +806,25 @@ class MainWindowPresenter:
         )
         self.__updateSelectedTradeRoutes(self.__selectedCampaignIndex)
 
+    def __validateSelectedCampaign(self) -> None:
+        """Checks the selected campaign and shows its problems. A single pass over
+        the campaign is cheap enough to run after every edit"""
+        if self.campaigns:
+            self.__validationIssues = self.__validator.validate(
+                self.campaigns[self.__selectedCampaignIndex]
+            )
+        else:
+            self.__validationIssues = list()
+
+        self.__mainWindow.showValidationIssues(
+            [issue.message for issue in self.__validationIssues]
+        )
+
     def __updateGalacticPlot(self):
+        # every change to the selection ends here, so the graph only applies the differences
+        self.__campaignGraph.update(self.__checkedPlanets, self.__checkedTradeRoutes)
+        self.__validateSelectedCampaign()
+
         autoConnectionDistance = self.config.autoPlanetConnectionDistance
         if not self.__showAutoConnections:
             autoConnectionDistance = 0
@@ -393,3 +842,20 @@ class MainWindowPresenter:
     @property
     def showAutoConnections(self):
         return self.__showAutoConnections
+
+    @property
+    def validationIssues(self) -> List[ValidationIssue]:
+        return list(self.__validationIssues)
+
+    @property
+    def campaignGraph(self) -> CampaignGraph:
+        return self.__campaignGraph
+
+    @property
+    def checkedPlanetNames(self) -> List[str]:
+        return sorted(self.__getNames(self.__checkedPlanets))
+
+    @property
+    def modifiedCampaigns(self) -> List[str]:
+        """Returns the names of campaigns changed since they were loaded or last saved"""
+        return sorted(self.__getNames(self.__modifiedCampaigns))
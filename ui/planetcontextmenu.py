@@ -2,7 +2,6 @@ from PyQt5.QtWidgets import QMenu
 
 from ui.dialogs import Dialog, DialogResult
 from ui.mainwindow_presenter import MainWindow, MainWindowPresenter
-from ui.planetpositionchanger import PlanetPositionChanger
 
 
 class PlanetContextMenu():
@@ -21,9 +20,10 @@ class PlanetContextMenu():
 
         ''' Shows the "change coordinates" dialog '''
         if choice is self.__changePositionAction:
+            from ui.planetpositionchanger import PlanetPositionChanger
             name = self.__presenter.getNameOfPlanetAt(item.row())
             old_x, old_y = self.__presenter.getPositionOfPlanetAt(item.row())
-            self.__dialog: PlanetPositionChanger = PlanetPositionChanger(self.__presenter, name, old_x, old_y)
+            self.__dialog = PlanetPositionChanger(self.__presenter, name, old_x, old_y)
             result: DialogResult = self.__dialog.show()
             if result is DialogResult.Ok:
                 x,y = self.__dialog.getNewCoordinates()
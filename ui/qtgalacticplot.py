@@ -1,37 +1,82 @@
-from PyQt5.QtWidgets import QVBoxLayout, QWidget
-from PyQt5.QtCore import pyqtSignal
-from matplotlib.backends.backend_qt5agg import FigureCanvas, \
-    NavigationToolbar2QT as NavigationToolbar
-from matplotlib.figure import Axes, Figure
+from abc import ABCMeta
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
+from PyQt5.QtWidgets import QApplication, QVBoxLayout, QWidget
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 
-class QtGalacticPlot(QWidget):
-    '''Class for plotting the galaxy'''
+from ui.galacticplot import GalacticPlot
+from ui.qtselectiontools import addSelectionToolActions
+
+if TYPE_CHECKING:
+    from matplotlib.backends.backend_qt5agg import FigureCanvas
+    from matplotlib.figure import Axes
+
+
+class QtGalacticPlotMeta(type(QWidget), ABCMeta):
+    '''Metaclass of galaxy plots, which are both QWidgets and GalacticPlots'''
+
+
+class QtGalacticPlot(QWidget, GalacticPlot, metaclass = QtGalacticPlotMeta):
+    '''Class for plotting the galaxy.
+    matplotlib is imported when the first planets are plotted, not at startup'''
     #signal to send to main window presenter when a planet is selected in the plot
     planetSelectedSignal = pyqtSignal(list)
+    #signal with the planets inside a rectangle or lasso and whether to deselect them
+    regionSelectedSignal = pyqtSignal(list, bool)
+    #signal with the index and new coordinates of a planet dragged with the move tool
+    planetMovedSignal = pyqtSignal(int, float, float)
 
     def __init__(self, parent: QWidget = None):
         super(QtGalacticPlot, self).__init__()
         self.__galacticPlotWidget: QWidget = QWidget(parent)
         self.__galacticPlotWidget.setLayout(QVBoxLayout())
 
-        self.__galacticPlotCanvas: FigureCanvas = FigureCanvas(Figure())
-
-        self.__galacticPlotCanvas.mpl_connect('pick_event', self.__planetSelect)
-        self.__galacticPlotCanvas.mpl_connect('motion_notify_event', self.__planetHover)
-
-        self.__galacticPlotNavBar: NavigationToolbar = NavigationToolbar(self.__galacticPlotCanvas, self.__galacticPlotWidget)
-        self.__galacticPlotWidget.layout().addWidget(self.__galacticPlotNavBar)
-        self.__galacticPlotWidget.layout().addWidget(self.__galacticPlotCanvas)
-        self.__axes: Axes = self.__galacticPlotCanvas.figure.add_subplot(111, aspect = "equal")
+        self.__galacticPlotCanvas: FigureCanvas = None
+        self.__axes: Axes = None
 
-        self.__annotate = self.__axes.annotate("", xy = (0,0), xytext = (10, 10), textcoords = "offset points", bbox = dict(boxstyle="round", fc="w"), arrowprops = dict(arrowstyle="->"))
-        self.__annotate.set_visible(False)
+        self.__annotate = None
         self.__planetNames = []
         self.__planetsScatter = None
 
+        #coordinates of the planets in the order of planetNames, for region selection
+        self.__planetCoordinates = None
+        self.__selectionTool: str = "pick"
+        self.__selector = None
+
+        #plotted planets, the selected ones in the order of the selected scatter,
+        #and the route and connection lines at each planet with the end of the line it is at
+        self.__plottedPlanets = []
+        self.__selectedPlanets = []
+        self.__selectedScatter = None
+        self.__planetLines: Dict[object, List[Tuple[object, int]]] = dict()
+
+        #planets marked with a red ring, e.g. by the spacing check
+        self.__highlightedPlanets = []
+        self.__highlightScatter = None
+
+        #state of a planet drag with the move tool
+        self.__dragIndex: int = None
+        self.__dragLines: List[Tuple[object, int]] = []
+        self.__dragMarker = None
+        self.__dragBackground = None
+        self.__dragHidden = []
+        self.__dragPosition: Tuple[float, float] = None
+
+    def setSelectionTool(self, tool: str) -> None:
+        '''Switches between picking single planets, selecting them with a "rectangle" or "lasso"
+        and dragging them with "move"'''
+        self.__selectionTool = tool
+        if self.__axes is not None:
+            self.__createSelector()
+
     def plotGalaxy(self, planets, tradeRoutes, allPlanets, autoPlanetConnectionDistance: int = 0) -> None:
         '''Plots all planets as alpha = 0.1, then overlays all selected planets and trade routes'''
+        if self.__galacticPlotCanvas is None:
+            if not allPlanets:
+                return
+            self.__createCanvas()
+
+        self.__endDrag()
         self.__axes.clear()
 
         #Has to be set again here for the planet hover labels to work
@@ -39,6 +84,9 @@ class QtGalacticPlot(QWidget):
         self.__annotate.set_visible(False)
 
         self.__planetNames = []
+        self.__plottedPlanets = list(allPlanets)
+        self.__selectedPlanets = list(planets)
+        self.__planetLines = dict()
 
         x = []
         y = []
@@ -49,6 +97,8 @@ class QtGalacticPlot(QWidget):
             self.__planetNames.append(p.name)
 
         self.__planetsScatter = self.__axes.scatter(x, y, c = 'b', alpha = 0.1, picker = 5)
+        self.__planetCoordinates = self.__planetsScatter.get_offsets()
+        self.__createSelector()
 
         x1 = 0        
         y1 = 0
@@ -62,7 +112,8 @@ class QtGalacticPlot(QWidget):
             x2 = t.end.x
             y2 = t.end.y
             # plot each route (start, end)            
-            self.__axes.plot([x1, x2], [y1, y2], 'k-', alpha=0.4)
+            line, = self.__axes.plot([x1, x2], [y1, y2], 'k-', alpha=0.4)
+            self.__addPlanetLine(line, t.start, t.end)
         
         #Create automatic connections between planets
         if autoPlanetConnectionDistance > 0:
@@ -72,31 +123,208 @@ class QtGalacticPlot(QWidget):
                         break
                     dist: float = p1.distanceTo(p2)
                     if dist < autoPlanetConnectionDistance:
-                        self.__axes.plot([p1.x, p2.x], [p1.y, p2.y], 'k-', alpha=0.1)
+                        line, = self.__axes.plot([p1.x, p2.x], [p1.y, p2.y], 'k-', alpha=0.1)
+                        self.__addPlanetLine(line, p1, p2)
 
         x = []
         y = []
 
-        for p in planets:
+        for p in self.__selectedPlanets:
             x.append(p.x)
             y.append(p.y)
 
-        self.__axes.scatter(x, y, c = 'b')
+        self.__selectedScatter = self.__axes.scatter(x, y, c = 'b')
+
+        self.__highlightScatter = None
+        if self.__highlightedPlanets:
+            x = [p.x for p in self.__highlightedPlanets]
+            y = [p.y for p in self.__highlightedPlanets]
+            self.__highlightScatter = self.__axes.scatter(x, y, s = 120, facecolors = 'none', edgecolors = 'r')
 
         self.__galacticPlotCanvas.draw_idle()
 
 
+    def __createCanvas(self) -> None:
+        '''Imports matplotlib and sets up the canvas and navigation bar'''
+        from matplotlib.backends.backend_qt5agg import FigureCanvas, \
+            NavigationToolbar2QT as NavigationToolbar
+        from matplotlib.figure import Figure
+
+        self.__galacticPlotCanvas = FigureCanvas(Figure())
+
+        self.__galacticPlotCanvas.mpl_connect('pick_event', self.__planetSelect)
+        self.__galacticPlotCanvas.mpl_connect('motion_notify_event', self.__planetHover)
+        self.__galacticPlotCanvas.mpl_connect('button_press_event', self.__dragStart)
+        self.__galacticPlotCanvas.mpl_connect('motion_notify_event', self.__dragMove)
+        self.__galacticPlotCanvas.mpl_connect('button_release_event', self.__dragFinish)
+
+        self.__galacticPlotNavBar: NavigationToolbar = NavigationToolbar(self.__galacticPlotCanvas, self.__galacticPlotWidget)
+        self.__selectionToolActions = addSelectionToolActions(self.__galacticPlotNavBar, self.setSelectionTool)
+        self.__galacticPlotWidget.layout().addWidget(self.__galacticPlotNavBar)
+        self.__galacticPlotWidget.layout().addWidget(self.__galacticPlotCanvas)
+        self.__axes = self.__galacticPlotCanvas.figure.add_subplot(111, aspect = "equal")
+
+    def highlightPlanets(self, planets) -> None:
+        '''Marks planets with a red ring from the next plot on'''
+        self.__highlightedPlanets = [p for p in planets if p is not None and p.x is not None and p.y is not None]
+
     def getWidget(self) -> QWidget:
         '''Returns the plot widget'''
         return self.__galacticPlotWidget
 
+    def __createSelector(self) -> None:
+        '''Attaches the widget of the selection tool to the axes, which lose it when they are cleared'''
+        from matplotlib.widgets import LassoSelector, RectangleSelector
+
+        if self.__selector is not None:
+            self.__selector.set_active(False)
+            self.__selector = None
+
+        if self.__selectionTool == "rectangle":
+            self.__selector = RectangleSelector(self.__axes, self.__rectangleSelect, useblit = True, button = [1])
+        elif self.__selectionTool == "lasso":
+            self.__selector = LassoSelector(self.__axes, self.__lassoSelect, useblit = True, button = [1])
+
+    def __rectangleSelect(self, press, release) -> None:
+        '''Handler for a finished rectangle selection'''
+        from mapTools.regionselection import pointsInRectangle
+
+        xMin, xMax, yMin, yMax = self.__selector.extents
+        self.__regionSelect(pointsInRectangle(self.__planetCoordinates, (xMin, yMin), (xMax, yMax)))
+
+    def __lassoSelect(self, vertices) -> None:
+        '''Handler for a finished lasso selection'''
+        from mapTools.regionselection import pointsInPolygon
+
+        self.__regionSelect(pointsInPolygon(self.__planetCoordinates, vertices))
+
+    def __regionSelect(self, inside) -> None:
+        '''Emits all planets of a region at once. The signal is sent after the selector
+        has finished handling the mouse release, as the new plot replaces the selector'''
+        indexes = inside.nonzero()[0].tolist()
+        deselect = bool(QApplication.keyboardModifiers() & Qt.ControlModifier)
+
+        if indexes:
+            QTimer.singleShot(0, lambda: self.regionSelectedSignal.emit(indexes, deselect))
+
     def __planetSelect(self, event) -> None:
         '''Event handler for selecting a planet on the map'''
+        if self.__selectionTool != "pick":
+            return
+
         planet_index = event.ind
         self.planetSelectedSignal.emit(list(planet_index))
 
+    def __addPlanetLine(self, line, start, end) -> None:
+        '''Records a line between two planets, so it can follow them while they are dragged'''
+        self.__planetLines.setdefault(start, []).append((line, 0))
+        self.__planetLines.setdefault(end, []).append((line, 1))
+
+    def __dragStart(self, event) -> None:
+        '''Starts dragging the planet under the cursor with the move tool. The planet and its lines
+        are taken out of a saved background, so the drag only redraws them'''
+        if self.__selectionTool != "move" or event.button != 1 or event.inaxes != self.__axes or self.__galacticPlotNavBar.mode:
+            return
+
+        contains, ind = self.__planetsScatter.contains(event)
+        if not contains:
+            return
+
+        #the closest of the planets under the cursor
+        screen = self.__axes.transData.transform(self.__planetsScatter.get_offsets()[ind["ind"]])
+        distances = ((screen - (event.x, event.y)) ** 2).sum(axis = 1)
+        self.__dragIndex = int(ind["ind"][distances.argmin()])
+        planet = self.__plottedPlanets[self.__dragIndex]
+        self.__dragPosition = None
+        self.__dragLines = self.__planetLines.get(planet, [])
+
+        self.__dragHidden = [(self.__planetsScatter, self.__dragIndex)]
+        if planet in self.__selectedPlanets:
+            self.__dragHidden.append((self.__selectedScatter, self.__selectedPlanets.index(planet)))
+        if planet in self.__highlightedPlanets:
+            self.__dragHidden.append((self.__highlightScatter, self.__highlightedPlanets.index(planet)))
+        for scatter, index in self.__dragHidden:
+            offsets = scatter.get_offsets().copy()
+            offsets[index] = (float("nan"), float("nan"))
+            scatter.set_offsets(offsets)
+
+        for line, _ in self.__dragLines:
+            line.set_animated(True)
+        self.__annotate.set_visible(False)
+
+        self.__dragMarker, = self.__axes.plot([planet.x], [planet.y], 'o', color = 'b', animated = True)
+        self.__galacticPlotCanvas.draw()
+        self.__dragBackground = self.__galacticPlotCanvas.copy_from_bbox(self.__axes.bbox)
+        self.__drawDragged()
+
+    def __dragMove(self, event) -> None:
+        '''Moves the dragged planet and its lines and blits them over the saved background'''
+        if self.__dragIndex is None or event.inaxes != self.__axes or event.xdata is None:
+            return
+
+        self.__dragPosition = (float(event.xdata), float(event.ydata))
+        x, y = self.__dragPosition
+        self.__dragMarker.set_data([x], [y])
+
+        for line, end in self.__dragLines:
+            xs, ys = list(line.get_xdata()), list(line.get_ydata())
+            xs[end], ys[end] = x, y
+            line.set_data(xs, ys)
+
+        self.__drawDragged()
+
+    def __dragFinish(self, event) -> None:
+        '''Puts a dragged planet back in place and emits its new position if it was moved.
+        The plot of the moved planet follows from the presenter'''
+        if self.__dragIndex is None:
+            return
+
+        index, position = self.__dragIndex, self.__dragPosition
+        planet = self.__plottedPlanets[index]
+        for scatter, hiddenIndex in self.__dragHidden:
+            offsets = scatter.get_offsets().copy()
+            offsets[hiddenIndex] = planet.x, planet.y
+            scatter.set_offsets(offsets)
+
+        for line, end in self.__dragLines:
+            xs, ys = list(line.get_xdata()), list(line.get_ydata())
+            xs[end], ys[end] = planet.x, planet.y
+            line.set_data(xs, ys)
+
+        self.__endDrag()
+        self.__galacticPlotCanvas.draw_idle()
+
+        #sent after matplotlib has finished handling the release, as the new plot clears the axes
+        if position is not None:
+            QTimer.singleShot(0, lambda: self.planetMovedSignal.emit(index, *position))
+
+    def __drawDragged(self) -> None:
+        canvas = self.__galacticPlotCanvas
+        canvas.restore_region(self.__dragBackground)
+        for line, _ in self.__dragLines:
+            self.__axes.draw_artist(line)
+        self.__axes.draw_artist(self.__dragMarker)
+        canvas.blit(self.__axes.bbox)
+
+    def __endDrag(self) -> None:
+        '''Returns the dragged lines to normal drawing and forgets the drag'''
+        for line, _ in self.__dragLines:
+            line.set_animated(False)
+        if self.__dragMarker is not None and self.__dragMarker.axes is not None:
+            self.__dragMarker.remove()
+
+        self.__dragIndex = None
+        self.__dragLines = []
+        self.__dragMarker = None
+        self.__dragBackground = None
+        self.__dragHidden = []
+        self.__dragPosition = None
+
     def __planetHover(self, event) -> None:
         '''Handler for hovering on a planet in the plot'''
+        if self.__dragIndex is not None:
+            return
+
         visible = self.__annotate.get_visible()
 
         if event.inaxes == self.__axes:
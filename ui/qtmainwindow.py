@@ -1,8 +1,9 @@
 from typing import List
 
 from PyQt5 import QtCore
-from PyQt5.QtWidgets import QAction, QPushButton, QCheckBox, QComboBox, QFileDialog, QHeaderView, QLabel, QMainWindow, QMenu, QMenuBar, QDialog, QSplitter, \
-    QTableWidget, QTableWidgetItem, QTabWidget, QVBoxLayout, QWidget
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtWidgets import QAction, QPushButton, QCheckBox, QComboBox, QDockWidget, QFileDialog, QHeaderView, QInputDialog, QLabel, QListWidget, QListWidgetItem, QMainWindow, QMenu, QMenuBar, QMessageBox, QDialog, QProgressBar, QSplitter, \
+    QStatusBar, QTableWidget, QTableWidgetItem, QTabWidget, QVBoxLayout, QWidget
 
 from ui.galacticplot import GalacticPlot
 from ui.mainwindow_presenter import MainWindow, MainWindowPresenter
@@ -62,7 +63,9 @@ class QtMainWindow(MainWindow):
         self.__menuBar: QMenuBar = QMenuBar()
         self.__optionsMenu: QMenu = QMenu("Options", self.__window)
         self.__fileMenu: QMenu = QMenu("File", self.__window)
+        self.__editMenu: QMenu = QMenu("Edit", self.__window)
         self.__addMenu: QMenu = QMenu("New...", self.__window)
+        self.__analysisMenu: QMenu = QMenu("Analysis", self.__window)
 
         self.__openAutoConnectionSettingsAction: QAction = QAction("Auto connection settings", self.__window)
         self.__openAutoConnectionSettingsAction.triggered.connect(self.__showAutoConnectionSettings)
@@ -73,26 +76,67 @@ class QtMainWindow(MainWindow):
         self.__newTradeRouteAction: QAction = QAction("Trade Route...", self.__window)
         self.__newTradeRouteAction.triggered.connect(self.__newTradeRoute)
 
+        self.__generateTradeRoutesAction: QAction = QAction("Trade Routes From Auto Connections", self.__window)
+        self.__generateTradeRoutesAction.triggered.connect(self.__generateTradeRoutes)
+
+        self.__undoAction: QAction = QAction("Undo", self.__window)
+        self.__undoAction.setShortcut(QKeySequence.Undo)
+        self.__undoAction.setEnabled(False)
+        self.__undoAction.triggered.connect(self.__undo)
+
+        self.__redoAction: QAction = QAction("Redo", self.__window)
+        self.__redoAction.setShortcut(QKeySequence.Redo)
+        self.__redoAction.setEnabled(False)
+        self.__redoAction.triggered.connect(self.__redo)
+
+        self.__transformPlanetsAction: QAction = QAction("Transform Planets...", self.__window)
+        self.__transformPlanetsAction.triggered.connect(self.__transformPlanets)
+
+        self.__connectivityAction: QAction = QAction("Campaign Connectivity", self.__window)
+        self.__connectivityAction.triggered.connect(self.__showConnectivity)
+
+        self.__shortestPathAction: QAction = QAction("Shortest Path...", self.__window)
+        self.__shortestPathAction.triggered.connect(self.__showShortestPath)
+
+        self.__planetSpacingAction: QAction = QAction("Planet Spacing...", self.__window)
+        self.__planetSpacingAction.triggered.connect(self.__checkPlanetSpacing)
+
         self.__setDataFolderAction: QAction = QAction("Set Data Folder", self.__window)
         self.__setDataFolderAction.triggered.connect(self.__openFolder)
 
         self.__saveAction: QAction = QAction("Save", self.__window)
         self.__saveAction.triggered.connect(self.__saveFile)
 
+        self.__exportCampaignsAction: QAction = QAction("Export All Campaigns...", self.__window)
+        self.__exportCampaignsAction.triggered.connect(self.__exportCampaigns)
+
         self.__quitAction: QAction = QAction("Quit", self.__window)
         self.__quitAction.triggered.connect(self.__quit)
         
         self.__optionsMenu.addAction(self.__openAutoConnectionSettingsAction)
         
         self.__fileMenu.addAction(self.__saveAction)
+        self.__fileMenu.addAction(self.__exportCampaignsAction)
         self.__fileMenu.addAction(self.__setDataFolderAction)
         self.__fileMenu.addAction(self.__quitAction)
 
+        self.__editMenu.addAction(self.__undoAction)
+        self.__editMenu.addAction(self.__redoAction)
+        self.__editMenu.addSeparator()
+        self.__editMenu.addAction(self.__transformPlanetsAction)
+
         self.__addMenu.addAction(self.__newCampaignAction)
         self.__addMenu.addAction(self.__newTradeRouteAction)
+        self.__addMenu.addAction(self.__generateTradeRoutesAction)
+
+        self.__analysisMenu.addAction(self.__connectivityAction)
+        self.__analysisMenu.addAction(self.__shortestPathAction)
+        self.__analysisMenu.addAction(self.__planetSpacingAction)
         
         self.__menuBar.addMenu(self.__fileMenu)
+        self.__menuBar.addMenu(self.__editMenu)
         self.__menuBar.addMenu(self.__addMenu)
+        self.__menuBar.addMenu(self.__analysisMenu)
         self.__menuBar.addMenu(self.__optionsMenu)
         self.__window.setMenuWidget(self.__menuBar)
 
@@ -120,6 +164,39 @@ class QtMainWindow(MainWindow):
         self.__startingForces.layout().addWidget(self.__planetComboBox)
         self.__startingForces.layout().addWidget(self.__forcesListWidget)
 
+        #Panel listing the campaigns that use the last clicked planet or trade route
+        self.__campaignUsageLabel: QLabel = QLabel("Click a planet or trade route to see the campaigns using it")
+        self.__campaignUsageLabel.setWordWrap(True)
+        self.__campaignUsageListWidget: QListWidget = QListWidget()
+        self.__campaignUsageListWidget.itemDoubleClicked.connect(self.__onCampaignUsageItemDoubleClicked)
+
+        self.__campaignUsage: QWidget = QWidget()
+        self.__campaignUsage.setLayout(QVBoxLayout())
+        self.__campaignUsage.layout().addWidget(self.__campaignUsageLabel)
+        self.__campaignUsage.layout().addWidget(self.__campaignUsageListWidget)
+
+        self.__campaignUsageDock: QDockWidget = QDockWidget("Used By Campaigns", self.__window)
+        self.__campaignUsageDock.setWidget(self.__campaignUsage)
+        self.__window.addDockWidget(QtCore.Qt.RightDockWidgetArea, self.__campaignUsageDock)
+        self.__optionsMenu.addAction(self.__campaignUsageDock.toggleViewAction())
+
+        #Status bar showing data folder loading progress
+        self.__statusBar: QStatusBar = QStatusBar(self.__window)
+        self.__loadingLabel: QLabel = QLabel()
+        self.__loadingProgressBar: QProgressBar = QProgressBar()
+        self.__cancelLoadingButton: QPushButton = QPushButton("Cancel")
+        self.__cancelLoadingButton.clicked.connect(self.__cancelLoading)
+
+        #Status bar showing problems found in the selected campaign
+        self.__validationLabel: QLabel = QLabel()
+
+        self.__statusBar.addWidget(self.__loadingLabel)
+        self.__statusBar.addWidget(self.__validationLabel)
+        self.__statusBar.addPermanentWidget(self.__loadingProgressBar)
+        self.__statusBar.addPermanentWidget(self.__cancelLoadingButton)
+        self.__window.setStatusBar(self.__statusBar)
+        self.hideLoadingProgress()
+
         self.__presenter: MainWindowPresenter = None
 
     def setMainWindowPresenter(self, presenter: MainWindowPresenter) -> None:
@@ -144,9 +221,13 @@ class QtMainWindow(MainWindow):
         '''Add Campaign objects to the campaign combobox widget'''
         self.__campaignComboBox.addItems(campaigns)
 
-    def makeGalacticPlot(self) -> GalacticPlot:
-        '''Plot planets and trade routes'''
-        plot: QtGalacticPlot = QtGalacticPlot(self.__widget)
+    def makeGalacticPlot(self, backend: str) -> GalacticPlot:
+        '''Plot planets and trade routes with matplotlib, or with a QGraphicsScene for the "scene" backend'''
+        if backend == "scene":
+            from ui.qtscenegalacticplot import QtSceneGalacticPlot
+            plot = QtSceneGalacticPlot(self.__widget)
+        else:
+            plot = QtGalacticPlot(self.__widget)
         self.__widget.addWidget(plot.getWidget())
         return plot
 
@@ -165,6 +246,7 @@ class QtMainWindow(MainWindow):
         self.__planetComboBox.clear()
         self.__forcesListWidget.clearContents()
         self.__forcesListWidget.setRowCount(0)
+        self.__campaignUsageListWidget.clear()
 
     def updateCampaignComboBox(self, campaigns: List[str], newCampaign: str) -> None:
         '''Update the campaign combobox'''
@@ -209,6 +291,49 @@ class QtMainWindow(MainWindow):
         '''Helper function to clear traderoute selections from the presenter'''
         self.__uncheckAllTable(self.__tradeRouteListWidget)
 
+    def showLoadingProgress(self, phase: str, current: int, total: int) -> None:
+        '''Shows the loading phase and progress in the status bar. A total of 0 shows a busy indicator'''
+        self.__loadingLabel.setText(phase)
+        self.__loadingProgressBar.setMaximum(total)
+        self.__loadingProgressBar.setValue(current)
+        self.__loadingLabel.setVisible(True)
+        self.__loadingProgressBar.setVisible(True)
+        self.__cancelLoadingButton.setVisible(True)
+
+    def hideLoadingProgress(self) -> None:
+        '''Hides the loading progress widgets'''
+        self.__loadingLabel.setVisible(False)
+        self.__loadingProgressBar.setVisible(False)
+        self.__cancelLoadingButton.setVisible(False)
+
+    def showValidationIssues(self, issues: List[str]) -> None:
+        '''Shows the number of problems in the selected campaign, listing them in the tooltip'''
+        if issues:
+            self.__validationLabel.setText(str(len(issues)) + " problems")
+            self.__validationLabel.setToolTip("\n".join(issues))
+        else:
+            self.__validationLabel.setText("")
+            self.__validationLabel.setToolTip("")
+
+    def updateUndoActions(self, canUndo: bool, canRedo: bool) -> None:
+        '''Enables the undo and redo actions'''
+        self.__undoAction.setEnabled(canUndo)
+        self.__redoAction.setEnabled(canRedo)
+
+    def showReport(self, title: str, text: str) -> None:
+        '''Shows a text report in a message box'''
+        QMessageBox.information(self.__window, title, text)
+
+    def showCampaignUsage(self, name: str, campaigns: List[str]) -> None:
+        '''Lists the campaigns that use a planet or trade route in the campaign usage panel'''
+        if campaigns:
+            self.__campaignUsageLabel.setText("{} is used by {} campaign{}, double click one to open it".format(name, len(campaigns), "" if len(campaigns) == 1 else "s"))
+        else:
+            self.__campaignUsageLabel.setText(name + " is not used by any campaign")
+
+        self.__campaignUsageListWidget.clear()
+        self.__campaignUsageListWidget.addItems(campaigns)
+
     def __addEntriesToTableWidget(self, widget: QTableWidget, entries: List[str]) -> None:
         '''Adds a list of rows to a table widget'''
         for entry in entries:
@@ -230,6 +355,11 @@ class QtMainWindow(MainWindow):
     def __showAutoConnectionSettings(self):
         self.__presenter.autoConnectionSettingsCommand.execute()
 
+    def __onCampaignUsageItemDoubleClicked(self, item: QListWidgetItem) -> None:
+        '''Opens a campaign listed in the campaign usage panel'''
+        if self.__presenter is not None:
+            self.__presenter.selectCampaignByName(item.text())
+
     def __showPlanetContextMenu(self, position) -> None:
         self.__presenter.planetContextMenu.show(self.__planetListWidget.itemAt(position), self.__planetListWidget.mapToGlobal(position))
 
@@ -253,17 +383,80 @@ class QtMainWindow(MainWindow):
         if folderName:
             self.__presenter.onDataFolderChanged(folderName)
 
+    def __cancelLoading(self) -> None:
+        '''Cancels loading the data folder'''
+        if self.__presenter is not None:
+            self.__presenter.cancelRepositoryLoad()
+
     def __newTradeRoute(self) -> None:
         '''Helper function to launch the new trade route dialog'''
         if self.__presenter is not None:
             self.__presenter.newTradeRouteCommand.execute()
 
+    def __generateTradeRoutes(self) -> None:
+        '''Helper function to create trade routes from the auto connections'''
+        if self.__presenter is not None:
+            self.__presenter.onGenerateTradeRoutes()
+
+    def __undo(self) -> None:
+        '''Reverts the last edit'''
+        if self.__presenter is not None:
+            self.__presenter.undo()
+
+    def __redo(self) -> None:
+        '''Repeats the last reverted edit'''
+        if self.__presenter is not None:
+            self.__presenter.redo()
+
+    def __transformPlanets(self) -> None:
+        '''Helper function to launch the dialog moving all planets of the selected campaign'''
+        if self.__presenter is not None:
+            self.__presenter.planetTransformCommand.execute()
+
+    def __showConnectivity(self) -> None:
+        '''Shows the connectivity of the selected campaign'''
+        if self.__presenter is not None:
+            self.__presenter.onShowConnectivity()
+
+    def __showShortestPath(self) -> None:
+        '''Asks for two planets of the selected campaign and shows the shortest path between them'''
+        if self.__presenter is None:
+            return
+
+        planets = self.__presenter.checkedPlanetNames
+        if len(planets) < 2:
+            return
+
+        start, ok = QInputDialog.getItem(self.__widget, "Shortest Path", "From:", planets, 0, False)
+        if not ok:
+            return
+
+        end, ok = QInputDialog.getItem(self.__widget, "Shortest Path", "To:", planets, 1, False)
+        if ok:
+            self.__presenter.onShowShortestPath(start, end)
+
+    def __checkPlanetSpacing(self) -> None:
+        '''Asks for a minimum distance and shows the planets closer to each other than that'''
+        if self.__presenter is None:
+            return
+
+        spacing, ok = QInputDialog.getDouble(self.__widget, "Planet Spacing", "Minimum distance between planets:",
+            self.__presenter.config.minimumPlanetSpacing, 0.01, 1000000, 2)
+        if ok:
+            self.__presenter.onCheckPlanetSpacing(spacing)
+
     def __saveFile(self) -> None:    
         '''Save file dialog'''
         fileName, _ = QFileDialog.getSaveFileName(self.__widget,"Save Galactic Conquest","","XML Files (*.xml);;All Files (*)")
         if fileName:
             self.__presenter.saveFile(fileName)
 
+    def __exportCampaigns(self) -> None:
+        '''Export folder dialog for all modified campaigns'''
+        folderName = QFileDialog.getExistingDirectory(self.__widget, 'Export modified campaigns to:', "", QFileDialog.ShowDirsOnly)
+        if folderName:
+            self.__presenter.exportCampaigns(folderName)
+
     def __quit(self) -> None:
         '''Exits application by closing the window'''
         self.__window.close()
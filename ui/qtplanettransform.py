@@ -0,0 +1,81 @@
+from PyQt5.QtWidgets import QDialog, QHBoxLayout, QVBoxLayout, QFormLayout, QPushButton, QLineEdit
+
+from gameObjects.gameObjectRepository import GameObjectRepository
+from mapTools.planettransform import PlanetTransform
+from ui.dialogs import Dialog, DialogResult
+
+class QtPlanetTransform(Dialog):
+    '''Class for a "Transform planets" dialog box'''
+    def __init__(self, repository: GameObjectRepository):
+        self.__dialog: QDialog = QDialog()
+        self.__layout: QVBoxLayout = QVBoxLayout()
+        self.__formLayout: QFormLayout = QFormLayout()
+        self.__buttonLayout: QHBoxLayout = QHBoxLayout()
+
+        self.__inputDx: QLineEdit = QLineEdit("0", self.__dialog)
+        self.__inputDy: QLineEdit = QLineEdit("0", self.__dialog)
+        self.__inputScale: QLineEdit = QLineEdit("1", self.__dialog)
+        self.__inputRotation: QLineEdit = QLineEdit("0", self.__dialog)
+        self.__inputPivotX: QLineEdit = QLineEdit(self.__dialog)
+        self.__inputPivotY: QLineEdit = QLineEdit(self.__dialog)
+        self.__inputPivotX.setPlaceholderText("centre of the planets")
+        self.__inputPivotY.setPlaceholderText("centre of the planets")
+        self.__inputGridSpacing: QLineEdit = QLineEdit("0", self.__dialog)
+
+        self.__okayButton: QPushButton = QPushButton("OK")
+        self.__okayButton.clicked.connect(self.__okayClicked)
+
+        self.__cancelButton: QPushButton = QPushButton("Cancel")
+        self.__cancelButton.clicked.connect(self.__cancelClicked)
+
+        self.__formLayout.addRow("Move X by:", self.__inputDx)
+        self.__formLayout.addRow("Move Y by:", self.__inputDy)
+        self.__formLayout.addRow("Scale:", self.__inputScale)
+        self.__formLayout.addRow("Rotate degrees:", self.__inputRotation)
+        self.__formLayout.addRow("Pivot X:", self.__inputPivotX)
+        self.__formLayout.addRow("Pivot Y:", self.__inputPivotY)
+        self.__formLayout.addRow("Snap to grid spacing (0 for none):", self.__inputGridSpacing)
+
+        self.__buttonLayout.addWidget(self.__okayButton)
+        self.__buttonLayout.addWidget(self.__cancelButton)
+
+        self.__layout.addLayout(self.__formLayout)
+        self.__layout.addLayout(self.__buttonLayout)
+
+        self.__dialog.setWindowTitle("Transform Planets")
+        self.__dialog.setLayout(self.__layout)
+
+        self.__result = DialogResult.Cancel
+
+        self.__repository = repository
+
+        self.__transform: PlanetTransform = None
+
+    def show(self) -> DialogResult:
+        '''Display dialog modally'''
+        self.__dialog.exec()
+        return self.__result
+
+    def getTransform(self) -> PlanetTransform:
+        '''Returns the transform to apply to the planets'''
+        return self.__transform
+
+    def __okayClicked(self) -> None:
+        '''Okay button handler. Performs minor error checking'''
+        try:
+            pivot = None
+            if self.__inputPivotX.text().strip() or self.__inputPivotY.text().strip():
+                pivot = (float(self.__inputPivotX.text()), float(self.__inputPivotY.text()))
+
+            self.__transform = PlanetTransform(float(self.__inputDx.text()), float(self.__inputDy.text()),
+                float(self.__inputScale.text()), float(self.__inputRotation.text()), pivot, float(self.__inputGridSpacing.text()))
+        except ValueError:
+            print("Error! Wrong transform format, enter numbers and both pivot coordinates or none")
+            return
+
+        self.__result = DialogResult.Ok
+        self.__dialog.close()
+
+    def __cancelClicked(self) -> None:
+        '''Cancel button handler. Closes dialog box'''
+        self.__dialog.close()
@@ -0,0 +1,109 @@
+from typing import Iterable, List
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from gameObjects.gameObjectRepository import GameObjectRepository
+from RepositoryCreator import RepositoryCreator, RepositoryLoadCancelled
+
+
+class QtRepositoryLoadThread(QThread):
+    '''Worker thread running RepositoryCreator.constructRepository for one data folder and its base folders'''
+    progressSignal = pyqtSignal(str, int, int)
+    loadedSignal = pyqtSignal(object)
+    cancelledSignal = pyqtSignal()
+    failedSignal = pyqtSignal(str)
+
+    def __init__(self, folder: str, baseFolders: Iterable[str] = ()):
+        super(QtRepositoryLoadThread, self).__init__()
+        self.__folder: str = folder
+        self.__baseFolders: List[str] = list(baseFolders)
+        self.__repositoryCreator: RepositoryCreator = RepositoryCreator()
+        self.__repositoryCreator.progressCallback = self.progressSignal.emit
+
+    def run(self) -> None:
+        '''Constructs the repository and emits the result'''
+        try:
+            repository: GameObjectRepository = self.__repositoryCreator.constructRepository(self.__folder, self.__baseFolders)
+        except RepositoryLoadCancelled:
+            self.cancelledSignal.emit()
+            return
+        except Exception as error:
+            self.failedSignal.emit(str(error))
+            return
+
+        self.loadedSignal.emit(repository)
+
+    def cancel(self) -> None:
+        '''Stops the load at the next file or phase'''
+        self.__repositoryCreator.cancel()
+
+
+class QtRepositoryLoader(QObject):
+    '''RepositoryLoader that constructs repositories on a QThread. Signals are delivered on the GUI thread.
+    Starting a new load cancels the running one and drops its results'''
+    progressSignal = pyqtSignal(str, int, int)
+    loadedSignal = pyqtSignal(object)
+    cancelledSignal = pyqtSignal()
+    failedSignal = pyqtSignal(str)
+
+    def __init__(self):
+        super(QtRepositoryLoader, self).__init__()
+        self.__thread: QtRepositoryLoadThread = None
+        self.__finishedThreads = []
+
+    def load(self, folder: str, baseFolders: Iterable[str] = ()) -> None:
+        '''Starts loading the data folder, on top of the base folders, in the background'''
+        self.__stopCurrentThread()
+
+        thread = QtRepositoryLoadThread(folder, baseFolders)
+        thread.progressSignal.connect(lambda phase, current, total: self.__onProgress(thread, phase, current, total))
+        thread.loadedSignal.connect(lambda repository: self.__onLoaded(thread, repository))
+        thread.cancelledSignal.connect(lambda: self.__onCancelled(thread))
+        thread.failedSignal.connect(lambda message: self.__onFailed(thread, message))
+        thread.finished.connect(lambda: self.__onThreadFinished(thread))
+
+        self.__thread = thread
+        thread.start()
+
+    def cancel(self) -> None:
+        '''Cancels the running load, if any'''
+        if self.__thread is not None:
+            self.__thread.cancel()
+
+    def isLoading(self) -> bool:
+        '''Returns true while a load is running'''
+        return self.__thread is not None
+
+    def __stopCurrentThread(self) -> None:
+        '''Cancels the current thread and keeps it alive until it has finished'''
+        if self.__thread is not None:
+            self.__thread.cancel()
+            self.__finishedThreads.append(self.__thread)
+            self.__thread = None
+
+    def __onProgress(self, thread: QtRepositoryLoadThread, phase: str, current: int, total: int) -> None:
+        if thread is self.__thread:
+            self.progressSignal.emit(phase, current, total)
+
+    def __onLoaded(self, thread: QtRepositoryLoadThread, repository: GameObjectRepository) -> None:
+        if thread is self.__thread:
+            self.__thread = None
+            self.__finishedThreads.append(thread)
+            self.loadedSignal.emit(repository)
+
+    def __onCancelled(self, thread: QtRepositoryLoadThread) -> None:
+        if thread is self.__thread:
+            self.__thread = None
+            self.__finishedThreads.append(thread)
+            self.cancelledSignal.emit()
+
+    def __onFailed(self, thread: QtRepositoryLoadThread, message: str) -> None:
+        if thread is self.__thread:
+            self.__thread = None
+            self.__finishedThreads.append(thread)
+            self.failedSignal.emit(message)
+
+    def __onThreadFinished(self, thread: QtRepositoryLoadThread) -> None:
+        '''Releases the thread object once Qt is done with it'''
+        if thread in self.__finishedThreads:
+            self.__finishedThreads.remove(thread)
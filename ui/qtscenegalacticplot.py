@@ -0,0 +1,421 @@
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+from PyQt5.QtCore import QPoint, QPointF, QRect, QRectF, Qt, pyqtSignal
+from PyQt5.QtGui import QBrush, QColor, QPainter, QPainterPath, QPen, QPolygonF
+from PyQt5.QtWidgets import QApplication, QGraphicsEllipseItem, QGraphicsItem, QGraphicsLineItem, QGraphicsPathItem, \
+    QGraphicsScene, QGraphicsView, QToolBar, QVBoxLayout, QWidget
+
+from gameObjects.planet import Planet
+from gameObjects.traderoute import TradeRoute
+from ui.galacticplot import GalacticPlot
+from ui.qtgalacticplot import QtGalacticPlotMeta
+from ui.qtselectiontools import addSelectionToolActions
+
+PLANET_RADIUS = 4
+PICK_RADIUS = 5
+
+#drawing order, later values are drawn on top
+AUTO_CONNECTION_Z = 0
+TRADE_ROUTE_Z = 1
+PLANET_Z = 2
+SELECTED_PLANET_Z = 3
+REGION_Z = 4
+
+#item data key holding the index of a planet in the allPlanets list
+PLANET_INDEX = 0
+
+
+class GalaxyView(QGraphicsView):
+    '''View of the galaxy scene. Dragging pans, the mouse wheel zooms around the cursor
+    and a click that does not move emits clickedSignal with the viewport position.
+    With the rectangle or lasso tool dragging draws a region instead, emitted as a
+    polygon in scene coordinates with regionSignal when the mouse is released.
+    With the move tool a drag is reported with dragStartedSignal at the viewport
+    position, then dragMovedSignal and dragFinishedSignal in scene coordinates'''
+    clickedSignal = pyqtSignal(QPoint)
+    regionSignal = pyqtSignal(QPolygonF)
+    dragStartedSignal = pyqtSignal(QPoint)
+    dragMovedSignal = pyqtSignal(QPointF)
+    dragFinishedSignal = pyqtSignal(QPointF)
+
+    def __init__(self, scene: QGraphicsScene):
+        super(GalaxyView, self).__init__(scene)
+        self.setRenderHint(QPainter.Antialiasing)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
+
+        self.__pressPosition: QPoint = None
+        self.__selectionTool: str = "pick"
+        self.__region: QPolygonF = None
+        self.__regionItem: QGraphicsPathItem = None
+        self.__dragging: bool = False
+
+        #the scene is fitted to the view until the user pans or zooms
+        self.__followScene: bool = True
+
+    def fitScene(self) -> None:
+        '''Shows all items and fits them again when the view is resized, until the user pans or zooms'''
+        self.__followScene = True
+        self.__fit()
+
+    def setSelectionTool(self, tool: str) -> None:
+        '''Sets the "pick", "rectangle", "lasso" or "move" tool'''
+        self.__selectionTool = tool
+        self.setDragMode(QGraphicsView.ScrollHandDrag if tool == "pick" else QGraphicsView.NoDrag)
+
+    def wheelEvent(self, event) -> None:
+        self.__followScene = False
+        factor = 1.15 ** (event.angleDelta().y() / 120.0)
+        self.scale(factor, factor)
+
+    def mousePressEvent(self, event) -> None:
+        if self.__selectionTool == "move" and event.button() == Qt.LeftButton:
+            self.__dragging = True
+            self.dragStartedSignal.emit(event.pos())
+            return
+
+        if self.__selectionTool in ("rectangle", "lasso") and event.button() == Qt.LeftButton:
+            self.__region = QPolygonF([self.mapToScene(event.pos())])
+            self.__regionItem = QGraphicsPathItem()
+            pen = QPen(Qt.black, 1, Qt.DashLine)
+            pen.setCosmetic(True)
+            self.__regionItem.setPen(pen)
+            self.__regionItem.setZValue(REGION_Z)
+            self.scene().addItem(self.__regionItem)
+            return
+
+        self.__pressPosition = event.pos()
+        super(GalaxyView, self).mousePressEvent(event)
+
+    def mouseMoveEvent(self, event) -> None:
+        if self.__dragging:
+            self.dragMovedSignal.emit(self.mapToScene(event.pos()))
+            return
+
+        if self.__region is None:
+            super(GalaxyView, self).mouseMoveEvent(event)
+            return
+
+        position = self.mapToScene(event.pos())
+        if self.__selectionTool == "rectangle":
+            self.__region = QPolygonF(QRectF(self.__region[0], position).normalized())
+        else:
+            self.__region.append(position)
+
+        path = QPainterPath()
+        path.addPolygon(self.__region)
+        path.closeSubpath()
+        self.__regionItem.setPath(path)
+
+    def mouseReleaseEvent(self, event) -> None:
+        if self.__dragging and event.button() == Qt.LeftButton:
+            self.__dragging = False
+            self.dragFinishedSignal.emit(self.mapToScene(event.pos()))
+            return
+
+        if self.__region is not None:
+            region = self.__region
+            self.scene().removeItem(self.__regionItem)
+            self.__region = None
+            self.__regionItem = None
+            self.regionSignal.emit(region)
+            return
+
+        super(GalaxyView, self).mouseReleaseEvent(event)
+
+        if self.__pressPosition is None:
+            return
+
+        moved = (event.pos() - self.__pressPosition).manhattanLength()
+        self.__pressPosition = None
+
+        if moved < QApplication.startDragDistance():
+            if event.button() == Qt.LeftButton:
+                self.clickedSignal.emit(event.pos())
+        else:
+            self.__followScene = False
+
+    def resizeEvent(self, event) -> None:
+        super(GalaxyView, self).resizeEvent(event)
+        if self.__followScene:
+            self.__fit()
+
+    def __fit(self) -> None:
+        rect = self.scene().itemsBoundingRect()
+        if rect.isEmpty():
+            return
+
+        margin = 0.05 * max(rect.width(), rect.height())
+        self.fitInView(rect.adjusted(-margin, -margin, margin, margin), Qt.KeepAspectRatio)
+
+
+class QtSceneGalacticPlot(QWidget, GalacticPlot, metaclass = QtGalacticPlotMeta):
+    '''Galaxy plot on a QGraphicsScene, a replacement for the matplotlib QtGalacticPlot.
+    Every planet, trade route and auto connection is an item of its own. A new plot only
+    adds, removes or changes the items that differ from the last plot, so Qt repaints just
+    the areas of those items. Picking and the hover labels use the BSP index of the scene'''
+    #signal to send to main window presenter when a planet is selected in the plot
+    planetSelectedSignal = pyqtSignal(list)
+    #signal with the planets inside a rectangle or lasso and whether to deselect them
+    regionSelectedSignal = pyqtSignal(list, bool)
+    #signal with the index and new coordinates of a planet dragged with the move tool
+    planetMovedSignal = pyqtSignal(int, float, float)
+
+    def __init__(self, parent: QWidget = None):
+        super(QtSceneGalacticPlot, self).__init__()
+        self.__galacticPlotWidget: QWidget = QWidget(parent)
+        self.__galacticPlotWidget.setLayout(QVBoxLayout())
+
+        self.__scene: QGraphicsScene = QGraphicsScene()
+        self.__scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+
+        self.__view: GalaxyView = GalaxyView(self.__scene)
+        self.__view.clickedSignal.connect(self.__planetSelect)
+        self.__view.regionSignal.connect(self.__regionSelect)
+        self.__view.dragStartedSignal.connect(self.__dragStart)
+        self.__view.dragMovedSignal.connect(self.__dragMove)
+        self.__view.dragFinishedSignal.connect(self.__dragFinish)
+
+        self.__toolBar: QToolBar = QToolBar()
+        self.__selectionToolActions = addSelectionToolActions(self.__toolBar, self.__view.setSelectionTool)
+        self.__galacticPlotWidget.layout().addWidget(self.__toolBar)
+        self.__galacticPlotWidget.layout().addWidget(self.__view)
+
+        planetColour = QColor(Qt.blue)
+        backgroundColour = QColor(Qt.blue)
+        backgroundColour.setAlphaF(0.1)
+        self.__selectedBrush: QBrush = QBrush(planetColour)
+        self.__unselectedBrush: QBrush = QBrush(backgroundColour)
+
+        self.__tradeRoutePen: QPen = self.__linePen(0.4)
+        self.__highlightPen: QPen = QPen(QColor(Qt.red), 2)
+        self.__highlightPen.setCosmetic(True)
+        self.__autoConnectionPen: QPen = self.__linePen(0.1)
+
+        self.__planetItems: Dict[Planet, QGraphicsEllipseItem] = dict()
+        self.__planetPositions: Dict[Planet, Tuple[float, float]] = dict()
+        self.__selectedPlanets: Set[Planet] = set()
+        #planets to highlight and the ones whose items show it
+        self.__highlightedPlanets: Set[Planet] = set()
+        self.__shownHighlights: Set[Planet] = set()
+        self.__tradeRouteItems: Dict[TradeRoute, QGraphicsLineItem] = dict()
+        self.__autoConnectionItems: Dict[FrozenSet[Planet], QGraphicsLineItem] = dict()
+        self.__allPlanets: List[Planet] = list()
+
+        #the planet dragged with the move tool and the lines at it with the planet at their other end
+        self.__draggedPlanet: Planet = None
+        self.__dragLines: List[Tuple[QGraphicsLineItem, Planet]] = list()
+        self.__dragMoved: bool = False
+
+    def plotGalaxy(self, planets, tradeRoutes, allPlanets, autoPlanetConnectionDistance: int = 0) -> None:
+        '''Shows all planets faded and the selected planets, their trade routes
+        and auto connections on top, changing only the items that differ from the last plot'''
+        planets = {p for p in planets if self.__hasPosition(p)}
+        self.__allPlanets = list(allPlanets)
+        planetsChanged = self.__updatePlanets(self.__allPlanets, planets)
+        self.__updateSelection(planets)
+        self.__updateHighlights()
+        self.__updateTradeRoutes({t for t in tradeRoutes if self.__hasPosition(t.start) and self.__hasPosition(t.end)})
+        self.__updateAutoConnections(planets, autoPlanetConnectionDistance)
+
+        if planetsChanged:
+            self.__view.fitScene()
+
+    def highlightPlanets(self, planets) -> None:
+        '''Outlines planets in red from the next plot on'''
+        self.__highlightedPlanets = {p for p in planets if self.__hasPosition(p)}
+
+    def getWidget(self) -> QWidget:
+        '''Returns the plot widget'''
+        return self.__galacticPlotWidget
+
+    def __updatePlanets(self, allPlanets: List[Planet], selectedPlanets: Set[Planet]) -> bool:
+        '''Adds, removes and moves planet items. Returns true if planets were added or removed'''
+        shownPlanets = {p for p in allPlanets if self.__hasPosition(p)} | selectedPlanets
+        changed = False
+
+        for planet in set(self.__planetItems) - shownPlanets:
+            self.__scene.removeItem(self.__planetItems.pop(planet))
+            del self.__planetPositions[planet]
+            self.__selectedPlanets.discard(planet)
+            self.__shownHighlights.discard(planet)
+            changed = True
+
+        for planet in shownPlanets:
+            item = self.__planetItems.get(planet)
+            if item is None:
+                item = QGraphicsEllipseItem(-PLANET_RADIUS, -PLANET_RADIUS, 2 * PLANET_RADIUS, 2 * PLANET_RADIUS)
+                item.setFlag(QGraphicsItem.ItemIgnoresTransformations)
+                item.setPen(QPen(Qt.NoPen))
+                item.setBrush(self.__unselectedBrush)
+                item.setZValue(PLANET_Z)
+                item.setToolTip(planet.name)
+                self.__scene.addItem(item)
+                self.__planetItems[planet] = item
+                changed = True
+
+            position = (planet.x, planet.y)
+            if self.__planetPositions.get(planet) != position:
+                item.setPos(planet.x, -planet.y)
+                self.__planetPositions[planet] = position
+
+            item.setData(PLANET_INDEX, None)
+
+        for index, planet in enumerate(allPlanets):
+            item = self.__planetItems.get(planet)
+            if item is not None:
+                item.setData(PLANET_INDEX, index)
+
+        return changed
+
+    def __updateSelection(self, planets: Set[Planet]) -> None:
+        '''Restyles the planets whose selection changed'''
+        for planet in self.__selectedPlanets - planets:
+            item = self.__planetItems[planet]
+            item.setBrush(self.__unselectedBrush)
+            item.setZValue(PLANET_Z)
+
+        for planet in planets - self.__selectedPlanets:
+            item = self.__planetItems[planet]
+            item.setBrush(self.__selectedBrush)
+            item.setZValue(SELECTED_PLANET_Z)
+
+        self.__selectedPlanets = set(planets)
+
+    def __updateHighlights(self) -> None:
+        '''Outlines the planets whose highlight changed'''
+        highlighted = {p for p in self.__highlightedPlanets if p in self.__planetItems}
+
+        for planet in self.__shownHighlights - highlighted:
+            self.__planetItems[planet].setPen(QPen(Qt.NoPen))
+
+        for planet in highlighted - self.__shownHighlights:
+            self.__planetItems[planet].setPen(self.__highlightPen)
+
+        self.__shownHighlights = highlighted
+
+    def __updateTradeRoutes(self, tradeRoutes: Set[TradeRoute]) -> None:
+        '''Adds and removes trade route lines and follows moved planets'''
+        for tradeRoute in set(self.__tradeRouteItems) - tradeRoutes:
+            self.__scene.removeItem(self.__tradeRouteItems.pop(tradeRoute))
+
+        for tradeRoute in tradeRoutes:
+            item = self.__tradeRouteItems.get(tradeRoute)
+            if item is None:
+                item = self.__addLine(self.__tradeRoutePen, TRADE_ROUTE_Z)
+                self.__tradeRouteItems[tradeRoute] = item
+
+            self.__placeLine(item, tradeRoute.start, tradeRoute.end)
+
+    def __updateAutoConnections(self, planets: Set[Planet], distance: int) -> None:
+        '''Adds and removes lines between selected planets closer than distance'''
+        connections: Set[FrozenSet[Planet]] = set()
+
+        if distance > 0 and len(planets) > 1:
+            import numpy as np
+            from mapTools.spatialgrid import SpatialGrid
+
+            planetList = list(planets)
+            coordinates = np.array([(p.x, p.y) for p in planetList], dtype = float)
+            first, second, _ = SpatialGrid(coordinates, distance).pairsWithin(distance)
+            connections = {frozenset((planetList[i], planetList[j])) for i, j in zip(first.tolist(), second.tolist())}
+
+        for connection in set(self.__autoConnectionItems) - connections:
+            self.__scene.removeItem(self.__autoConnectionItems.pop(connection))
+
+        for connection in connections:
+            item = self.__autoConnectionItems.get(connection)
+            if item is None:
+                item = self.__addLine(self.__autoConnectionPen, AUTO_CONNECTION_Z)
+                self.__autoConnectionItems[connection] = item
+
+            self.__placeLine(item, *connection)
+
+    def __addLine(self, pen: QPen, z: int) -> QGraphicsLineItem:
+        item = QGraphicsLineItem()
+        item.setPen(pen)
+        item.setZValue(z)
+        self.__scene.addItem(item)
+        return item
+
+    def __placeLine(self, item: QGraphicsLineItem, start: Planet, end: Planet) -> None:
+        '''Moves a line to connect two planets if it does not already'''
+        line = item.line()
+        if (line.x1(), -line.y1(), line.x2(), -line.y2()) != (start.x, start.y, end.x, end.y):
+            item.setLine(start.x, -start.y, end.x, -end.y)
+
+    def __linePen(self, alpha: float) -> QPen:
+        '''Returns a black pen that keeps its width when zooming'''
+        colour = QColor(Qt.black)
+        colour.setAlphaF(alpha)
+        pen = QPen(colour)
+        pen.setCosmetic(True)
+        return pen
+
+    def __hasPosition(self, planet: Planet) -> bool:
+        return planet is not None and planet.x is not None and planet.y is not None
+
+    def __planetSelect(self, position: QPoint) -> None:
+        '''Emits the indexes of all planets close to a clicked position'''
+        area = QRect(position.x() - PICK_RADIUS, position.y() - PICK_RADIUS, 2 * PICK_RADIUS + 1, 2 * PICK_RADIUS + 1)
+        indexes = sorted(index for index in (item.data(PLANET_INDEX) for item in self.__view.items(area)) if index is not None)
+
+        if indexes:
+            self.planetSelectedSignal.emit(indexes)
+
+    def __dragStart(self, position: QPoint) -> None:
+        '''Picks up the planet closest to the pressed position, together with its lines'''
+        area = QRect(position.x() - PICK_RADIUS, position.y() - PICK_RADIUS, 2 * PICK_RADIUS + 1, 2 * PICK_RADIUS + 1)
+        items = [item for item in self.__view.items(area) if item.data(PLANET_INDEX) is not None]
+        if not items:
+            return
+
+        item = min(items, key = lambda item: (self.__view.mapFromScene(item.pos()) - position).manhattanLength())
+        planet = self.__allPlanets[item.data(PLANET_INDEX)]
+        self.__draggedPlanet = planet
+        self.__dragMoved = False
+        self.__dragLines = [(item, t.end if t.start == planet else t.start)
+            for t, item in self.__tradeRouteItems.items() if planet in (t.start, t.end)]
+        self.__dragLines += [(item, next(iter(connection - {planet})))
+            for connection, item in self.__autoConnectionItems.items() if planet in connection]
+
+    def __dragMove(self, position: QPointF) -> None:
+        '''Moves the dragged planet item and its lines, the scene repaints only their areas'''
+        if self.__draggedPlanet is None:
+            return
+
+        self.__dragMoved = True
+        self.__planetItems[self.__draggedPlanet].setPos(position)
+        for item, other in self.__dragLines:
+            item.setLine(position.x(), position.y(), other.x, -other.y)
+
+    def __dragFinish(self, position: QPointF) -> None:
+        '''Puts the dragged planet back in place and emits its new position if it was moved.
+        The next plot moves the planet'''
+        planet, lines, moved = self.__draggedPlanet, self.__dragLines, self.__dragMoved
+        self.__draggedPlanet = None
+        self.__dragLines = list()
+        if planet is None:
+            return
+
+        item = self.__planetItems[planet]
+        item.setPos(planet.x, -planet.y)
+        for line, other in lines:
+            line.setLine(planet.x, -planet.y, other.x, -other.y)
+
+        if moved:
+            self.planetMovedSignal.emit(item.data(PLANET_INDEX), position.x(), -position.y())
+
+    def __regionSelect(self, region: QPolygonF) -> None:
+        '''Emits all planets inside a rectangle or lasso at once'''
+        import numpy as np
+        from mapTools.regionselection import pointsInPolygon
+
+        #scene y points down
+        coordinates = np.array([(p.x, p.y) if self.__hasPosition(p) else (np.nan, np.nan) for p in self.__allPlanets], dtype = float)
+        vertices = [(point.x(), -point.y()) for point in region]
+
+        indexes = pointsInPolygon(coordinates, vertices).nonzero()[0].tolist()
+        if indexes:
+            self.regionSelectedSignal.emit(indexes, bool(QApplication.keyboardModifiers() & Qt.ControlModifier))
@@ -0,0 +1,25 @@
+from typing import Callable
+
+from PyQt5.QtWidgets import QAction, QActionGroup, QToolBar
+
+#selection tools of the galaxy plots and their action texts
+SELECTION_TOOLS = (("pick", "Pick"), ("rectangle", "Rectangle Select"), ("lasso", "Lasso Select"), ("move", "Move Planets"))
+
+
+def addSelectionToolActions(toolBar: QToolBar, onToolChanged: Callable[[str], None]) -> QActionGroup:
+    '''Adds exclusive actions for the selection tools to a toolbar, with pick checked.
+    onToolChanged is called with the name of the tool when another one is chosen'''
+    group = QActionGroup(toolBar)
+    group.setExclusive(True)
+    toolBar.addSeparator()
+
+    for tool, text in SELECTION_TOOLS:
+        action = QAction(text, toolBar)
+        action.setCheckable(True)
+        action.setChecked(tool == "pick")
+        action.setToolTip(text + (", hold Ctrl to deselect" if tool in ("rectangle", "lasso") else ""))
+        action.triggered.connect(lambda checked, tool = tool: onToolChanged(tool))
+        group.addAction(action)
+        toolBar.addAction(action)
+
+    return group
@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from typing import Iterable
+
+
+class RepositoryLoader(ABC):
+    '''Constructs a repository from a data folder, on top of optional base data folders,
+    without blocking the caller.
+    Implementations provide progressSignal(phase, current, total), loadedSignal(repository),
+    cancelledSignal() and failedSignal(message)'''
+
+    @abstractmethod
+    def load(self, folder: str, baseFolders: Iterable[str] = ()) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def cancel(self) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def isLoading(self) -> bool:
+        raise NotImplementedError()
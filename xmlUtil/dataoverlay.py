@@ -0,0 +1,232 @@
+'''Data folders layered on top of each other.
+
+A mod usually only ships the XML files it changes and inherits the rest from
+the base game. A DataOverlay takes the Data folders in load order, base game
+first and the mod last, and reads every file from the last folder providing it.
+File names are matched ignoring case, like the game does. Within a folder
+loose files override the MEG archives listed in its MegaFiles.xml, later
+archives override earlier ones.
+
+Files that come from a lower folder are parsed through a ParsedFileCache that
+is shared by all overlays of the session, so opening several mods on top of the
+same base game parses the base game files once. The cache keeps the most recently
+used files up to a fixed number.
+'''
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import lxml.etree as et
+
+from xmlUtil.megarchive import MegArchive, MegFormatError, archivePath, parseDataFile, sharedArchives, splitArchivePath
+from xmlUtil.xmlreader import XMLReader
+
+
+class ParsedFileCache:
+    '''Parsed XML files kept between loads. A file is parsed again once its size or
+    modification time changes. Beyond maximumFiles the least recently used tree is dropped.
+    Cached trees are shared and must not be modified'''
+    def __init__(self, maximumFiles: int = 256):
+        self.__trees: Dict[str, Tuple[Tuple[int, int], object]] = OrderedDict()
+        self.__maximumFiles: int = maximumFiles
+        self.__lock = threading.Lock()
+
+    def parse(self, path: str):
+        '''Returns the parsed tree of a loose file or a file inside an archive,
+        parsing it only if it is not cached or changed'''
+        archive, _ = splitArchivePath(path)
+        stat = os.stat(path if archive is None else archive)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        with self.__lock:
+            entry = self.__trees.get(path)
+            if entry is not None and entry[0] == version:
+                self.__trees.move_to_end(path)
+                return entry[1]
+
+        tree = parseDataFile(path)
+        with self.__lock:
+            self.__trees[path] = (version, tree)
+            self.__trees.move_to_end(path)
+            while len(self.__trees) > self.__maximumFiles:
+                self.__trees.popitem(last = False)
+
+        return tree
+
+    def clear(self) -> None:
+        '''Drops all cached trees'''
+        with self.__lock:
+            self.__trees.clear()
+
+    def __len__(self) -> int:
+        return len(self.__trees)
+
+
+#shared by every overlay that is not given its own cache
+sharedFileCache = ParsedFileCache()
+
+
+class DataOverlay:
+    '''Resolves XML files over Data folders in load order, the last folder wins'''
+    def __init__(self, folders: List[str], fileCache: ParsedFileCache = None):
+        if not folders:
+            raise ValueError("A data overlay needs at least one folder")
+
+        self.__folders: List[str] = list(folders)
+        self.__fileCache: ParsedFileCache = sharedFileCache if fileCache is None else fileCache
+        self.__xml: XMLReader = XMLReader()
+
+        #directory listings by directory, lower case names to the names on disk
+        self.__listings: Dict[str, Dict[str, str]] = dict()
+
+        #archives of each folder in load order, opened on first use
+        self.__archives: Dict[int, List[MegArchive]] = dict()
+
+        #files relative to the XML folder and the index of the folder and path they resolved to
+        self.__resolved: Dict[str, Tuple[int, str]] = dict()
+
+    @property
+    def folders(self) -> List[str]:
+        return list(self.__folders)
+
+    @property
+    def topFolder(self) -> str:
+        return self.__folders[-1]
+
+    @property
+    def resolvedFiles(self) -> Dict[str, str]:
+        '''Files resolved so far, relative to the XML folder, and their paths.
+        Files that were not found are left out'''
+        return {file: path for file, (_, path) in self.__resolved.items() if path is not None}
+
+    def resolve(self, file: str) -> str:
+        '''Returns the path of a file relative to the XML folder in the last folder providing it,
+        or None if no folder has it'''
+        return self.__resolve(file)[1]
+
+    def isInherited(self, file: str) -> bool:
+        '''Returns true if a file comes from a folder below the top folder'''
+        index, path = self.__resolve(file)
+        return path is not None and index < len(self.__folders) - 1
+
+    def parse(self, file: str):
+        '''Returns the parsed tree of a file relative to the XML folder. Inherited files
+        come from the shared cache and must not be modified. Raises FileNotFoundError
+        if no folder has the file'''
+        index, path = self.__resolve(file)
+        if path is None:
+            raise FileNotFoundError(file + " not found in " + ", ".join(self.__folders))
+
+        if index < len(self.__folders) - 1:
+            return self.__fileCache.parse(path)
+
+        return parseDataFile(path)
+
+    def iterMetaFileRefs(self, metaFile: str, progress: Callable[[int, int], None] = None) -> Iterator[Tuple[str, object]]:
+        '''Overlay version of XMLReader.iterMetaFileRefs for a metafile relative to the XML folder.
+            The metafile and every file it references are each read from the last folder providing them.
+            Trees of files in the top folder are cleared once the caller moves on to the next file,
+            inherited trees stay in the shared cache'''
+        metaRoot = self.parse(metaFile).getroot()
+        if not self.__xml.isMetaFile(metaRoot):
+            print("Not a meta file! " + str(self.resolve(metaFile)))
+            return
+
+        fileList = self.__xml.parseMetaFile(metaRoot)
+
+        for index, file in enumerate(fileList):
+            if progress is not None:
+                progress(index, len(fileList))
+
+            if self.resolve(file) is None:
+                print(file + " not found. Continuing")
+                continue
+
+            tree = self.parse(file)
+            yield file, tree
+
+            if not self.isInherited(file):
+                tree.getroot().clear()
+
+    def __resolve(self, file: str) -> Tuple[int, str]:
+        '''Returns the folder index and path of a file, or (None, None), caching the result'''
+        resolved = self.__resolved.get(file)
+        if resolved is not None:
+            return resolved
+
+        resolved = (None, None)
+        for index in reversed(range(len(self.__folders))):
+            path = self.__find(os.path.join(self.__folders[index], "XML"), file)
+            if path is None:
+                path = self.__findInArchives(index, file)
+            if path is not None:
+                resolved = (index, path)
+                break
+
+        self.__resolved[file] = resolved
+        return resolved
+
+    def __findInArchives(self, index: int, file: str) -> str:
+        '''Returns the path through the last archive of a folder containing a file relative to the XML folder'''
+        for archive in reversed(self.__folderArchives(index)):
+            name = archive.find("Data/XML/" + file)
+            if name is not None:
+                return archivePath(archive.path, name)
+
+        return None
+
+    def __folderArchives(self, index: int) -> List[MegArchive]:
+        '''Returns the archives of a folder. They are listed in MegaFiles.xml in the folder,
+        relative to its parent folder like the game does, or else all archives in the folder are used'''
+        archives = self.__archives.get(index)
+        if archives is not None:
+            return archives
+
+        folder = self.__folders[index]
+        megaFiles = self.__find(folder, "MegaFiles.xml")
+        if megaFiles is not None:
+            paths = [self.__find(os.path.dirname(os.path.abspath(folder)), file) for file in self.__xml.parseMetaFile(et.parse(megaFiles).getroot()) if file]
+        else:
+            paths = [os.path.join(folder, name) for name in sorted(self.__listing(folder).values(), key = str.lower) if name.lower().endswith(".meg")]
+
+        archives = []
+        for path in paths:
+            if path is None:
+                continue
+            try:
+                archives.append(sharedArchives.open(path))
+            except (OSError, MegFormatError) as error:
+                print("Skipping archive " + path + ": " + str(error))
+
+        self.__archives[index] = archives
+        return archives
+
+    def __find(self, directory: str, file: str) -> str:
+        '''Returns the path of a file below a directory, matching every part of the path ignoring case'''
+        parts = [part for part in file.strip().replace("\\", "/").split("/") if part]
+        if not parts:
+            return None
+
+        path = directory
+        for part in parts:
+            name = self.__listing(path).get(part.lower())
+            if name is None:
+                return None
+            path = os.path.join(path, name)
+
+        return path if os.path.isfile(path) else None
+
+    def __listing(self, directory: str) -> Dict[str, str]:
+        '''Returns the cached names in a directory by their lower case names'''
+        listing = self.__listings.get(directory)
+        if listing is None:
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                names = []
+            listing = {name.lower(): name for name in sorted(names, reverse = True)}
+            self.__listings[directory] = listing
+
+        return listing
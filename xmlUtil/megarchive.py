@@ -0,0 +1,229 @@
+'''Reading game data from MEG archives.
+
+The base game ships its XML inside .meg archives instead of loose files. An
+archive starts with a table of file names and a table of file records, each
+giving the offset and size of a file in the archive. Archives are memory-mapped
+and their tables read once; lxml parses entries straight from slices of the
+mapping without copying them.
+
+Files inside an archive are addressed with paths through the archive, e.g.
+Data/Config.meg/DATA/XML/PLANETS.XML, so they can be recorded and read again
+like loose files with readDataFile and parseDataFile.
+'''
+
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, List, Tuple
+
+import lxml.etree as et
+
+
+class MegFormatError(Exception):
+    '''Raised when a file is not a MEG archive this reader understands'''
+    pass
+
+
+class MegArchive:
+    '''A memory-mapped MEG archive. Supports the format of Empire at War and Forces of Corruption
+    and the two unencrypted formats with a header of later games'''
+    def __init__(self, path: str):
+        self.__path: str = path
+
+        #entry keys to stored names, offsets and sizes
+        self.__entries: Dict[str, Tuple[str, int, int]] = dict()
+
+        with open(path, "rb") as archiveFile:
+            if os.fstat(archiveFile.fileno()).st_size == 0:
+                raise MegFormatError(path + " is empty")
+            self.__map = mmap.mmap(archiveFile.fileno(), 0, access = mmap.ACCESS_READ)
+
+        try:
+            self.__readIndex()
+        except (struct.error, UnicodeDecodeError) as error:
+            self.close()
+            raise MegFormatError(path + " is not a valid MEG archive: " + str(error))
+        except MegFormatError:
+            self.close()
+            raise
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    @property
+    def names(self) -> List[str]:
+        '''Stored names of all files in the archive'''
+        return [name for name, _, _ in self.__entries.values()]
+
+    def find(self, name: str) -> str:
+        '''Returns the stored name of a file, matching the name ignoring case and separators, or None'''
+        entry = self.__entries.get(entryKey(name))
+        return None if entry is None else entry[0]
+
+    def __contains__(self, name: str) -> bool:
+        return entryKey(name) in self.__entries
+
+    def read(self, name: str) -> memoryview:
+        '''Returns the contents of a file as a view into the archive, valid until the archive is closed.
+        Raises KeyError if the archive has no such file'''
+        _, start, size = self.__entry(name)
+        return memoryview(self.__map)[start:start + size]
+
+    def parse(self, name: str):
+        '''Parses an XML file in the archive without copying it'''
+        with self.read(name) as data:
+            return et.ElementTree(et.fromstring(data, base_url = self.__path + "/" + self.__entry(name)[0]))
+
+    def close(self) -> None:
+        '''Unmaps the archive'''
+        self.__map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+    def __entry(self, name: str) -> Tuple[str, int, int]:
+        entry = self.__entries.get(entryKey(name))
+        if entry is None:
+            raise KeyError(name + " is not in " + self.__path)
+        return entry
+
+    def __readIndex(self) -> None:
+        '''Reads the file name and file record tables'''
+        data = self.__map
+        first, second = struct.unpack_from("<II", data, 0)
+        record = "<IIIII"
+
+        if first == 0xFFFFFFFF and second == 0x3F7D70A4:
+            dataStart, nameCount, fileCount = struct.unpack_from("<III", data, 8)
+            offset = 20
+
+            #the format of later games adds the size of the name table to the header,
+            #which makes the tables end exactly where the data starts
+            if len(data) >= 24:
+                (nameTableSize,) = struct.unpack_from("<I", data, 20)
+                if dataStart == 24 + nameTableSize + 20 * fileCount:
+                    offset = 24
+                    record = "<HIIIIH"
+        elif first in (0xFFFFFFFF, 0x8FFFFFFF):
+            #other headers, the later format is also encrypted
+            raise MegFormatError(self.__path + " uses an unsupported MEG format")
+        else:
+            nameCount, fileCount = first, second
+            offset = 8
+
+        names = []
+        for _ in range(nameCount):
+            (length,) = struct.unpack_from("<H", data, offset)
+            names.append(data[offset + 2:offset + 2 + length].decode("ascii").replace("\\", "/"))
+            offset += 2 + length
+
+        for _ in range(fileCount):
+            size, start, nameIndex = struct.unpack_from(record, data, offset)[-3:]
+            offset += 20
+
+            if nameIndex >= len(names) or start + size > len(data):
+                raise MegFormatError(self.__path + " has a file record outside of the archive")
+
+            self.__entries[entryKey(names[nameIndex])] = (names[nameIndex], start, size)
+
+
+def entryKey(name: str) -> str:
+    '''Returns the key of a file name inside an archive, ignoring case and the kind of separators'''
+    return name.strip().replace("\\", "/").strip("/").lower()
+
+
+class ArchiveCache:
+    '''Open archives kept for the session. An archive is opened again once its size or
+    modification time changes'''
+    def __init__(self):
+        self.__archives: Dict[str, Tuple[Tuple[int, int], MegArchive]] = dict()
+        self.__lock = threading.Lock()
+
+    def open(self, path: str) -> MegArchive:
+        '''Returns the open archive of a path'''
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        with self.__lock:
+            entry = self.__archives.get(path)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+
+            #the old mapping is left to the garbage collector, trees parsed from it may still be in use
+            archive = MegArchive(path)
+            self.__archives[path] = (version, archive)
+
+        return archive
+
+    def clear(self) -> None:
+        '''Forgets all archives'''
+        with self.__lock:
+            self.__archives.clear()
+
+
+#shared by all readers of the session
+sharedArchives = ArchiveCache()
+
+
+def isArchive(path: str) -> bool:
+    '''Returns true if a path names a MEG archive'''
+    return path.lower().endswith(".meg") and os.path.isfile(path)
+
+
+def archivePath(archive: str, name: str) -> str:
+    '''Returns the path of a file inside an archive'''
+    return archive + "/" + name
+
+
+def splitArchivePath(path: str) -> Tuple[str, str]:
+    '''Splits a path through an archive into the archive and the stored file name.
+    Returns (None, path) for loose files'''
+    if os.path.isfile(path):
+        return None, path
+
+    parts = path.replace("\\", "/").split("/")
+    for index in range(len(parts) - 1):
+        if parts[index].lower().endswith(".meg"):
+            archive = "/".join(parts[:index + 1])
+            if isArchive(archive):
+                return archive, "/".join(parts[index + 1:])
+
+    return None, path
+
+
+def dataFileExists(path: str) -> bool:
+    '''Returns true if a loose file or a file inside an archive exists'''
+    archive, name = splitArchivePath(path)
+    if archive is None:
+        return os.path.isfile(path)
+
+    return name in sharedArchives.open(archive)
+
+
+def readDataFile(path: str) -> bytes:
+    '''Returns the contents of a loose file or a file inside an archive'''
+    archive, name = splitArchivePath(path)
+    if archive is None:
+        with open(path, "rb") as inputFile:
+            return inputFile.read()
+
+    with sharedArchives.open(archive).read(name) as data:
+        return bytes(data)
+
+
+def parseDataFile(path: str, parser = None):
+    '''Parses a loose XML file or one inside an archive'''
+    archive, name = splitArchivePath(path)
+    if archive is None:
+        return et.parse(path, parser)
+
+    if parser is None:
+        return sharedArchives.open(archive).parse(name)
+
+    return et.ElementTree(et.fromstring(readDataFile(path), parser, base_url = path))
@@ -1,8 +1,10 @@
 import lxml.etree as et
 import os.path
+from typing import Callable, Dict, Iterator, Tuple
+from gameObjects.nametable import NameTable, nameKey
+from xmlUtil.megarchive import dataFileExists, parseDataFile
 from gameObjects.planet import Planet
 from gameObjects.traderoute import TradeRoute
-from xmlUtil.xmlstructure import XMLStructure
 
 ''' XML with etree:
 
@@ -28,7 +30,9 @@ The Tree is serialized and can be manipulated in memory.
 class XMLReader:
     '''Provides XML read functions'''
     def __init__(self):
-        pass
+        #elements of the root last searched by findNamedElement, by name key
+        self.__indexedRoot = None
+        self.__namedElements: Dict[str, object] = dict()
 
 
     ''' Generic Python functions that are helpful for XML, should be moved to another class? '''
@@ -69,17 +73,24 @@ class XMLReader:
 
     
     def getListFromXMLRoot(self, XMLRoot, XMLTag: str) -> set():
-        '''Parses a XML root and returns a Python set of all names in the XML tag given'''
+        '''Parses a XML root and returns a Python set of all names in the XML tag given.
+        Text on both sides of comments inside the tag is read, the tree is not modified'''
         outputSet = set()
 
-        et.strip_tags(XMLRoot, et.Comment)
-
-        for child in XMLRoot.findall(XMLTag):
-            entry = self.commaReplaceInList(child.text.split())
-            outputSet.update(entry)
+        for element in XMLRoot.iterfind(XMLTag):
+            outputSet.update(self.commaSepListParser(self.getTextSkippingComments(element)))
 
         return outputSet
 
+    def getTextSkippingComments(self, element) -> str:
+        '''Returns the text of an element joined with the text following its comments'''
+        texts = [element.text or ""]
+
+        for child in element.iterchildren(et.Comment):
+            texts.append(child.tail or "")
+
+        return " ".join(texts)
+
 
     ''' Parsing EAW Meta files '''
 
@@ -99,69 +110,66 @@ class XMLReader:
         
         return fileList
 
-    def findPlanetsFiles(self, gameObjectFile: str) -> list():
-        '''Searches GameObjectFiles for all XML files with the Planet tag.
-            Returns a list of their XML roots'''
-        metaRoot = et.parse(gameObjectFile).getroot()
-        if self.isMetaFile(metaRoot):
-            fileList = self.parseMetaFile(metaRoot)
-            planetsFiles = []
-
-            for file in fileList:
-                if not os.path.isfile(XMLStructure.dataFolder + "/XML/" + file):
-                    print(file + " not found. Continuing")
-                    continue
-
-                fileRoot = et.parse(XMLStructure.dataFolder + "/XML/" + file)
-                if self.hasTag(fileRoot, "Planet"):
-                    planetsFiles.append(fileRoot.getroot())
-                
-            return planetsFiles
+    def referencedFilePath(self, metaFile: str, file: str) -> str:
+        '''Returns the path of a file referenced in a metafile. Referenced files
+            are relative to the XML folder the metafile is in'''
+        return os.path.dirname(metaFile) + "/" + file
 
-        else:
-            print("Not a meta file! findPlanetsFiles")
+    def iterMetaFileRefs(self, metaFile: str, progress: Callable[[int, int], None] = None) -> Iterator[Tuple[str, object]]:
+        '''Parses the files referenced in a metafile one at a time.
+            Yields the file name, relative to the XML folder, and the parsed tree of each file.
+            Trees are not kept, so a caller that drops them only holds one file in memory.
+            The metafile can be inside a MEG archive, see xmlUtil.megarchive.
+            progress is called with (current, total) before each file is read'''
+        metaRoot = parseDataFile(metaFile).getroot()
+        if not self.isMetaFile(metaRoot):
+            print("Not a meta file! " + metaFile)
+            return
+
+        fileList = self.parseMetaFile(metaRoot)
+
+        for index, file in enumerate(fileList):
+            if progress is not None:
+                progress(index, len(fileList))
 
-    def findPlanetFilesAndRoots(self, gameObjectFile: str) -> list():
+            filePath = self.referencedFilePath(metaFile, file)
+            if not dataFileExists(filePath):
+                print(file + " not found. Continuing")
+                continue
+
+            yield file, parseDataFile(filePath)
+
+    def findPlanetsFiles(self, gameObjectFile: str, progress: Callable[[int, int], None] = None) -> list():
         '''Searches GameObjectFiles for all XML files with the Planet tag.
-            Returns a dictionary of file names and their XML roots'''
-        metaRoot = et.parse(gameObjectFile).getroot()
-        if self.isMetaFile(metaRoot):
-            fileList = self.parseMetaFile(metaRoot)
-            planetsFiles = {}
+            Returns a list of their XML roots.
+            progress is called with (current, total) before each file is read'''
+        return [fileRoot.getroot() for _, fileRoot in self.iterMetaFileRefs(gameObjectFile, progress) if self.hasTag(fileRoot, "Planet")]
 
-            for file in fileList:
-                if not os.path.isfile(XMLStructure.dataFolder + "/XML/" + file):
-                    print(file + " not found. Continuing")
-                    continue
+    def findPlanetFilesAndRoots(self, gameObjectFile: str, progress: Callable[[int, int], None] = None) -> list():
+        '''Searches GameObjectFiles for all XML files with the Planet tag.
+            Returns a dictionary of file names and their XML roots.
+            progress is called with (current, total) before each file is read'''
+        return {file: fileRoot for file, fileRoot in self.iterMetaFileRefs(gameObjectFile, progress) if self.hasTag(fileRoot, "Planet")}
 
-                fileRoot = et.parse(XMLStructure.dataFolder + "/XML/" + file)
-                if self.hasTag(fileRoot, "Planet"):
-                    planetsFiles[file] = fileRoot
+    def parsePlanetFiles(self, gameObjectFile: str, fileList: list) -> dict():
+        '''Parses only the given files referenced by GameObjectFiles.
+            Returns a dictionary of file names and their XML roots'''
+        planetsFiles = {}
 
-            return planetsFiles
+        for file in fileList:
+            filePath = self.referencedFilePath(gameObjectFile, file)
+            if not dataFileExists(filePath):
+                print(file + " not found. Continuing")
+                continue
 
-        else:
-            print("Not a meta file! findPlanetsFiles")
-
-    def findMetaFileRefs(self, metaFile: str) -> list():
-        '''Searches a metafile and returns a list of XML roots that are referenced in the metafile'''
-        metaRoot = et.parse(metaFile).getroot()
-        if self.isMetaFile(metaRoot):
-            fileList = self.parseMetaFile(metaRoot)
-            metaFileRefs = []
-
-            for file in fileList:
-                if not os.path.isfile(XMLStructure.dataFolder + "/XML/" + file):
-                    print(file + " not found. Continuing")
-                    continue
-
-                fileRoot = et.parse(XMLStructure.dataFolder + "/XML/" + file)
-                metaFileRefs.append(fileRoot.getroot())
-                
-            return metaFileRefs
+            planetsFiles[file] = parseDataFile(filePath)
 
-        else:
-            print("Not a meta file! findMetaFileRefs")  
+        return planetsFiles
+
+    def findMetaFileRefs(self, metaFile: str, progress: Callable[[int, int], None] = None) -> list():
+        '''Searches a metafile and returns a list of XML roots that are referenced in the metafile.
+            progress is called with (current, total) before each file is read'''
+        return [fileRoot.getroot() for _, fileRoot in self.iterMetaFileRefs(metaFile, progress)]
 
 
     ''' EAW specific XML parsing '''
@@ -176,52 +184,123 @@ class XMLReader:
 
         return nameList
 
+    def findNamedElement(self, name: str, XMLRoot):
+        '''Returns the first element in root XMLRoot with a Name attribute matching name, ignoring case, or None.
+        The elements of a root are indexed by name once, later lookups in the same root use the index.
+        Only the last root is indexed, so no other trees are kept alive'''
+        if XMLRoot is not self.__indexedRoot:
+            self.__namedElements = dict()
+            for element in XMLRoot.iter():
+                elementName = element.get("Name")
+                if elementName is not None:
+                    self.__namedElements.setdefault(nameKey(elementName), element)
+
+            self.__indexedRoot = XMLRoot
+
+        return self.__namedElements.get(nameKey(name))
+
     def getStartEnd(self, name: str, planetList: set, tradeRouteRoot) -> Planet:
-        '''Gets the start and end Planet objects for a trade route of name in root tradeRouteRoot and returns start, end'''
-        for element in tradeRouteRoot.iter():
-            if str(element.get("Name")).lower() == name.lower():
-                for child in element.iter():
-                    if child.tag == "Point_A":
-                        start_planet = self.getPlanet(child.text, planetList)
-                    elif child.tag == "Point_B":
-                        end_planet = self.getPlanet(child.text, planetList)
-                    
-                return start_planet, end_planet
+        '''Gets the start and end Planet objects for a trade route of name in root tradeRouteRoot and returns start, end.
+        planetList is a NameTable or any collection of planets'''
+        planetList = self.__nameTable(planetList)
+        element = self.findNamedElement(name, tradeRouteRoot)
+        if element is not None:
+            start_planet, end_planet = None, None
+            for child in element.iter():
+                if child.tag == "Point_A":
+                    start_planet = self.getPlanet(child.text, planetList)
+                elif child.tag == "Point_B":
+                    end_planet = self.getPlanet(child.text, planetList)
+                
+            return start_planet, end_planet
         
         print("TradeRoute " + name + " not found! getStartEnd")
     
+    def getTradeRouteEndpoints(self, tradeRouteRoot) -> list():
+        '''Reads all trade routes of root tradeRouteRoot in one pass.
+        Returns a list of name, Point_A text, Point_B text tuples, missing points are None'''
+        tradeRoutes = []
+
+        for element in tradeRouteRoot:
+            name = element.get("Name")
+            if name is None:
+                continue
+
+            start, end = None, None
+            for child in element:
+                if child.tag == "Point_A":
+                    start = child.text
+                elif child.tag == "Point_B":
+                    end = child.text
+
+            tradeRoutes.append((name, start, end))
+
+        return tradeRoutes
+
     def getLocation(self, name: str, XMLRoot) -> float:
         '''Gets the galactic position tag value for an object of name in root XMLRoot and returns x, y'''
-        for element in XMLRoot.iter():
-            if str(element.get("Name")).lower() == name.lower():
-                for child in element.iter("Galactic_Position"):
-                    outputList = self.commaSepListParser(child.text)
-                    return float(outputList[0]), float(outputList[1])
+        element = self.findNamedElement(name, XMLRoot)
+        if element is not None:
+            for child in element.iter("Galactic_Position"):
+                outputList = self.commaSepListParser(child.text)
+                return float(outputList[0]), float(outputList[1])
         
         print("Planet " + name + " has no coordinates! getLocation")
         return None;
 
+    def getLocationSource(self, name: str, XMLRoot):
+        '''Gets the source line and text of the galactic position tag for an object of name in root XMLRoot.
+            Returns line, text or None if the object has no position'''
+        element = self.findNamedElement(name, XMLRoot)
+        if element is not None:
+            for child in element.iter("Galactic_Position"):
+                return child.sourceline, child.text
+
+        return None
+
     def getVariantOfValue(self, name: str, XMLRoot) -> str:
-        for element in XMLRoot.iter():
-            if str(element.get("Name")).lower() == name.lower():
-                for child in element.iter("Variant_Of_Existing_Type"):
-                    return child.text
+        element = self.findNamedElement(name, XMLRoot)
+        if element is not None:
+            for child in element.iter("Variant_Of_Existing_Type"):
+                return child.text
         return ""
 
+    def getPlanetProperties(self, element) -> tuple():
+        '''Reads a planet element in one pass. Returns the Variant_Of_Existing_Type text,
+        the x, y coordinates and the source line and text of the Galactic_Position tag.
+        Missing values are "" for the variant and None otherwise'''
+        variantOf, coordinates, positionSource = "", None, None
+
+        for child in element.iter("Variant_Of_Existing_Type", "Galactic_Position"):
+            if child.tag == "Variant_Of_Existing_Type":
+                if variantOf == "":
+                    variantOf = child.text
+            elif positionSource is None:
+                outputList = self.commaSepListParser(child.text)
+                coordinates = float(outputList[0]), float(outputList[1])
+                positionSource = child.sourceline, child.text
+
+        return variantOf, coordinates, positionSource
+
     def getPlanet(self, name: str, planetList: set) -> Planet:
-        '''Finds a named planet object in a list of planet objects and returns it'''
-        for p in planetList:
-            if p.name.lower() == name.lower():
-                if p is not None:
-                    return p
+        '''Finds a named planet object in a NameTable or list of planet objects and returns it'''
+        p = self.__nameTable(planetList).get(name)
+        if p is not None:
+            return p
         
         print("Planet " + name + " not found! getPlanet")
 
     def getTradeRoute(self, name: str, tradeRouteList: set) -> TradeRoute:
-        '''Finds a traderoute object in a list of traderoute objects and returns it'''
-        for t in tradeRouteList:
-            if t.name.lower() == name.lower():
-                if t is not None:
-                    return t
+        '''Finds a traderoute object in a NameTable or list of traderoute objects and returns it'''
+        t = self.__nameTable(tradeRouteList).get(name)
+        if t is not None:
+            return t
         
-        print("Trade Route " + name + " not found! getTradeRoute")
\ No newline at end of file
+        print("Trade Route " + name + " not found! getTradeRoute")
+
+    def __nameTable(self, gameObjects) -> NameTable:
+        '''Returns gameObjects if it is a NameTable, otherwise a NameTable of them'''
+        if isinstance(gameObjects, NameTable):
+            return gameObjects
+
+        return NameTable(gameObjects)
\ No newline at end of file
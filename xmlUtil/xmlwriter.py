@@ -1,27 +1,114 @@
+import copy
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Tuple
+
 import lxml.etree as et
+from gameObjects.nametable import nameKey
+from xmlUtil.megarchive import dataFileExists, parseDataFile, readDataFile
 from xmlUtil.xmlreader import XMLReader
 
+#the umask can only be read by setting it, so it is read once at import while no
+#other threads write files. Temporary files are created private, new files get
+#the usual permissions
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+NEW_FILE_MODE = 0o666 & ~_UMASK
+
 #incomplete example of writing XML files to disk
 class XMLWriter:
-    '''Provides XML writing functions'''
+    '''Provides XML writing functions.
+    Files are serialized to a temporary file next to the target and renamed into place,
+    so a failed save never leaves a truncated XML file behind'''
     def __init__(self):
-        self.__template = "campaignTemplate.xml"
+        self.__template = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "campaignTemplate.xml")
         self.__templateTree = et.parse(self.__template)
         self.__templateRoot = self.__templateTree.getroot()
+        self.__positionPattern = re.compile(rb"<Galactic_Position(\s[^>]*)?>([^<]*)</Galactic_Position\s*>")
 
     def campaignWriter(self, campaign, outputName: str) -> None:
         '''Writes a campaign to file'''
-        planets = self.createListEntry(campaign.planets)
-        tradeRoutes = self.createListEntry(campaign.tradeRoutes)
+        self.writer(self.campaignTree(campaign), outputName = outputName)
+
+    def campaignTree(self, campaign):
+        '''Returns a copy of the campaign template filled in with a campaign'''
+        #entries that did not resolve to a planet or trade route are written back unchanged
+        planets = self.createListEntry([p for p in campaign.planets if p is not None], campaign.unresolvedPlanets)
+        tradeRoutes = self.createListEntry([t for t in campaign.tradeRoutes if t is not None], campaign.unresolvedTradeRoutes)
+
+        campaignTree = copy.deepcopy(self.__templateTree)
+        campaignRoot = campaignTree.getroot()
+
+        campaignRoot.find(".//Campaign").set("Name", campaign.name)
+        campaignRoot.find(".//Locations").text = planets
+        campaignRoot.find(".//Trade_Routes").text = tradeRoutes
+
+        return campaignTree
+
+    def campaignExportTrees(self, repository, campaigns, metaFile: str) -> Dict[str, object]:
+        '''Returns the trees of campaigns, each in its own file named after the campaign,
+        and of a CampaignFiles.XML listing them, by file name. The campaigns keep the order given.
+        A file the campaigns were read from is dropped from the metafile, so the other campaigns
+        defined in it are exported as well. Raises ValueError if a campaign name is not a plain
+        file name or two names only differ in case'''
+        from mapTools.campaignmapexporter import isFileName
+
+        exported = list(campaigns)
+        while True:
+            for campaign in exported:
+                if not isFileName(campaign.name):
+                    raise ValueError("Campaign name " + repr(campaign.name) + " is not a valid file name")
+
+            campaignFiles = [campaign.name + ".xml" for campaign in exported]
+            if len({file.lower() for file in campaignFiles}) < len(campaignFiles):
+                raise ValueError("Campaign names " + ", ".join(sorted(c.name for c in exported)) + " do not give distinct file names")
 
-        self.__templateRoot.find(".//Campaign").set("Name", campaign.name)
-        self.__templateRoot.find(".//Locations").text = planets
-        self.__templateRoot.find(".//Trade_Routes").text = tradeRoutes
+            #the files the campaigns were read from and the ones they overwrite are replaced
+            replacedFiles = {file.lower() for file in campaignFiles}
+            replacedFiles.update(file.lower() for file in map(repository.getCampaignFile, (c.name for c in exported)) if file)
 
-        self.writer(self.__templateTree, outputName = outputName)
+            others = sorted((c for c in repository.campaigns if c not in exported
+                and (repository.getCampaignFile(c.name) or "").lower() in replacedFiles), key = lambda c: c.name)
+            if not others:
+                break
+
+            exported.extend(others)
+
+        outputTrees = {file: self.campaignTree(campaign) for campaign, file in zip(exported, campaignFiles)}
+        outputTrees["CampaignFiles.XML"] = self.campaignFilesTree(metaFile, campaignFiles, replacedFiles)
+        return outputTrees
+
+    def campaignFilesTree(self, metaFile: str, campaignFiles: List[str], replacedFiles: Iterable[str] = ()):
+        '''Returns a campaign metafile tree with the entries of an existing metafile, except
+        for replaced files, and any of the given campaign files it does not list yet'''
+        if dataFileExists(metaFile):
+            metaTree = parseDataFile(metaFile, et.XMLParser(remove_blank_text = True))
+        else:
+            metaTree = et.ElementTree(et.Element("Campaign_Files"))
+
+        metaRoot = metaTree.getroot()
+        replacedFiles = {file.lower() for file in replacedFiles}
+        for element in list(metaRoot.iter("File")):
+            if element.text and element.text.strip().lower() in replacedFiles:
+                element.getparent().remove(element)
+
+        listedFiles = {element.text.strip().lower() for element in metaRoot.iter("File") if element.text}
+
+        for file in campaignFiles:
+            if file.lower() not in listedFiles:
+                self.subElementText(metaRoot, "File", file)
+
+        return metaTree
 
     def tradeRouteWriter(self, tradeRoutes) -> None:
         '''Writes a list of trade routes to file'''
+        self.writer(self.tradeRouteTree(tradeRoutes), outputName = "NewTradeRoutes.xml")
+
+    def tradeRouteTree(self, tradeRoutes):
+        '''Returns a new XML tree containing a list of trade routes'''
         tradeRoutesRoot = et.Element("TradeRoutes")
         tradeRoutesTree = et.ElementTree(tradeRoutesRoot)
 
@@ -36,33 +123,157 @@ class XMLWriter:
             creditGainFactor = self.subElementText(route, "Credit_Gain_Factor", "0")
             visibleLineName = self.subElementText(route, "Visible_Line_Name", "None")
 
-        self.writer(tradeRoutesTree, outputName = "NewTradeRoutes.xml")
+        return tradeRoutesTree
 
     def planetCoordinatesWriter(self, path, planetFilesRoots, newPlanetData):
-        '''Save updated planet coordinates'''
+        '''Save updated planet coordinates. Files without updated planets are not written.
+        All files are replaced or, if one of them fails, none are'''
+        self.writeFiles(self.planetCoordinatesTrees(path, planetFilesRoots, newPlanetData))
+
+    def planetCoordinatesFiles(self, repository, xmlFolder: str, newPlanetData, patch: bool = True) -> tuple:
+        '''Returns the planet files that need to be written for the moved planets in newPlanetData,
+        as patched file contents where possible and as updated XML trees otherwise,
+        and the new Galactic_Position sources of the patched planets.
+        Only the files the repository records for the moved planets are read. Files inherited from
+        a base Data folder are read from there and written to xmlFolder, leaving the base folder unchanged'''
+        xmlReader = XMLReader()
+
+        try:
+            planetFiles = repository.getPlanetFiles(newPlanetData.keys())
+        except KeyError:
+            #the metafile and the files it lists are read from wherever they were loaded from
+            gameObjectFile = self.__sourcePath(repository, xmlFolder, "GameObjectFiles.XML")
+            metaRoot = parseDataFile(gameObjectFile).getroot()
+            if not xmlReader.isMetaFile(metaRoot):
+                print("Not a meta file! " + gameObjectFile)
+                return dict(), dict()
+
+            planetRoots = self.__parseSourceFiles(repository, xmlFolder, xmlReader.parseMetaFile(metaRoot))
+            planetRoots = {file: root for file, root in planetRoots.items() if xmlReader.hasTag(root, "Planet")}
+            return self.planetCoordinatesTrees(xmlFolder, planetRoots, newPlanetData), dict()
+
+        outputFiles = dict()
+        patchedPositionSources = dict()
+        unpatchedFiles = list()
+
+        for file in planetFiles:
+            positionSources = {name: repository.getPlanetPositionSource(name) for name in newPlanetData.keys() if repository.getPlanetFile(name) == file}
+
+            patchedFile = None
+            if patch and None not in positionSources.values():
+                patchedFile = self.patchPlanetCoordinates(self.__sourcePath(repository, xmlFolder, file), positionSources, newPlanetData)
+
+            if patchedFile is None:
+                unpatchedFiles.append(file)
+                continue
+
+            outputFiles[xmlFolder + file] = patchedFile
+            for name, (line, text) in positionSources.items():
+                patchedPositionSources[name] = (line, self.planetPositionText(newPlanetData[name], text))
+
+        if unpatchedFiles:
+            planetRoots = self.__parseSourceFiles(repository, xmlFolder, unpatchedFiles)
+            outputFiles.update(self.planetCoordinatesTrees(xmlFolder, planetRoots, newPlanetData))
+
+        return outputFiles, patchedPositionSources
+
+    def __sourcePath(self, repository, xmlFolder: str, file: str) -> str:
+        '''Returns the path a file relative to the XML folder was loaded from, by default the file in xmlFolder'''
+        return repository.getDataFileSource(file) or xmlFolder + file
+
+    def __parseSourceFiles(self, repository, xmlFolder: str, files: List[str]) -> Dict[str, object]:
+        '''Parses files relative to the XML folder from where they were loaded.
+        Returns a dictionary of file names and their trees, files that do not exist are skipped'''
+        trees = dict()
+        for file in files:
+            source = self.__sourcePath(repository, xmlFolder, file)
+            if not dataFileExists(source):
+                print(file + " not found. Continuing")
+                continue
+
+            trees[file] = parseDataFile(source)
+
+        return trees
+
+    def planetCoordinatesTrees(self, path, planetFilesRoots, newPlanetData) -> Dict[str, object]:
+        '''Updates planet coordinates in parsed planet files, matching planet names ignoring case.
+        Returns a dictionary of output paths and trees for the files that changed'''
+        modifiedTrees = {}
+        newPlanetData = {nameKey(name): newData for name, newData in newPlanetData.items()}
+
         for file, root in planetFilesRoots.items():
             for element in root.iter("Planet"):
-                name = str(element.get("Name"))
-                try:
-                    newData = newPlanetData[name]
-                    for child in element.iter("Galactic_Position"):
-                        outputList = XMLReader().commaSepListParser(child.text)
-                        pos_text = str(newData[0]) + ", " + str(newData[1]) + ", " + str(outputList[2])
-                        child.text = pos_text
-                        break
-                except(KeyError):
-                    pass
-            root.write(path + file, xml_declaration = "1.0", pretty_print = True)
-
-
-    def createListEntry(self, inputList):
+                newData = newPlanetData.get(nameKey(element.get("Name")))
+                if newData is None:
+                    continue
+
+                for child in element.iter("Galactic_Position"):
+                    child.text = self.planetPositionText(newData, child.text)
+                    modifiedTrees[path + file] = root
+                    break
+
+        return modifiedTrees
+
+    def patchPlanetCoordinates(self, fileName: str, positionSources: Dict[str, Tuple[int, str]], newPlanetData) -> bytes:
+        '''Returns the bytes of a planet file with only the Galactic_Position text of the given planets replaced,
+        keeping formatting and comments of the rest of the file unchanged.
+        positionSources maps planet names to the source line and text of their Galactic_Position tag when loaded.
+        Returns None if a tag no longer matches its source, e.g. because the file was changed since loading'''
+        content = readDataFile(fileName)
+
+        lineStarts = [0] + [match.end() for match in re.finditer(b"\n", content)]
+        patches = []
+
+        for name, (line, text) in positionSources.items():
+            if line is None or line > len(lineStarts):
+                return None
+
+            match = self.__positionPattern.search(content, lineStarts[line - 1])
+            if match is None or (line < len(lineStarts) and match.start() >= lineStarts[line]):
+                return None
+
+            oldText = match.group(2).decode("ascii", "replace")
+            if oldText.strip() != str(text).strip():
+                return None
+
+            newText = self.planetPositionText(newPlanetData[name], oldText).encode("ascii")
+            patches.append((match.start(2), match.end(2), oldText, newText))
+
+        patches.sort(key = lambda patch: patch[0])
+        output = []
+        position = 0
+
+        for start, end, oldText, newText in patches:
+            if start < position:
+                #two planets resolved to the same tag
+                return None
+
+            #keep the whitespace around the coordinates
+            leading = len(oldText) - len(oldText.lstrip())
+            trailing = len(oldText) - len(oldText.rstrip())
+            output.append(content[position:start + leading])
+            output.append(newText)
+            position = end - trailing
+
+        output.append(content[position:])
+        return b"".join(output)
+
+    def planetPositionText(self, newData, oldText: str) -> str:
+        '''Returns Galactic_Position text for new x and y coordinates, keeping the old z coordinate'''
+        outputList = XMLReader().commaSepListParser(oldText)
+        return str(newData[0]) + ", " + str(newData[1]) + ", " + str(outputList[2])
+
+    def createListEntry(self, inputList, names: Iterable[str] = ()):
         '''creates a list string to insert into a file
-        requires a GameObject with the name property'''
+        requires a GameObject with the name property, further names are listed after them'''
         entry = "\n"
 
         for item in inputList:
             entry += ("\t\t\t" + item.name + ",\n")
 
+        for name in sorted(names):
+            entry += ("\t\t\t" + name + ",\n")
+
         return entry
 
     def subElementText(self, parent, subElementName, text):
@@ -74,4 +285,119 @@ class XMLWriter:
 
     def writer(self, XMLRoot, outputName: str) -> None:
         '''Writes XML file'''
-        XMLRoot.write(outputName, xml_declaration = "1.0", pretty_print = True)
\ No newline at end of file
+        os.replace(self.__writeTemporary(XMLRoot, outputName), outputName)
+
+    def writeFiles(self, outputTrees: Dict[str, object], transactional: bool = True) -> None:
+        '''Writes several XML files, serializing them concurrently on a thread pool.
+        Values are XML trees or the finished file contents as bytes.
+        In transactional mode files are only moved into place once all of them are serialized,
+        and replaced files are restored if moving one of them fails.
+        Otherwise every file is written independently and the first error is raised at the end'''
+        if not outputTrees:
+            return
+
+        if not transactional:
+            with ThreadPoolExecutor() as executor:
+                futures = [executor.submit(self.writer, tree, outputName) for outputName, tree in outputTrees.items()]
+            for future in futures:
+                future.result()
+            return
+
+        temporaryFiles = self.__writeTemporaries(outputTrees)
+        self.__replaceAll(temporaryFiles)
+
+    def __writeTemporaries(self, outputTrees: Dict[str, object]) -> Dict[str, str]:
+        '''Serializes all trees to temporary files. Returns a dictionary of output names and
+        temporary files, or removes all temporary files and raises if one of them fails'''
+        with ThreadPoolExecutor() as executor:
+            futures = {outputName: executor.submit(self.__writeTemporary, tree, outputName) for outputName, tree in outputTrees.items()}
+
+        temporaryFiles = {}
+        error = None
+        for outputName, future in futures.items():
+            try:
+                temporaryFiles[outputName] = future.result()
+            except Exception as e:
+                error = error or e
+
+        if error is not None:
+            for temporaryFile in temporaryFiles.values():
+                self.__remove(temporaryFile)
+            raise error
+
+        return temporaryFiles
+
+    def __replaceAll(self, temporaryFiles: Dict[str, str]) -> None:
+        '''Moves temporary files into place. Existing files are kept as backups
+        until every file is in place and restored if one of the moves fails.
+        Backups are made next to the original, so every target path holds either
+        the old or the new file at any time'''
+        backups = {}
+        replaced = []
+
+        try:
+            for outputName, temporaryFile in temporaryFiles.items():
+                if os.path.exists(outputName):
+                    backup = temporaryFile + ".bak"
+                    self.__backup(outputName, backup)
+                    backups[outputName] = backup
+                os.replace(temporaryFile, outputName)
+                replaced.append(outputName)
+        except Exception:
+            for outputName in replaced:
+                if outputName in backups:
+                    os.replace(backups.pop(outputName), outputName)
+                else:
+                    self.__remove(outputName)
+            for backup in backups.values():
+                self.__remove(backup)
+            for temporaryFile in temporaryFiles.values():
+                self.__remove(temporaryFile)
+            raise
+
+        for backup in backups.values():
+            self.__remove(backup)
+
+    def __backup(self, fileName: str, backup: str) -> None:
+        '''Makes a backup of a file while leaving it in place, as a hard link where the
+        file system supports them and as a copy otherwise'''
+        try:
+            os.link(fileName, backup)
+        except OSError:
+            shutil.copy2(fileName, backup)
+
+    def __writeTemporary(self, XMLRoot, outputName: str) -> str:
+        '''Serializes an XML tree, or writes bytes, to a temporary file in the directory of outputName
+        and returns its path'''
+        directory = os.path.dirname(os.path.abspath(outputName))
+        #files inherited from a base Data folder can be in folders the mod does not have yet
+        os.makedirs(directory, exist_ok = True)
+        handle, temporaryFile = tempfile.mkstemp(prefix = "." + os.path.basename(outputName) + ".", suffix = ".tmp", dir = directory)
+
+        output = os.fdopen(handle, "wb")
+        try:
+            with output:
+                try:
+                    mode = os.stat(outputName).st_mode & 0o777
+                except FileNotFoundError:
+                    mode = NEW_FILE_MODE
+
+                os.chmod(temporaryFile, mode)
+                if isinstance(XMLRoot, bytes):
+                    output.write(XMLRoot)
+                else:
+                    XMLRoot.write(output, xml_declaration = "1.0", pretty_print = True)
+                output.flush()
+                os.fsync(output.fileno())
+        except Exception:
+            self.__remove(temporaryFile)
+            raise
+
+        return temporaryFile
+
+    def __remove(self, fileName: str) -> None:
+        '''Removes a file if it exists'''
+        try:
+            os.remove(fileName)
+        except FileNotFoundError:
+            pass